@@ -0,0 +1,89 @@
+"""Requests per second through the MCP server authentication middleware.
+
+Drives the ASGI stack in-process (no sockets) so only the middleware cost is
+measured. "base_http" is the previous BaseHTTPMiddleware implementation,
+"asgi" is the current pure ASGI AuthMiddleware.
+
+Usage:
+    uv run benchmarks/bench_auth_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from middleware import AuthMiddleware  # noqa: E402
+
+TOKEN = "benchmark-token"
+
+
+class BaseHTTPAuthMiddleware(BaseHTTPMiddleware):
+    """The pre-ASGI middleware: env lookup, plain compare, INFO log per request."""
+
+    async def dispatch(self, request, call_next):
+        expected_token = os.getenv("BOX_MCP_SERVER_AUTH_TOKEN")
+        auth_header = request.headers.get("authorization")
+        if not auth_header or auth_header.replace("Bearer ", "") != expected_token:
+            return JSONResponse(status_code=401, content={"error": "Invalid token"})
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def drive(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/mcp",
+        "raw_path": b"/mcp",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {TOKEN}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8001),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    os.environ["BOX_MCP_SERVER_AUTH_TOKEN"] = TOKEN
+    apps = {
+        "none": endpoint,
+        "base_http": BaseHTTPAuthMiddleware(endpoint),
+        "asgi": AuthMiddleware(endpoint),
+    }
+    print(f"{args.requests} authorized requests through the middleware")
+    for label, app in apps.items():
+        elapsed = asyncio.run(drive(app, args.requests))
+        print(f"  {label:<10} {args.requests / elapsed:10.0f} req/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
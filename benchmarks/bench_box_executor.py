@@ -0,0 +1,93 @@
+"""Throughput of concurrent ``box_read_tool`` calls before and after the executor.
+
+The Box toolkit is replaced by a fake that sleeps for ``--latency`` seconds, so
+the benchmark runs offline. "before" calls the toolkit directly on the event
+loop (the previous behaviour of every tool), "after" runs the real
+``box_read_tool``, which routes the call through the shared Box executor.
+
+Usage:
+    uv run benchmarks/bench_box_executor.py --calls 64 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import text_cache  # noqa: E402
+from box_executor import configure_box_executor  # noqa: E402
+from config import CONFIG  # noqa: E402
+from server_context import BoxContext  # noqa: E402
+from tools import box_tools_files  # noqa: E402
+from tools.box_tools_generic import get_box_client  # noqa: E402
+
+
+class FakeRequestContext:
+    def __init__(self):
+        self.lifespan_context = BoxContext(
+            client=SimpleNamespace(
+                auth=None, network_session=SimpleNamespace(additional_headers={})
+            )
+        )
+
+
+class FakeContext:
+    def __init__(self):
+        self.request_context = FakeRequestContext()
+
+
+def make_fake_text_extract(latency: float):
+    def fake_box_file_text_extract(client: Any, file_id: str) -> dict[str, Any]:
+        time.sleep(latency)
+        return {"content": f"text of {file_id}"}
+
+    return fake_box_file_text_extract
+
+
+async def box_read_tool_blocking(ctx, file_id: str) -> dict[str, Any]:
+    """The pre-executor ``box_read_tool``: the toolkit runs on the event loop."""
+    box_client = get_box_client(ctx)
+    return text_cache.box_file_text_extract(box_client, file_id)
+
+
+async def run_calls(tool, calls: int) -> float:
+    ctx = FakeContext()
+    start = time.perf_counter()
+    await asyncio.gather(*(tool(ctx, str(i)) for i in range(calls)))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    configure_box_executor(args.workers)
+    # Measure the extraction itself, not the text cache
+    text_cache.configure_text_cache(replace(CONFIG, text_cache_path=None))
+    fake = make_fake_text_extract(args.latency)
+    with patch.object(text_cache, "box_file_text_extract", fake):
+        before = asyncio.run(run_calls(box_read_tool_blocking, args.calls))
+        after = asyncio.run(run_calls(box_tools_files.box_read_tool, args.calls))
+
+    print(
+        f"{args.calls} concurrent box_read_tool calls, "
+        f"{args.latency * 1000:.0f} ms injected latency, {args.workers} workers"
+    )
+    for label, elapsed in (("before", before), ("after", after)):
+        print(f"  {label:<6} {elapsed:8.3f} s  {args.calls / elapsed:8.1f} calls/s")
+    print(f"  speedup {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Run the MCP server against the fake Box API started by the benchmarks.
+
+Takes the same arguments as ``src/mcp_server_box.py``. The Box client built
+by the lifespan is replaced by one that sends every request to the URL in
+``BOX_FAKE_API_URL`` with a developer token, so no Box credentials are needed.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from box_sdk_gen import (  # noqa: E402
+    BaseUrls,
+    BoxClient,
+    BoxDeveloperTokenAuth,
+    NetworkSession,
+)
+
+import mcp_server_box  # noqa: E402
+import server_context  # noqa: E402
+
+FAKE_API_URL_ENV = "BOX_FAKE_API_URL"
+
+
+def get_fake_client() -> BoxClient:
+    url = os.environ[FAKE_API_URL_ENV]
+    network_session = NetworkSession(
+        base_urls=BaseUrls(
+            base_url=url, upload_url=f"{url}/api", oauth_2_url=f"{url}/oauth2"
+        )
+    )
+    return BoxClient(
+        auth=BoxDeveloperTokenAuth(token="benchmark-token"),
+        network_session=network_session,
+    ).with_extra_headers(extra_headers={"x-box-ai-library": "mcp-server-box"})
+
+
+def create_worker_app():
+    """uvicorn factory for ``--workers``, with the fake client installed."""
+    install_fake_client()
+    return mcp_server_box.create_worker_app()
+
+
+def install_fake_client() -> None:
+    server_context.get_oauth_client = get_fake_client
+    server_context.get_ccg_client = get_fake_client
+
+
+if __name__ == "__main__":
+    install_fake_client()
+    sys.exit(mcp_server_box.main())
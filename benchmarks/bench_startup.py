@@ -0,0 +1,200 @@
+"""Startup time of the MCP server: imports and stdio time to first response.
+
+Runs ``python -X importtime -c "import server"`` ``--runs`` times and reports
+the median total import time with the slowest packages, then starts
+the server over stdio against the fake Box API (``bench_server.py``) and
+measures how long it takes to answer ``initialize`` and the first
+``tools/list``.
+
+The command exits with status 1 when the median time to answer
+``initialize`` exceeds ``--budget`` seconds, or, with ``--compare``, when it
+regressed by more than ``--threshold`` percent.
+
+Usage:
+    uv run benchmarks/bench_startup.py --runs 10 --output startup.json
+    uv run benchmarks/bench_startup.py --budget 2.0 --compare startup.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from bench_tools import BENCH_SERVER, BENCHMARKS_DIR, server_env
+from fake_box_api import FakeBoxConfig, FakeBoxServer
+
+SRC_DIR = BENCHMARKS_DIR.parent / "src"
+PROTOCOL_VERSION = "2025-06-18"
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Return the import time, in microseconds, spent in each top level package.
+
+    Sums the self time of every module of the package, so that the time of a
+    dependency is not counted again in the package that imported it.
+    """
+    packages: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_time)
+    return packages
+
+
+def measure_imports(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def send(process: subprocess.Popen, message: dict[str, Any]) -> None:
+    process.stdin.write((json.dumps(message) + "\n").encode())
+    process.stdin.flush()
+
+
+def receive(process: subprocess.Popen, request_id: int) -> dict[str, Any]:
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("The server exited before answering")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_stdio_startup(fake_api_url: str, workdir: str) -> dict[str, float]:
+    """Seconds from process start to the initialize and tools/list responses."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(BENCH_SERVER), "--transport", "stdio"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=server_env(fake_api_url),
+        cwd=workdir,
+    )
+    try:
+        send(
+            process,
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench_startup", "version": "1"},
+                },
+            },
+        )
+        receive(process, 1)
+        initialized = time.perf_counter()
+        send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = receive(process, 2)["result"]["tools"]
+        listed = time.perf_counter()
+    finally:
+        process.kill()
+        process.wait()
+    return {
+        "initialize_s": initialized - start,
+        "tools_list_s": listed - start,
+        "tools": len(tools),
+    }
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of slowest packages to show"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Fail when the median time to answer initialize exceeds these seconds",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare with")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+
+    import_runs = [measure_imports("server") for _ in range(args.runs)]
+    packages = {name for run in import_runs for name in run}
+    imports_ms = {
+        name: statistics.median(run.get(name, 0) for run in import_runs) / 1000
+        for name in packages
+    }
+    total_ms = statistics.median(sum(run.values()) for run in import_runs) / 1000
+    print(f"import server: {total_ms:.1f} ms (median of {args.runs})")
+    for name, ms in sorted(imports_ms.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:<40} {ms:9.1f} ms")
+
+    fake_api = FakeBoxServer(FakeBoxConfig()).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            startups = [
+                measure_stdio_startup(fake_api.url, workdir) for _ in range(args.runs)
+            ]
+    finally:
+        fake_api.stop()
+    initialize_s = statistics.median(s["initialize_s"] for s in startups)
+    tools_list_s = statistics.median(s["tools_list_s"] for s in startups)
+    print(
+        f"stdio: initialize answered after {initialize_s * 1000:.0f} ms, "
+        f"tools/list ({startups[0]['tools']} tools) after {tools_list_s * 1000:.0f} ms"
+    )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "results": {
+            "import_ms": total_ms,
+            "imports_ms": imports_ms,
+            "initialize_s": initialize_s,
+            "tools_list_s": tools_list_s,
+        },
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    failed = False
+    if args.budget is not None and initialize_s > args.budget:
+        print(f"OVER BUDGET initialize {initialize_s:.3f}s > {args.budget:.3f}s")
+        failed = True
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        for metric in ("import_ms", "initialize_s", "tools_list_s"):
+            change = (report["results"][metric] - baseline[metric]) / baseline[metric]
+            print(f"{metric:<14} {change * 100:+6.1f}%")
+            if metric != "tools_list_s" and change * 100 > args.threshold:
+                print(f"REGRESSION {metric} {change * 100:+.1f}%")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""Per-tool latency and throughput of the MCP server against a fake Box API.
+
+Starts ``fake_box_api.FakeBoxServer`` in process, runs the MCP server
+(``bench_server.py``) as a subprocess over each requested transport, and
+calls every benchmarked tool ``--requests`` times with ``--concurrency``
+calls in flight. For each tool it reports p50/p95/p99 latency, mean latency,
+errors and throughput, and writes everything to ``--output`` as JSON.
+
+Pass a previous results file with ``--compare`` to print the change of every
+percentile; the command exits with status 1 when a p50 or p95 latency
+regressed by more than ``--threshold`` percent.
+
+Usage:
+    uv run benchmarks/bench_tools.py --requests 200 --concurrency 16 \\
+        --output bench-results.json
+    uv run benchmarks/bench_tools.py --compare bench-results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from fake_box_api import (
+    FakeBoxServer,
+    add_config_arguments,
+    config_from_arguments,
+)
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BENCH_SERVER = BENCHMARKS_DIR / "bench_server.py"
+TRANSPORTS = ("stdio", "streamable-http")
+
+# (label, tool name, arguments)
+WORKLOAD: list[tuple[str, str, dict[str, Any]]] = [
+    ("box_who_am_i", "box_who_am_i", {}),
+    ("box_users_list_tool", "box_users_list_tool", {}),
+    ("box_groups_list_members_tool", "box_groups_list_members_tool", {"group_id": "1"}),
+    ("box_search_tool", "box_search_tool", {"query": "report"}),
+    (
+        "box_list_folder_content_by_folder_id",
+        "box_list_folder_content_by_folder_id",
+        {"folder_id": "0"},
+    ),
+    (
+        "box_list_folder_content_by_folder_id[recursive]",
+        "box_list_folder_content_by_folder_id",
+        {"folder_id": "0", "is_recursive": True, "max_depth": 2},
+    ),
+    ("box_read_tool", "box_read_tool", {"file_id": "100"}),
+    ("box_download_file_tool", "box_download_file_tool", {"file_id": "100"}),
+    (
+        "box_ai_ask_file_single_tool",
+        "box_ai_ask_file_single_tool",
+        {"file_id": "100", "prompt": "Summarize this document"},
+    ),
+    (
+        "box_ai_extract_freeform_tool",
+        "box_ai_extract_freeform_tool",
+        {"file_ids": ["100"], "prompt": "Extract the vendor and total"},
+    ),
+    (
+        "box_metadata_template_get_by_name_tool",
+        "box_metadata_template_get_by_name_tool",
+        {"template_name": "Invoice"},
+    ),
+    (
+        "box_docgen_template_get_by_id_tool",
+        "box_docgen_template_get_by_id_tool",
+        {"template_id": "1"},
+    ),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(fake_api_url: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["BOX_FAKE_API_URL"] = fake_api_url
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(BENCHMARKS_DIR.parent / "src"), env.get("PYTHONPATH", "")]
+    )
+    return env
+
+
+@asynccontextmanager
+async def stdio_session(
+    fake_api_url: str, workdir: str, server_args: list[str]
+) -> AsyncIterator[ClientSession]:
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(BENCH_SERVER), "--transport", "stdio", *server_args],
+        env=server_env(fake_api_url),
+        cwd=workdir,
+    )
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+
+
+@asynccontextmanager
+async def http_session(
+    fake_api_url: str, workdir: str, server_args: list[str]
+) -> AsyncIterator[ClientSession]:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(BENCH_SERVER),
+            "--transport",
+            "streamable-http",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--no-mcp-server-auth",
+            *server_args,
+        ],
+        env=server_env(fake_api_url),
+        cwd=workdir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_port(port, process)
+        async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp") as (
+            read,
+            write,
+            _,
+        ):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_for_port(port: int, process: subprocess.Popen, timeout=30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"MCP server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"MCP server did not listen on port {port}")
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    ms = sorted(latency * 1000 for latency in latencies)
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def bench_tool(
+    session: ClientSession,
+    tool: str,
+    arguments: dict[str, Any],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, Any]:
+    for _ in range(warmup):
+        await session.call_tool(tool, arguments)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def call() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await session.call_tool(tool, arguments)
+                failed = result.isError
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def bench_transport(
+    transport: str, fake_api_url: str, args: argparse.Namespace
+) -> dict[str, Any]:
+    session_factory = stdio_session if transport == "stdio" else http_session
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="box-mcp-bench-") as workdir:
+        async with session_factory(fake_api_url, workdir, args.server_args) as session:
+            for label, tool, arguments in WORKLOAD:
+                if args.tools and label not in args.tools and tool not in args.tools:
+                    continue
+                results[label] = await bench_tool(
+                    session,
+                    tool,
+                    arguments,
+                    args.requests,
+                    args.concurrency,
+                    args.warmup,
+                )
+                print_result(transport, label, results[label])
+    return results
+
+
+def print_result(transport: str, label: str, result: dict[str, Any]) -> None:
+    print(
+        f"{transport:<16} {label:<50} p50 {result['p50_ms']:9.2f} ms  "
+        f"p95 {result['p95_ms']:9.2f} ms  p99 {result['p99_ms']:9.2f} ms  "
+        f"{result['throughput_rps']:8.1f} req/s  errors {result['errors']}"
+    )
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float):
+    """Print the change against ``baseline`` and return the regressions found."""
+    regressions = []
+    print(f"\nChange against baseline (regression threshold {threshold}%):")
+    for transport, tools in current["results"].items():
+        for label, result in tools.items():
+            base = baseline.get("results", {}).get(transport, {}).get(label)
+            if not base:
+                continue
+            changes = []
+            for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+                if not base[metric]:
+                    continue
+                change = (result[metric] - base[metric]) / base[metric] * 100
+                changes.append(f"{metric} {change:+6.1f}%")
+                if metric in ("p50_ms", "p95_ms") and change > threshold:
+                    regressions.append((transport, label, metric, change))
+            print(f"{transport:<16} {label:<50} " + "  ".join(changes))
+    for transport, label, metric, change in regressions:
+        print(f"REGRESSION {transport} {label} {metric} {change:+.1f}%")
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transport",
+        action="append",
+        choices=TRANSPORTS,
+        help="Transport to benchmark, repeatable (default: all)",
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--tools", nargs="*", help="Only benchmark these tools (default: all)"
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare with")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument(
+        "--server-args",
+        nargs=argparse.REMAINDER,
+        default=[],
+        help="Extra arguments for the MCP server, e.g. --server-args --tool-cache",
+    )
+    add_config_arguments(parser)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    fake_config = config_from_arguments(args)
+    fake_api = FakeBoxServer(fake_config).start()
+
+    results: dict[str, Any] = {}
+    try:
+        for transport in args.transport or TRANSPORTS:
+            results[transport] = asyncio.run(
+                bench_transport(transport, fake_api.url, args)
+            )
+    finally:
+        fake_api.stop()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "server_args": args.server_args,
+            "fake_box_api": vars(fake_config),
+            "fake_box_api_requests": fake_api.requests,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""Offline stand-in for the Box API used by the benchmarks.
+
+Serves the endpoints behind the benchmarked tools (users, groups, folders,
+files, downloads, representations, search, Box AI, metadata templates and
+Doc Gen templates) with deterministic payloads. Every response can be
+delayed by ``latency`` +/- ``jitter`` seconds, and a share of requests can
+be failed with HTTP 503 (``error_rate``) or rate limited with HTTP 429
+(``rate_limit_rate``) to exercise the retry paths.
+
+Usage:
+    uv run benchmarks/fake_box_api.py --port 8900 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+CREATED_AT = "2025-01-01T00:00:00Z"
+
+
+@dataclass
+class FakeBoxConfig:
+    latency: float = 0.05
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    items_per_folder: int = 50
+    subfolders_per_folder: int = 3
+    folder_depth: int = 3
+    file_size: int = 64 * 1024
+    text_size: int = 8 * 1024
+    users: int = 100
+    group_members: int = 50
+    search_results: int = 20
+    seed: int = 0
+
+
+def user(user_id: int) -> dict[str, Any]:
+    return {
+        "type": "user",
+        "id": str(user_id),
+        "name": f"User {user_id}",
+        "login": f"user{user_id}@example.com",
+        "role": "user",
+    }
+
+
+def file_item(file_id: str, size: int) -> dict[str, Any]:
+    return {
+        "type": "file",
+        "id": file_id,
+        "name": f"document-{file_id}.txt",
+        "size": size,
+        "etag": "0",
+        "sequence_id": "0",
+        "description": "",
+    }
+
+
+def folder_item(folder_id: str) -> dict[str, Any]:
+    return {
+        "type": "folder",
+        "id": folder_id,
+        "name": f"folder-{folder_id}",
+        "etag": "0",
+        "sequence_id": "0",
+    }
+
+
+def metadata_template(template_key: str) -> dict[str, Any]:
+    return {
+        "type": "metadata_template",
+        "id": f"template-{template_key}",
+        "scope": "enterprise_1",
+        "templateKey": template_key,
+        "displayName": template_key.title(),
+        "hidden": False,
+        "fields": [
+            {"type": "string", "key": "vendor", "displayName": "Vendor"},
+            {"type": "float", "key": "total", "displayName": "Total"},
+        ],
+    }
+
+
+class FakeBoxHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid the delayed ACK stall
+    disable_nagle_algorithm = True
+    server: "FakeBoxServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.count_request()
+
+        config = self.server.config
+        rng = self.server.rng
+        delay = config.latency + rng.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            return self._error(429, "rate_limit_exceeded", {"Retry-After": "0"})
+        if roll < config.rate_limit_rate + config.error_rate:
+            return self._error(503, "unavailable")
+
+        for route_method, pattern, handler in ROUTES:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                return handler(self, config, query, body, *match.groups())
+        return self._error(404, "not_found")
+
+    def _json(self, payload: Any, status: int = 200, headers=None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _bytes(self, data: bytes, content_type: str) -> None:
+        status, headers = 200, {}
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match and (match.group(1) or match.group(2)):
+            start, end = match.groups()
+            if start:
+                first = int(start)
+                last = min(int(end), len(data) - 1) if end else len(data) - 1
+            else:
+                first, last = max(len(data) - int(end), 0), len(data) - 1
+            status = 206
+            headers["Content-Range"] = f"bytes {first}-{last}/{len(data)}"
+            data = data[first : last + 1]
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, code: str, headers=None) -> None:
+        self._json(
+            {"type": "error", "status": status, "code": code, "message": code},
+            status=status,
+            headers=headers,
+        )
+
+    # Endpoints
+
+    def users_me(self, config, query, body):
+        self._json(user(1))
+
+    def users(self, config, query, body):
+        self._json(
+            {
+                "entries": [user(i) for i in range(1, config.users + 1)],
+                "limit": 1000,
+                "next_marker": None,
+            }
+        )
+
+    def group_memberships(self, config, query, body, group_id):
+        entries = [
+            {
+                "type": "group_membership",
+                "id": f"{group_id}-{i}",
+                "user": user(i),
+                "group": {"type": "group", "id": group_id, "name": "Group"},
+                "role": "member",
+            }
+            for i in range(config.group_members)
+        ]
+        self._json(
+            {
+                "entries": entries,
+                "total_count": len(entries),
+                "limit": 1000,
+                "offset": 0,
+            }
+        )
+
+    def folder_items(self, config, query, body, folder_id):
+        depth = folder_id.count("-")
+        items = []
+        if depth < config.folder_depth:
+            items += [
+                folder_item(f"{folder_id}-{n}")
+                for n in range(config.subfolders_per_folder)
+            ]
+        items += [
+            file_item(f"{folder_id}.{n}", config.file_size)
+            for n in range(config.items_per_folder)
+        ]
+        limit = int(query.get("limit", 100))
+        if query.get("usemarker") == "true":
+            start = int(query.get("marker") or 0)
+            page = items[start : start + limit]
+            next_marker = str(start + limit) if start + limit < len(items) else None
+            return self._json(
+                {"entries": page, "limit": limit, "next_marker": next_marker}
+            )
+        offset = int(query.get("offset", 0))
+        self._json(
+            {
+                "entries": items[offset : offset + limit],
+                "total_count": len(items),
+                "limit": limit,
+                "offset": offset,
+            }
+        )
+
+    def file_info(self, config, query, body, file_id):
+        info = file_item(file_id, config.file_size)
+        base = self.server.url
+        info["representations"] = {
+            "entries": [
+                {
+                    "representation": "markdown",
+                    "properties": {},
+                    "info": {"url": f"{base}/2.0/internal_files/{file_id}/reps"},
+                    "status": {"state": "success"},
+                    "content": {
+                        "url_template": f"{base}/reps/{file_id}/{{+asset_path}}"
+                    },
+                }
+            ]
+        }
+        self._json(info)
+
+    def file_content(self, config, query, body, file_id):
+        self.send_response(302)
+        self.send_header("Location", f"{self.server.url}/dl/{file_id}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def download(self, config, query, body, file_id):
+        self._bytes(self.server.file_bytes, "application/octet-stream")
+
+    def representation(self, config, query, body, file_id):
+        self._bytes(self.server.text_bytes, "text/markdown")
+
+    def search(self, config, query, body):
+        entries = [
+            file_item(str(1000 + i), config.file_size)
+            for i in range(config.search_results)
+        ]
+        self._json(
+            {
+                "type": "search_results_items",
+                "entries": entries,
+                "total_count": len(entries),
+                "limit": 30,
+                "offset": 0,
+            }
+        )
+
+    def ai_answer(self, config, query, body):
+        self._json(
+            {
+                "answer": "This is a generated answer from the fake Box API.",
+                "created_at": CREATED_AT,
+                "completion_reason": "done",
+            }
+        )
+
+    def ai_extract_structured(self, config, query, body):
+        self._json(
+            {
+                "answer": {"total": "100.00", "vendor": "Example Inc."},
+                "created_at": CREATED_AT,
+                "completion_reason": "done",
+            }
+        )
+
+    def metadata_template(self, config, query, body, scope, template_key):
+        self._json(metadata_template(template_key))
+
+    def metadata_templates(self, config, query, body, scope):
+        self._json(
+            {
+                "entries": [metadata_template(key) for key in ("contract", "invoice")],
+                "limit": 100,
+                "next_marker": None,
+            }
+        )
+
+    def docgen_template(self, config, query, body, template_id):
+        self._json(
+            {
+                "file": {"type": "file", "id": template_id},
+                "file_name": f"template-{template_id}.docx",
+            }
+        )
+
+
+ROUTES = [
+    ("GET", r"/2\.0/users/me", FakeBoxHandler.users_me),
+    ("GET", r"/2\.0/users", FakeBoxHandler.users),
+    ("GET", r"/2\.0/groups/([^/]+)/memberships", FakeBoxHandler.group_memberships),
+    ("GET", r"/2\.0/folders/([^/]+)/items", FakeBoxHandler.folder_items),
+    ("GET", r"/2\.0/files/([^/]+)", FakeBoxHandler.file_info),
+    ("GET", r"/2\.0/files/([^/]+)/content", FakeBoxHandler.file_content),
+    ("GET", r"/dl/([^/]+)", FakeBoxHandler.download),
+    ("GET", r"/reps/([^/]+)/.*", FakeBoxHandler.representation),
+    ("GET", r"/2\.0/search", FakeBoxHandler.search),
+    ("POST", r"/2\.0/ai/ask", FakeBoxHandler.ai_answer),
+    ("POST", r"/2\.0/ai/text_gen", FakeBoxHandler.ai_answer),
+    ("POST", r"/2\.0/ai/extract", FakeBoxHandler.ai_answer),
+    ("POST", r"/2\.0/ai/extract_structured", FakeBoxHandler.ai_extract_structured),
+    ("GET", r"/2\.0/metadata_templates/([^/]+)", FakeBoxHandler.metadata_templates),
+    (
+        "GET",
+        r"/2\.0/metadata_templates/([^/]+)/([^/]+)/schema",
+        FakeBoxHandler.metadata_template,
+    ),
+    (
+        "GET",
+        r"/2\.0/docgen_templates/([^/]+)",
+        FakeBoxHandler.docgen_template,
+    ),
+]
+
+
+class FakeBoxServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: FakeBoxConfig, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), FakeBoxHandler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.file_bytes = bytes(random.Random(config.seed).randbytes(config.file_size))
+        self.text_bytes = (b"Lorem ipsum dolor sit amet. " * config.text_size)[
+            : config.text_size
+        ]
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "FakeBoxServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add a command line option for every ``FakeBoxConfig`` field."""
+    for name, default in vars(FakeBoxConfig()).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            type=type(default),
+            default=default,
+            help=f"Fake Box API {name.replace('_', ' ')} (default: {default})",
+        )
+
+
+def config_from_arguments(args: argparse.Namespace) -> FakeBoxConfig:
+    return FakeBoxConfig(
+        **{name: getattr(args, name) for name in vars(FakeBoxConfig())}
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeBoxServer(config_from_arguments(args), args.host, args.port)
+    print(f"Fake Box API listening on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
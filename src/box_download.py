@@ -0,0 +1,214 @@
+"""Streaming, bounded-memory file downloads from Box."""
+
+import logging
+import mimetypes
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import IO
+
+import requests
+from box_ai_agents_toolkit import BoxClient, DocumentFiles, ImageFiles
+
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts for the content request, in seconds
+DOWNLOAD_TIMEOUT = (10, 60)
+
+# Extensions whose content is shown as text, or as base64 encoded image data
+DOCUMENT_EXTENSIONS = frozenset(e.value for e in DocumentFiles)
+IMAGE_EXTENSIONS = frozenset(e.value for e in ImageFiles)
+
+DOCUMENT = "document"
+IMAGE = "image"
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a streamed download.
+
+    ``content`` is only set when the downloaded bytes fit within the
+    ``max_content_bytes`` limit; otherwise the bytes were either saved to
+    ``saved_path`` or not transferred at all. ``kind`` is ``"document"`` or
+    ``"image"`` when the content can be displayed, None otherwise.
+    """
+
+    file_name: str
+    mime_type: str | None
+    file_size: int | None
+    sha1: str | None = None
+    kind: str | None = None
+    bytes_downloaded: int = 0
+    content_range: str | None = None
+    saved_path: str | None = None
+    content: bytes | None = None
+
+    @property
+    def too_large(self) -> bool:
+        return self.content is None
+
+
+def content_kind(file_name: str, mime_type: str | None) -> str | None:
+    """Return whether the content displays as a document, an image, or not."""
+    extension = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    if (mime_type and mime_type.startswith("text/")) or (
+        extension in DOCUMENT_EXTENSIONS
+    ):
+        return DOCUMENT
+    if (mime_type and mime_type.startswith("image/")) or extension in IMAGE_EXTENSIONS:
+        return IMAGE
+    return None
+
+
+def format_range(start: int | None, end: int | None) -> str | None:
+    """Build a ``Range`` header value from inclusive byte offsets."""
+    if start is None and end is None:
+        return None
+    if start is None:
+        # Suffix range: the last ``end`` bytes of the file
+        if end < 1:
+            raise ValueError("range_end must be at least 1 without range_start")
+        return f"bytes=-{end}"
+    if start < 0 or (end is not None and end < start):
+        raise ValueError("Invalid byte range")
+    return f"bytes={start}-{'' if end is None else end}"
+
+
+def expected_length(
+    file_size: int | None, start: int | None, end: int | None
+) -> int | None:
+    """Return the number of bytes a (ranged) download will transfer, if known."""
+    if file_size is None:
+        return None
+    if start is None and end is None:
+        return file_size
+    if start is None:
+        return min(end, file_size)
+    last = file_size - 1 if end is None else min(end, file_size - 1)
+    return max(last - start + 1, 0)
+
+
+def resolve_save_path(file_name: str, save_path: str | None) -> str:
+    """Return where to save ``file_name``, like ``box_file_download`` does."""
+    if not save_path:
+        return os.path.join(tempfile.gettempdir(), file_name)
+    if os.path.isdir(save_path):
+        return os.path.join(save_path, file_name)
+    return save_path
+
+
+def stream_file_download(
+    client: BoxClient,
+    file_id: str,
+    save_file: bool = False,
+    save_path: str | None = None,
+    range_start: int | None = None,
+    range_end: int | None = None,
+    max_content_bytes: int = CONFIG.download_max_content_bytes,
+    chunk_size: int = CONFIG.download_chunk_size,
+    spool_max_size: int = CONFIG.download_spool_max_size,
+    displayable_only: bool = False,
+) -> DownloadResult:
+    """Download a file chunk by chunk with a fixed memory ceiling.
+
+    The content is streamed to the save path, or to a spooled temporary file
+    that moves to disk past ``spool_max_size``, and is only read back into
+    memory when it fits ``max_content_bytes``. When the file is not saved and
+    is known to exceed the limit up front, nothing is downloaded.
+
+    The name, size and SHA-1 come from a single metadata request, and the MIME
+    type is derived from the name. With ``displayable_only``, the content of
+    a file that is not saved and is neither a document nor an image is not
+    downloaded either.
+    """
+    byte_range = format_range(range_start, range_end)
+    file_info = client.files.get_file_by_id(file_id, fields=["name", "size", "sha1"])
+    mime_type, _ = mimetypes.guess_type(file_info.name)
+    result = DownloadResult(
+        file_name=file_info.name,
+        mime_type=mime_type,
+        file_size=file_info.size,
+        sha1=file_info.sha_1,
+        kind=content_kind(file_info.name, mime_type),
+    )
+
+    if not save_file:
+        if displayable_only and result.kind is None:
+            return result
+        length = expected_length(file_info.size, range_start, range_end)
+        if length is not None and length > max_content_bytes:
+            return result
+
+    url = client.downloads.get_download_file_url(file_id)
+    session = client.network_session.network_client.requests_session
+    headers = {"Range": byte_range} if byte_range else {}
+
+    with session.get(
+        url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        result.content_range = response.headers.get("Content-Range")
+
+        if save_file:
+            target = resolve_save_path(file_info.name, save_path)
+            fd, partial_path = tempfile.mkstemp(
+                prefix=".box-download-", dir=os.path.dirname(target) or "."
+            )
+            try:
+                with os.fdopen(fd, "w+b") as sink:
+                    result.bytes_downloaded = _copy_chunks(response, sink, chunk_size)
+                    result.content = _read_back(sink, result, max_content_bytes)
+                # mkstemp creates the file private; give it the usual mode
+                os.chmod(partial_path, _new_file_mode())
+                os.replace(partial_path, target)
+            except BaseException:
+                os.unlink(partial_path)
+                raise
+            result.saved_path = target
+        else:
+            with tempfile.SpooledTemporaryFile(max_size=spool_max_size) as sink:
+                result.bytes_downloaded = _copy_chunks(
+                    response, sink, chunk_size, limit=max_content_bytes
+                )
+                result.content = _read_back(sink, result, max_content_bytes)
+
+    logger.debug(
+        f"Downloaded {result.bytes_downloaded} bytes of file {file_id} "
+        f"({result.content_range or 'full content'})"
+    )
+    return result
+
+
+def _new_file_mode() -> int:
+    """Return the mode ``open`` gives a new file under the current umask."""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _copy_chunks(
+    response: requests.Response,
+    sink: IO[bytes],
+    chunk_size: int,
+    limit: int | None = None,
+) -> int:
+    """Write the response body to ``sink``, stopping once past ``limit``."""
+    written = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        sink.write(chunk)
+        written += len(chunk)
+        if limit is not None and written > limit:
+            break
+    return written
+
+
+def _read_back(
+    sink: IO[bytes], result: DownloadResult, max_content_bytes: int
+) -> bytes | None:
+    if result.bytes_downloaded > max_content_bytes:
+        return None
+    sink.flush()
+    sink.seek(0)
+    return sink.read()
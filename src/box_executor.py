@@ -0,0 +1,126 @@
+"""Shared executor for running blocking Box API calls off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from config import CONFIG
+from tracing import current_span, start_span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BoxExecutor:
+    """Bounded thread pool used by every tool to call the synchronous Box toolkit.
+
+    The Box SDK and the ``box_ai_agents_toolkit`` are blocking, so calling them
+    directly from an ``async def`` tool stalls the event loop for every other
+    session. Routing the calls through this executor lets concurrent MCP
+    requests overlap, while ``max_workers`` caps how many Box calls run at once.
+    """
+
+    def __init__(self, max_workers: int = CONFIG.box_executor_max_workers):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="box-api"
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._pending = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` in the pool and await its result.
+
+        The caller's context variables are copied into the worker thread so
+        request scoped state keeps flowing into the Box call. The call runs in
+        a span that records how long it waited for a free worker.
+        """
+        loop = asyncio.get_running_loop()
+        with start_span(f"box_call {_call_name(func)}"):
+            call = functools.partial(
+                contextvars.copy_context().run,
+                self._tracked,
+                func,
+                args,
+                kwargs,
+                time.perf_counter(),
+            )
+            with self._lock:
+                self._pending += 1
+            return await loop.run_in_executor(self._executor, call)
+
+    def _tracked(
+        self, func: Callable[..., T], args: tuple, kwargs: dict, submitted: float
+    ) -> T:
+        span = current_span()
+        if span is not None:
+            span.set_attribute(
+                "box.executor.queue_seconds", time.perf_counter() - submitted
+            )
+        with self._lock:
+            self._pending -= 1
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of the executor load."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "pending": self._pending,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _call_name(func: Callable[..., Any]) -> str:
+    while isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, "__qualname__", None) or type(func).__name__
+
+
+_executor: BoxExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def configure_box_executor(max_workers: int) -> BoxExecutor:
+    """Replace the shared executor with one sized to ``max_workers``."""
+    global _executor
+    with _executor_lock:
+        previous = _executor
+        _executor = BoxExecutor(max_workers=max_workers)
+    if previous is not None:
+        previous.shutdown(wait=False)
+    logger.info(f"Box executor configured with {max_workers} workers")
+    return _executor
+
+
+def get_box_executor() -> BoxExecutor:
+    """Return the shared executor, creating it with the default size if needed."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoxExecutor()
+    return _executor
+
+
+async def run_box_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Box toolkit call on the shared executor."""
+    return await get_box_executor().run(func, *args, **kwargs)
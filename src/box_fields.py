@@ -0,0 +1,33 @@
+"""Projection of the Box objects returned by the tools onto selected fields.
+
+The tools ask Box for the fields an agent selected, or for a compact default
+set, and drop everything else from the serialized objects so that responses
+stay small. ``id`` and ``type`` are always returned.
+"""
+
+from typing import Any, Iterable, Sequence
+
+# Returned whatever the selected fields
+IDENTITY_FIELDS = ("id", "type")
+
+# Compact default projections
+SEARCH_FIELDS = ("id", "type", "name", "size", "description")
+FOLDER_SEARCH_FIELDS = ("id", "type", "name")
+FOLDER_ITEM_FIELDS = ("id", "type", "name", "description")
+
+
+def resolve_fields(
+    fields: Iterable[str] | None, default: Sequence[str] = IDENTITY_FIELDS
+) -> list[str]:
+    """Return the fields to request: the selected ones, or ``default``.
+
+    Names are stripped and deduplicated, with ``id`` and ``type`` first.
+    """
+    selected = [field.strip() for field in fields or () if field.strip()]
+    return list(dict.fromkeys([*IDENTITY_FIELDS, *(selected or default)]))
+
+
+def project_fields(item: Any, fields: Sequence[str]) -> dict[str, Any]:
+    """Serialize a Box object, keeping only ``fields`` that it has."""
+    data = item.to_dict()
+    return {field: data[field] for field in fields if field in data}
@@ -0,0 +1,240 @@
+"""Paged listing and concurrent traversal of Box folder content."""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator
+
+from box_ai_agents_toolkit import BoxClient
+from box_sdk_gen import BoxAPIError
+from box_sdk_gen.managers.folders import GetFolderItemsDirection, GetFolderItemsSort
+
+from box_executor import run_box_call
+from box_fields import FOLDER_ITEM_FIELDS, project_fields, resolve_fields
+from box_rate_limit import parse_retry_after
+from box_resilience import is_transient_error, single_attempt_client
+from config import CONFIG
+from continuation import decode_continuation_token, encode_continuation_token
+from metrics import record_box_api_retry
+
+logger = logging.getLogger(__name__)
+
+# Box rejects folder item pages larger than this
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 100
+# Attempts at a folder page failing transiently, the SDK itself not retrying
+PAGE_ATTEMPTS = 5
+SORT_VALUES = frozenset(s.value for s in GetFolderItemsSort)
+DIRECTION_VALUES = frozenset(d.value for d in GetFolderItemsDirection)
+
+
+def item_to_dict(item: Any, fields: list[str] | None = None) -> dict[str, Any]:
+    """Convert a folder item to the dict returned by the folder tools.
+
+    Only the selected ``fields``, plus ``id`` and ``type``, are kept.
+    """
+    if fields:
+        return project_fields(item, resolve_fields(fields))
+    return {
+        "id": item.id,
+        "name": item.name,
+        "type": item.type,
+        "description": item.description if hasattr(item, "description") else None,
+    }
+
+
+def box_folder_list_page(
+    client: BoxClient,
+    folder_id: str,
+    limit: int | None = None,
+    marker: str | None = None,
+    offset: int | None = None,
+    sort: str | None = None,
+    direction: str | None = None,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
+    """Fetch one page of a folder and a token to fetch the next one.
+
+    Marker based pagination is used unless ``offset`` or ``sort`` is given,
+    since Box only sorts offset based pages. ``marker`` is either a Box
+    marker or a continuation token returned by a previous call, in which
+    case it also restores the folder, page size, sort order and fields.
+    """
+    state: dict[str, Any] = {}
+    if marker:
+        try:
+            state = decode_continuation_token(marker)
+        except ValueError:
+            # A raw Box marker
+            state = {"marker": marker}
+    folder_id = state.get("folder_id", folder_id)
+    limit = state.get("limit", limit)
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    sort = state.get("sort", sort)
+    direction = state.get("direction", direction)
+    fields = state.get("fields", fields)
+    marker = state.get("marker")
+    offset = state.get("offset", offset)
+
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if sort is not None and sort not in SORT_VALUES:
+        raise ValueError(f"sort must be one of {sorted(SORT_VALUES)}")
+    if direction is not None and direction.upper() not in DIRECTION_VALUES:
+        raise ValueError(f"direction must be one of {sorted(DIRECTION_VALUES)}")
+
+    use_offset = offset is not None or sort is not None
+    page = client.folders.get_folder_items(
+        folder_id,
+        fields=resolve_fields(fields, FOLDER_ITEM_FIELDS),
+        usemarker=None if use_offset else True,
+        marker=None if use_offset else marker,
+        offset=(offset or 0) if use_offset else None,
+        limit=limit,
+        sort=GetFolderItemsSort(sort) if sort else None,
+        direction=GetFolderItemsDirection(direction.upper()) if direction else None,
+    )
+    entries = page.entries or []
+
+    next_state: dict[str, Any] | None = None
+    if use_offset:
+        next_offset = (offset or 0) + len(entries)
+        if entries and (page.total_count is None or next_offset < page.total_count):
+            next_state = {"offset": next_offset}
+    elif page.next_marker:
+        next_state = {"marker": page.next_marker}
+
+    if next_state is not None:
+        next_state.update(folder_id=folder_id, limit=limit)
+        for key, value in (
+            ("sort", sort),
+            ("direction", direction),
+            ("fields", fields),
+        ):
+            if value is not None:
+                next_state[key] = value
+
+    return {
+        "entries": [
+            item_to_dict(item, fields) for item in entries if item.type != "web_link"
+        ],
+        "total_count": page.total_count,
+        "continuation_token": encode_continuation_token(next_state)
+        if next_state
+        else None,
+    }
+
+
+async def walk_folder_tree(
+    client: BoxClient,
+    folder_id: str,
+    max_depth: int | None = None,
+    max_items: int | None = None,
+    max_concurrency: int = CONFIG.folder_traversal_concurrency,
+    fields: list[str] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the items of a folder tree breadth first, as they are listed.
+
+    Up to ``max_concurrency`` folders are listed at the same time. Items
+    directly in ``folder_id`` are at depth 0 and subfolders deeper than
+    ``max_depth`` are not opened. The walk stops once ``max_items`` items
+    have been yielded. Pages rejected with HTTP 429 are retried after the
+    ``Retry-After`` delay requested by Box.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    folders: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+    results: asyncio.Queue[dict[str, Any] | BaseException] = asyncio.Queue()
+    folders.put_nowait((folder_id, 0))
+
+    async def worker() -> None:
+        while True:
+            current_id, depth = await folders.get()
+            try:
+                async for item in _iter_folder_items(client, current_id, fields):
+                    if item.type == "web_link":
+                        continue
+                    if item.type == "folder" and (
+                        max_depth is None or depth < max_depth
+                    ):
+                        folders.put_nowait((item.id, depth + 1))
+                    entry = item_to_dict(item, fields)
+                    entry["parent_id"] = current_id
+                    entry["depth"] = depth
+                    results.put_nowait(entry)
+            except Exception as e:
+                results.put_nowait(e)
+            finally:
+                folders.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    all_listed = asyncio.create_task(folders.join())
+    yielded = 0
+    try:
+        while max_items is None or yielded < max_items:
+            if results.empty():
+                next_result = asyncio.create_task(results.get())
+                await asyncio.wait(
+                    {next_result, all_listed}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_result.done():
+                    next_result.cancel()
+                    if results.empty():
+                        break
+                    continue
+                result = next_result.result()
+            else:
+                result = results.get_nowait()
+            if isinstance(result, BaseException):
+                raise result
+            yield result
+            yielded += 1
+    finally:
+        all_listed.cancel()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, all_listed, return_exceptions=True)
+
+
+async def _iter_folder_items(
+    client: BoxClient, folder_id: str, fields: list[str] | None
+) -> AsyncIterator[Any]:
+    marker = None
+    while True:
+        page = await _get_folder_page(client, folder_id, marker, fields)
+        for item in page.entries or []:
+            yield item
+        marker = page.next_marker
+        if not marker:
+            return
+
+
+async def _get_folder_page(
+    client: BoxClient, folder_id: str, marker: str | None, fields: list[str] | None
+) -> Any:
+    client = single_attempt_client(client)
+    for attempt in range(PAGE_ATTEMPTS):
+        try:
+            return await run_box_call(
+                client.folders.get_folder_items,
+                folder_id,
+                fields=resolve_fields(fields, FOLDER_ITEM_FIELDS),
+                usemarker=True,
+                marker=marker,
+                limit=MAX_PAGE_SIZE,
+            )
+        except Exception as e:
+            if not is_transient_error(e) or attempt == PAGE_ATTEMPTS - 1:
+                raise
+            delay = None
+            if isinstance(e, BoxAPIError):
+                headers = {k.lower(): v for k, v in e.response_info.headers.items()}
+                # The rate limiter holds the bucket until the same deadline,
+                # so waiting here does not add to its pause
+                delay = parse_retry_after(headers.get("retry-after"))
+            if delay is None:
+                delay = 2**attempt
+            logger.info(f"Failed listing folder {folder_id} ({e}), retry in {delay}s")
+            record_box_api_retry("GET", f"/2.0/folders/{folder_id}/items")
+            await asyncio.sleep(delay)
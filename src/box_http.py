@@ -0,0 +1,266 @@
+"""Pooled, keep-alive HTTP transport shared by the Box clients."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+import requests
+from box_sdk_gen import BoxAPIError, BoxSDKError
+from box_sdk_gen.networking.box_network_client import (
+    APIRequest,
+    APIResponse,
+    BoxNetworkClient,
+)
+from box_sdk_gen.networking.fetch_options import FetchOptions
+from box_sdk_gen.networking.fetch_response import FetchResponse
+from requests.adapters import HTTPAdapter
+
+from box_rate_limit import get_rate_limiter
+from box_resilience import get_circuit_breaker
+from config import CONFIG, ServerConfig
+from metrics import endpoint_label, record_box_api_request, record_box_api_retry
+from tracing import TRACEPARENT_HEADER, SpanKind, start_span
+
+logger = logging.getLogger(__name__)
+
+# Depth of the SDK fetches running on the current thread, which own their
+# breakers; a fetch may nest another, such as a token refresh
+_fetching = threading.local()
+
+
+def _breaker_for(url: str):
+    parts = urlsplit(url)
+    return get_circuit_breaker(f"{parts.hostname or ''}{endpoint_label(parts.path)}")
+
+
+class MeteredHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that records every request sent through it as a metric
+    and a client span, after waiting for its rate limit bucket and checking
+    the circuit breaker of its endpoint.
+
+    Working at the adapter level also covers the requests made directly on
+    the session, such as file content downloads, and each redirect hop.
+    Requests sent by an SDK fetch leave the breaker to the fetch, so that
+    the SDK's own retries count as a single failure.
+    """
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs):
+        url = urlsplit(request.url)
+        host = url.hostname or ""
+        limiter = get_rate_limiter()
+        status: int | str = "error"
+        attributes = {
+            "http.request.method": request.method,
+            "server.address": host,
+            "url.path": endpoint_label(url.path),
+        }
+        with start_span(
+            f"{request.method} {attributes['url.path']}",
+            SpanKind.CLIENT,
+            None,
+            attributes,
+        ) as span:
+            if span is not None:
+                request.headers[TRACEPARENT_HEADER] = span.traceparent
+            if limiter is not None:
+                waited = limiter.acquire(host, url.path)
+                if span is not None and waited:
+                    span.set_attribute("box.rate_limit.wait_seconds", waited)
+            breaker = None
+            if not getattr(_fetching, "depth", 0):
+                breaker = _breaker_for(request.url)
+                breaker.allow()
+            start = time.perf_counter()
+            try:
+                try:
+                    response = super().send(request, *args, **kwargs)
+                except Exception:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    raise
+                status = response.status_code
+                if breaker is not None:
+                    if status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if limiter is not None:
+                    limiter.observe_response(
+                        host, url.path, status, response.headers.get("Retry-After")
+                    )
+                if span is not None:
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 400:
+                        span.set_error(f"HTTP {status}")
+                return response
+            finally:
+                record_box_api_request(
+                    request.method, url.path, status, time.perf_counter() - start
+                )
+
+
+class PooledBoxNetworkClient(BoxNetworkClient):
+    """Box SDK network client backed by a tunable ``requests`` connection pool.
+
+    The SDK default creates a bare ``requests.Session`` per client, so every
+    lifespan pays for new TLS handshakes and the pool size cannot be tuned.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = CONFIG.http_pool_connections,
+        pool_maxsize: int = CONFIG.http_pool_maxsize,
+        pool_block: bool = CONFIG.http_pool_block,
+        keep_alive: bool = CONFIG.http_keep_alive,
+    ):
+        session = requests.Session()
+        self._adapter = MeteredHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        super().__init__(requests_session=session)
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+        self._closed = False
+        # Attempts made by the fetch running on the current thread
+        self._attempts = threading.local()
+
+    def fetch(self, options: FetchOptions) -> FetchResponse:
+        """Send one SDK call, retries included, through its circuit breaker.
+
+        The breaker records the outcome of the whole call rather than of each
+        attempt: a server error the SDK retried five times is one failure.
+        """
+        breaker = _breaker_for(options.url)
+        breaker.allow()
+        # A nested fetch keeps its own attempt count, then restores ours
+        outer_attempts = getattr(self._attempts, "count", 0)
+        self._attempts.count = 0
+        _fetching.depth = getattr(_fetching, "depth", 0) + 1
+        succeeded = None
+        try:
+            response = super().fetch(options)
+            succeeded = True
+            return response
+        except BoxAPIError as e:
+            succeeded = e.response_info.status_code < 500
+            raise
+        except BoxSDKError as e:
+            # Network failures surface as SDK errors wrapping the cause
+            if isinstance(e.error, requests.RequestException):
+                succeeded = False
+            raise
+        finally:
+            _fetching.depth -= 1
+            self._attempts.count = outer_attempts
+            if succeeded is None:
+                # Failed before reaching the endpoint: only free a probe slot
+                breaker.release()
+            elif succeeded:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def _make_request(self, request: APIRequest) -> APIResponse:
+        with self._lock:
+            self._requests_sent += 1
+        attempts = getattr(self._attempts, "count", 0) + 1
+        self._attempts.count = attempts
+        if attempts > 1:
+            # The SDK retry strategy is sending this request again
+            record_box_api_retry(request.method, urlsplit(request.url).path)
+        return super()._make_request(request)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of the connection pool usage."""
+        hosts: dict[str, dict[str, int]] = {}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in pool.pool.queue if conn is not None)
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": idle,
+            }
+
+        with self._lock:
+            requests_sent = self._requests_sent
+        connections_opened = sum(h["connections_opened"] for h in hosts.values())
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "keep_alive": self.keep_alive,
+            "closed": self._closed,
+            "requests_sent": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": max(requests_sent - connections_opened, 0),
+            "hosts": hosts,
+        }
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        if not self._closed:
+            self._closed = True
+            self.requests_session.close()
+
+
+_shared_client: PooledBoxNetworkClient | None = None
+_shared_refs = 0
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def shared_network_client(
+    config: ServerConfig = CONFIG,
+) -> Iterator[PooledBoxNetworkClient]:
+    """Hold a reference to the process wide pooled network client.
+
+    With ``stateless_http`` the MCP lifespan runs once per request, so each
+    lifespan borrows the shared pool instead of building its own. The pool is
+    closed when the last holder exits.
+    """
+    global _shared_client, _shared_refs
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = PooledBoxNetworkClient(
+                pool_connections=config.http_pool_connections,
+                pool_maxsize=config.http_pool_maxsize,
+                pool_block=config.http_pool_block,
+                keep_alive=config.http_keep_alive,
+            )
+            logger.info(
+                f"Opened Box HTTP pool (maxsize={config.http_pool_maxsize}, "
+                f"keep_alive={config.http_keep_alive})"
+            )
+        _shared_refs += 1
+        client = _shared_client
+    try:
+        yield client
+    finally:
+        with _shared_lock:
+            _shared_refs -= 1
+            if _shared_refs == 0 and _shared_client is client:
+                _shared_client = None
+                client.close()
+                logger.info("Closed Box HTTP pool")
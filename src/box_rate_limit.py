@@ -0,0 +1,232 @@
+"""Client-side rate limiting of the requests sent to Box.
+
+Each request is assigned to a bucket from its host and path (general API,
+search, uploads). Every bucket is a token bucket sized from the Box rate
+limits; when it is empty, requests wait their turn instead of being sent and
+rejected. A 429 or 503 response carrying ``Retry-After`` pauses the whole
+bucket for that long, so that concurrent requests back off together rather
+than each discovering the limit on its own.
+"""
+
+import email.utils
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from config import CONFIG, ServerConfig
+from metrics import REGISTRY, Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+# A bucket holds at most this many seconds worth of requests
+BURST_SECONDS = 5
+# Statuses whose Retry-After pauses the bucket
+THROTTLE_STATUSES = (429, 503)
+
+QUEUE_DEPTH = REGISTRY.register(
+    Gauge(
+        "box_mcp_rate_limit_queue_depth",
+        "Box requests waiting for their rate limit bucket.",
+        ["bucket"],
+    )
+)
+QUEUE_WAIT = REGISTRY.register(
+    Histogram(
+        "box_mcp_rate_limit_wait_seconds",
+        "Time Box requests waited for their rate limit bucket.",
+        ["bucket"],
+    )
+)
+THROTTLED = REGISTRY.register(
+    Counter(
+        "box_mcp_rate_limit_throttled_total",
+        "Box responses that paused a rate limit bucket, by status code.",
+        ["bucket", "status"],
+    )
+)
+
+
+class TokenBucket:
+    """Token bucket handing out send times in arrival order.
+
+    Every request takes a token immediately, possibly driving the balance
+    negative, and waits until the refill covers it. Waiting requests are
+    therefore served first come, first served.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity or max(rate * BURST_SECONDS, 1.0)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request of the bucket for ``seconds``."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        with self._lock:
+            return max(self.paused_until - time.monotonic(), 0.0)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent and return the time waited.
+
+        A pause that starts while the request is queued extends its wait.
+        """
+        wait = self.reserve()
+        waited = 0.0
+        if wait > 0:
+            QUEUE_DEPTH.inc(bucket=self.name)
+            with self._lock:
+                self.waiting += 1
+            try:
+                while wait > 0:
+                    time.sleep(wait)
+                    waited += wait
+                    wait = self.paused_for()
+            finally:
+                QUEUE_DEPTH.dec(bucket=self.name)
+                with self._lock:
+                    self.waiting -= 1
+        QUEUE_WAIT.observe(waited, bucket=self.name)
+        return waited
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": self.tokens,
+                "waiting": self.waiting,
+                "paused_for": max(self.paused_until - time.monotonic(), 0.0),
+            }
+
+
+def bucket_name(host: str, path: str) -> str | None:
+    """Return the rate limit bucket of a request, or None if it is not limited.
+
+    Token requests and content downloads are not rate limited by Box.
+    """
+    if host.startswith("upload."):
+        return "upload"
+    if path.startswith("/oauth2/") or not path.startswith("/2.0/"):
+        return None
+    if path.startswith("/2.0/search"):
+        return "search"
+    return "api"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass
+class RateLimits:
+    """Requests per second allowed for each bucket."""
+
+    api: float
+    search: float
+    upload: float
+
+    @classmethod
+    def from_config(cls, config: ServerConfig = CONFIG) -> "RateLimits":
+        return cls(
+            api=config.rate_limit_api_per_minute / 60,
+            search=config.rate_limit_search_per_second,
+            upload=config.rate_limit_upload_per_minute / 60,
+        )
+
+
+class RateLimiter:
+    """Token buckets of every rate limited endpoint group."""
+
+    def __init__(self, limits: RateLimits | None = None):
+        limits = limits or RateLimits.from_config()
+        self.buckets = {
+            "api": TokenBucket("api", limits.api),
+            "search": TokenBucket("search", limits.search),
+            "upload": TokenBucket("upload", limits.upload),
+        }
+
+    def acquire(self, host: str, path: str) -> float:
+        """Wait for the bucket of the request, returning the time waited."""
+        name = bucket_name(host, path)
+        if name is None:
+            return 0.0
+        return self.buckets[name].acquire()
+
+    def observe_response(
+        self, host: str, path: str, status: int, retry_after: str | None
+    ) -> None:
+        """Pause the bucket of a throttled request for its ``Retry-After``."""
+        if status not in THROTTLE_STATUSES:
+            return
+        name = bucket_name(host, path)
+        delay = parse_retry_after(retry_after)
+        if name is None or delay is None:
+            return
+        THROTTLED.inc(bucket=name, status=str(status))
+        self.buckets[name].pause(delay)
+        logger.info(f"Box returned {status}, pausing {name} requests for {delay}s")
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+_limiter: RateLimiter | None = None
+_configured = False
+_limiter_lock = threading.Lock()
+
+
+def configure_rate_limiter(config: ServerConfig = CONFIG) -> RateLimiter | None:
+    """Replace the process wide limiter, or disable rate limiting."""
+    global _limiter, _configured
+    limiter = None
+    if config.rate_limit_enabled:
+        limiter = RateLimiter(RateLimits.from_config(config))
+    with _limiter_lock:
+        _limiter = limiter
+        _configured = True
+    logger.info(f"Box rate limiting {'enabled' if limiter else 'disabled'}")
+    return limiter
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Return the shared limiter, configuring it from ``CONFIG`` if needed."""
+    if not _configured:
+        return configure_rate_limiter()
+    return _limiter
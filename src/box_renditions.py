@@ -0,0 +1,223 @@
+"""Downscaled JPEG renditions of Box images, for display within a size budget.
+
+Box generates JPEG representations of images at a fixed set of dimensions.
+Instead of the original, often tens of megabytes for a camera photo, the
+smallest rendition covering the requested dimension is downloaded, stepping
+down to smaller ones until it fits the byte budget. Renditions are kept in
+memory, keyed by the file id, the SHA-1 of the file version and the
+dimensions, so a new version of a file is never served a stale rendition.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from box_ai_agents_toolkit import BoxClient
+
+from box_download import DOWNLOAD_TIMEOUT, IMAGE, content_kind
+from config import CONFIG, ServerConfig
+from metrics import REGISTRY, Counter
+
+logger = logging.getLogger(__name__)
+
+# Square JPEG representations generated by Box, smallest first
+JPG_DIMENSIONS = (32, 94, 160, 320, 1024, 2048)
+# Polls of a representation Box is still generating, one second apart
+REPRESENTATION_POLL_ATTEMPTS = 5
+REPRESENTATION_POLL_INTERVAL = 1.0
+
+RENDITION_CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "box_mcp_rendition_cache_lookups_total",
+        "Image rendition cache lookups, by outcome (hit or miss).",
+        ["outcome"],
+    )
+)
+
+
+@dataclass
+class Rendition:
+    """A JPEG rendition of an image file."""
+
+    file_name: str
+    sha1: str | None
+    dimensions: str
+    content: bytes
+    mime_type: str = "image/jpeg"
+
+
+class RenditionCache:
+    """Size bounded LRU cache of renditions in memory."""
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_id: str, sha1: str, dimensions: str) -> bytes | None:
+        key = (file_id, sha1, dimensions)
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                RENDITION_CACHE_LOOKUPS.inc(outcome="miss")
+                return None
+            self._entries.move_to_end(key)
+            RENDITION_CACHE_LOOKUPS.inc(outcome="hit")
+            return content
+
+    def put(self, file_id: str, sha1: str, dimensions: str, content: bytes) -> None:
+        """Store a rendition, dropping those of older versions of the file."""
+        key = (file_id, sha1, dimensions)
+        with self._lock:
+            for stale in [k for k in self._entries if k[0] == file_id and k[1] != sha1]:
+                self._size -= len(self._entries.pop(stale))
+            self._size -= len(self._entries.pop(key, b""))
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+_rendition_cache: RenditionCache | None = None
+_configured = False
+
+
+def configure_rendition_cache(config: ServerConfig = CONFIG) -> RenditionCache | None:
+    """Create the cache of ``config.rendition_cache_max_bytes``, or disable it if 0."""
+    global _rendition_cache, _configured
+    _rendition_cache = None
+    if config.rendition_cache_max_bytes > 0:
+        _rendition_cache = RenditionCache(config.rendition_cache_max_bytes)
+    _configured = True
+    return _rendition_cache
+
+
+def get_rendition_cache() -> RenditionCache | None:
+    """Return the shared cache, configuring it from ``CONFIG`` if needed."""
+    if not _configured:
+        return configure_rendition_cache()
+    return _rendition_cache
+
+
+def rendition_dimensions(max_dimension: int) -> list[str]:
+    """Return the JPEG dimensions to try, largest first.
+
+    The first covers ``max_dimension`` (or is the largest available); the
+    following ones are the smaller fallbacks used when it is too heavy.
+    """
+    if max_dimension < 1:
+        raise ValueError("max_image_dimension must be at least 1")
+    fitting = [d for d in JPG_DIMENSIONS if d >= max_dimension]
+    first = fitting[0] if fitting else JPG_DIMENSIONS[-1]
+    return [f"{d}x{d}" for d in reversed(JPG_DIMENSIONS) if d <= first]
+
+
+def download_rendition(
+    client: BoxClient,
+    file_id: str,
+    max_dimension: int,
+    max_bytes: int = CONFIG.download_max_content_bytes,
+    cache: RenditionCache | None = None,
+) -> Rendition | None:
+    """Download the largest JPEG rendition of an image within the budget.
+
+    The representations of every candidate size come from a single metadata
+    request. Returns None when the file is not an image, or when Box has no
+    rendition of it that fits ``max_bytes``.
+    """
+    candidates = rendition_dimensions(max_dimension)
+    file = client.files.get_file_by_id(
+        file_id,
+        fields=["name", "sha1", "representations"],
+        x_rep_hints="".join(f"[jpg?dimensions={d}]" for d in candidates),
+    )
+    if content_kind(file.name, None) != IMAGE:
+        return None
+    representations = file.representations.entries if file.representations else None
+    entries = {
+        entry.properties.dimensions: entry
+        for entry in representations or []
+        if entry.representation == "jpg" and entry.properties
+    }
+
+    for dimensions in candidates:
+        if cache is not None and file.sha_1:
+            content = cache.get(file_id, file.sha_1, dimensions)
+            if content is not None:
+                return Rendition(file.name, file.sha_1, dimensions, content)
+
+        entry = entries.get(dimensions)
+        if entry is None:
+            logger.info(f"No {dimensions} rendition of file {file_id}")
+            continue
+        content = _fetch_representation(client, entry)
+        if content is None:
+            return None
+        if len(content) > max_bytes:
+            logger.debug(
+                f"The {dimensions} rendition of file {file_id} is over "
+                f"{max_bytes} bytes, trying a smaller one"
+            )
+            continue
+        if cache is not None and file.sha_1:
+            cache.put(file_id, file.sha_1, dimensions, content)
+        return Rendition(file.name, file.sha_1, dimensions, content)
+    return None
+
+
+def _fetch_representation(client: BoxClient, entry: Any) -> bytes | None:
+    """Download a representation, waiting for Box to generate it if needed."""
+    session = client.network_session.network_client.requests_session
+    headers = {
+        "Authorization": client.auth.retrieve_authorization_header(
+            network_session=client.network_session
+        )
+    }
+    state = _state(entry.status)
+    url_template = entry.content.url_template if entry.content else None
+    info_url = entry.info.url if entry.info else None
+
+    # Fetching the info URL starts the generation of a missing representation
+    attempts = 0
+    while state not in ("success", "viewable") and info_url:
+        if state not in ("none", "pending") or attempts >= REPRESENTATION_POLL_ATTEMPTS:
+            logger.info(f"Representation not available ({state})")
+            return None
+        if attempts:
+            time.sleep(REPRESENTATION_POLL_INTERVAL)
+        attempts += 1
+        response = session.get(info_url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        info = response.json()
+        state = info.get("status", {}).get("state")
+        url_template = info.get("content", {}).get("url_template", url_template)
+
+    if state not in ("success", "viewable") or not url_template:
+        return None
+    url = url_template.replace("{+asset_path}", "")
+    response = session.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def _state(status: Any) -> str | None:
+    state = status.state if status else None
+    return getattr(state, "value", state)
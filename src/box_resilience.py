@@ -0,0 +1,295 @@
+"""Retries with backoff and per-endpoint circuit breakers for Box calls.
+
+``retry_box_call`` runs a blocking Box call on the shared executor and, when
+it fails with a transient error, tries again after an exponential backoff
+with full jitter. The backoff is awaited on the event loop, so retries never
+hold an executor worker while they wait. The Box clients passed to the call
+have the SDK's own retries of transient failures turned off, so a call is
+only ever retried by one layer.
+
+Every Box call sent through the pooled network client also passes a circuit
+breaker keyed by its Box endpoint. After ``failure_threshold`` consecutive
+failed calls (server errors or network failures) the breaker opens and calls
+to that endpoint fail at once with ``CircuitOpenError``; after
+``reset_timeout`` seconds a single probe call is let through to close it
+again.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+import requests
+from box_sdk_gen import BoxAPIError, BoxClient, BoxSDKError
+from box_sdk_gen.networking.fetch_options import FetchOptions
+from box_sdk_gen.networking.fetch_response import FetchResponse
+from box_sdk_gen.networking.retries import BoxRetryStrategy
+
+from box_executor import run_box_call
+from config import CONFIG, ServerConfig
+from metrics import REGISTRY, Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CIRCUIT_STATE = REGISTRY.register(
+    Gauge(
+        "box_mcp_circuit_breaker_open",
+        "1 while the circuit breaker of a Box endpoint is open or half open.",
+        ["endpoint"],
+    )
+)
+CIRCUIT_REJECTIONS = REGISTRY.register(
+    Counter(
+        "box_mcp_circuit_breaker_rejections_total",
+        "Box requests failed fast by an open circuit breaker.",
+        ["endpoint"],
+    )
+)
+CALL_RETRIES = REGISTRY.register(
+    Counter(
+        "box_mcp_box_call_retries_total",
+        "Box calls retried after a transient failure.",
+        ["call"],
+    )
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a Box endpoint that is failing."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Box endpoint {endpoint} is failing, not retrying for {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive failure counting breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int, reset_timeout: float):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise ``CircuitOpenError`` unless a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and retry_in <= 0:
+                # Let this request probe the endpoint, fail the others meanwhile
+                self.state = self.HALF_OPEN
+                return
+        CIRCUIT_REJECTIONS.inc(endpoint=self.endpoint)
+        raise CircuitOpenError(self.endpoint, max(retry_in, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit breaker for {self.endpoint} closed")
+                CIRCUIT_STATE.set(0, endpoint=self.endpoint)
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                CIRCUIT_STATE.set(1, endpoint=self.endpoint)
+                logger.warning(
+                    f"Circuit breaker for {self.endpoint} opened after "
+                    f"{self.failures} failures"
+                )
+
+    def release(self) -> None:
+        """Give back the probe slot of a call that neither failed nor succeeded.
+
+        Raising before reaching the endpoint, for instance without a valid
+        token, says nothing about it: the next call probes it instead.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+
+class CircuitBreakers:
+    """The circuit breakers of every Box endpoint seen so far."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout
+                )
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def stats(self) -> dict[str, str]:
+        with self._lock:
+            return {name: breaker.state for name, breaker in self._breakers.items()}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    attempts: int = CONFIG.retry_attempts
+    base_delay: float = CONFIG.retry_base_delay
+    max_delay: float = CONFIG.retry_max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the failed ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether retrying the call that raised ``error`` may succeed."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, BoxAPIError):
+        status = error.response_info.status_code
+        return status == 429 or status >= 500
+    if isinstance(error, BoxSDKError) and error.error is not None:
+        return is_transient_error(error.error)
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class SingleAttemptRetryStrategy(BoxRetryStrategy):
+    """SDK retry strategy leaving transient failures to ``retry_box_call``.
+
+    Server errors, ``429`` answers and network failures are raised at once;
+    an expired token is still refreshed and the request sent again.
+    """
+
+    def __init__(self):
+        super().__init__(max_attempts=2, max_retries_on_exception=0)
+
+    def should_retry(
+        self,
+        fetch_options: FetchOptions,
+        fetch_response: FetchResponse,
+        attempt_number: int,
+    ) -> bool:
+        if fetch_response.status == 429 or fetch_response.status >= 500:
+            return False
+        return super().should_retry(fetch_options, fetch_response, attempt_number)
+
+
+_single_attempt_clients: "weakref.WeakKeyDictionary[BoxClient, BoxClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_single_attempt_lock = threading.Lock()
+
+
+def single_attempt_client(client: BoxClient) -> BoxClient:
+    """Return a client sharing ``client``'s auth and pool, without SDK retries.
+
+    Anything other than a ``BoxClient`` is returned as is.
+    """
+    if not isinstance(client, BoxClient):
+        return client
+    with _single_attempt_lock:
+        single = _single_attempt_clients.get(client)
+        if single is None:
+            single = BoxClient(
+                auth=client.auth,
+                network_session=client.network_session.with_retry_strategy(
+                    SingleAttemptRetryStrategy()
+                ),
+            )
+            _single_attempt_clients[client] = single
+        return single
+
+
+_policy = RetryPolicy()
+_breakers = CircuitBreakers(
+    CONFIG.circuit_breaker_failure_threshold, CONFIG.circuit_breaker_reset_timeout
+)
+
+
+def configure_resilience(config: ServerConfig = CONFIG) -> None:
+    """Apply the retry policy and reset the circuit breakers from ``config``."""
+    global _policy, _breakers
+    _policy = RetryPolicy(
+        attempts=config.retry_attempts,
+        base_delay=config.retry_base_delay,
+        max_delay=config.retry_max_delay,
+    )
+    _breakers = CircuitBreakers(
+        config.circuit_breaker_failure_threshold,
+        config.circuit_breaker_reset_timeout,
+    )
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    return _breakers.get(endpoint)
+
+
+def circuit_breaker_stats() -> dict[str, str]:
+    return _breakers.stats()
+
+
+async def retry_box_call(
+    func: Callable[..., T],
+    *args: Any,
+    policy: RetryPolicy | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run an idempotent Box call, retrying it after transient failures.
+
+    Only pass calls that are safe to repeat: reads, or creates that detect
+    their own earlier success (see ``box_upload.upload_file_content``).
+    Box clients among the arguments are swapped for their single attempt
+    counterparts, so the SDK does not retry each attempt on its own.
+    """
+    policy = policy or _policy
+    name = getattr(func, "__name__", type(func).__name__)
+    args = tuple(single_attempt_client(a) for a in args)
+    kwargs = {k: single_attempt_client(v) for k, v in kwargs.items()}
+    attempt = 0
+    while True:
+        try:
+            return await run_box_call(func, *args, **kwargs)
+        except Exception as e:
+            if attempt + 1 >= policy.attempts or not is_transient_error(e):
+                raise
+            delay = policy.delay(attempt)
+            attempt += 1
+            CALL_RETRIES.inc(call=name)
+            logger.info(f"{name} failed ({e}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,45 @@
+"""Box searches that request selected fields only."""
+
+from typing import Any, List, Sequence
+
+from box_ai_agents_toolkit import BoxClient, SearchForContentContentTypes
+from box_sdk_gen import SearchForContentType
+
+from box_fields import FOLDER_SEARCH_FIELDS, SEARCH_FIELDS
+
+
+def box_search(
+    client: BoxClient,
+    query: str,
+    file_extensions: List[str] | None = None,
+    content_types: List[SearchForContentContentTypes] | None = None,
+    ancestor_folder_ids: List[str] | None = None,
+    fields: Sequence[str] = SEARCH_FIELDS,
+) -> List[Any]:
+    """Search for files, like the toolkit ``box_search``, returning ``fields``."""
+    search_results = client.search.search_for_content(
+        query=query,
+        file_extensions=file_extensions,
+        ancestor_folder_ids=ancestor_folder_ids,
+        content_types=content_types,
+        type=[SearchForContentType.FILE],
+        fields=list(fields),
+    )
+    return search_results.entries
+
+
+def box_locate_folder_by_name(
+    client: BoxClient,
+    folder_name: str,
+    parent_folder_id: str = "0",
+    fields: Sequence[str] = FOLDER_SEARCH_FIELDS,
+) -> List[Any]:
+    """Search for folders by name under ``parent_folder_id``, returning ``fields``."""
+    search_results = client.search.search_for_content(
+        query=folder_name,
+        ancestor_folder_ids=[parent_folder_id],
+        content_types=[SearchForContentContentTypes.NAME],
+        type=[SearchForContentType.FOLDER],
+        fields=list(fields),
+    )
+    return search_results.entries
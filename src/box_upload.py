@@ -0,0 +1,389 @@
+"""Uploads from the server filesystem, using chunked upload sessions for large files."""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable
+
+from box_ai_agents_toolkit import BoxClient
+from box_sdk_gen import BoxAPIError
+from box_sdk_gen.managers.uploads import (
+    UploadFileAttributes,
+    UploadFileAttributesParentField,
+)
+from box_sdk_gen.schemas.file_full import FileFull
+from box_sdk_gen.schemas.upload_part import UploadPart
+
+from config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Box only accepts upload sessions for files of at least 20 MB
+CHUNKED_UPLOAD_MIN_SIZE = 20 * 1024 * 1024
+# Attempts to commit a session while Box is still processing its parts
+COMMIT_ATTEMPTS = 10
+# Largest read from a file streamed in a single upload request
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+_state_lock = threading.Lock()
+
+
+def upload_file_content(
+    client: BoxClient, content: bytes, file_name: str, folder_id: str = "0"
+) -> dict[str, Any]:
+    """Upload ``content`` as a new file, safely repeatable after a failure.
+
+    The content SHA-1 is sent for Box to verify. If a file of the same name
+    already exists with that exact content, as when an earlier attempt
+    reached Box but its response was lost, that file is returned instead of
+    failing on the name conflict.
+    """
+    sha1 = hashlib.sha1(content).hexdigest()
+    try:
+        uploaded = client.uploads.upload_file(
+            UploadFileAttributes(
+                name=file_name, parent=UploadFileAttributesParentField(id=folder_id)
+            ),
+            io.BytesIO(content),
+            content_md_5=sha1,
+        )
+    except BoxAPIError as e:
+        existing = identical_conflict(e, sha1)
+        if existing is None:
+            raise
+        logger.info(f"{file_name} already uploaded to folder {folder_id}")
+        return {**existing, "existing": True}
+    entry = uploaded.entries[0]
+    return {"id": entry.id, "name": entry.name, "type": entry.type}
+
+
+def identical_conflict(error: BoxAPIError, sha1: str) -> dict[str, Any] | None:
+    """Return the file an upload conflicted with when it has the same content."""
+    info = error.response_info
+    if info.status_code != 409 or info.code != "item_name_in_use":
+        return None
+    conflicts = (info.context_info or {}).get("conflicts") or []
+    # Uploads report a single conflict, other creates a list of them
+    for conflict in conflicts if isinstance(conflicts, list) else [conflicts]:
+        if conflict.get("type") == "file" and conflict.get("sha1") == sha1:
+            return {"id": conflict["id"], "name": conflict.get("name"), "type": "file"}
+    return None
+
+
+class HashingReader(io.RawIOBase):
+    """Read-only view of a binary file that computes its SHA-1 as it is read.
+
+    Reads are capped at ``buffer_size`` bytes, so the request body streams
+    from the file with a fixed buffer. Rewinding to the start, as the SDK
+    does before retrying a request, restarts the digest.
+    """
+
+    def __init__(self, file: IO[bytes], buffer_size: int = UPLOAD_BUFFER_SIZE):
+        super().__init__()
+        self.file = file
+        self.buffer_size = buffer_size
+        self._hash = hashlib.sha1()
+        self._complete = True
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.file.seekable()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self.buffer_size:
+            size = self.buffer_size
+        return super().read(size)
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer)[: self.buffer_size]
+        count = self.file.readinto(view)
+        self._hash.update(view[:count])
+        return count
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        position = self.file.seek(offset, whence)
+        self._hash = hashlib.sha1()
+        # The digest only covers the file when reading starts from its start
+        self._complete = position == 0
+        return position
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def hexdigest(self) -> str | None:
+        """Return the SHA-1 of what was read, or None if reading skipped bytes."""
+        return self._hash.hexdigest() if self._complete else None
+
+
+def file_sha1(file_path: str, buffer_size: int = UPLOAD_BUFFER_SIZE) -> str:
+    """Return the SHA-1 of a local file, read with a fixed buffer."""
+    file_hash = hashlib.sha1()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(buffer_size):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def upload_file_from_path(
+    client: BoxClient,
+    file_path: str,
+    file_name: str,
+    folder_id: str = "0",
+    chunked_threshold: int = CONFIG.upload_chunked_threshold,
+    part_workers: int = CONFIG.upload_part_workers,
+    state_path: str | None = CONFIG.upload_session_state_path,
+) -> dict[str, Any]:
+    """Upload a local file to Box without loading it into memory.
+
+    Files of at least ``chunked_threshold`` bytes go through a chunked upload
+    session; smaller files are streamed as bytes in a single request, and
+    their SHA-1, computed while streaming, is checked against the one Box
+    reports. Like ``upload_file_content``, a failed attempt can be repeated:
+    a file of the same name and content already in the folder is returned.
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size >= max(chunked_threshold, CHUNKED_UPLOAD_MIN_SIZE):
+        return ChunkedUpload(
+            client, file_path, file_name, folder_id, part_workers, state_path
+        ).run()
+
+    with open(file_path, "rb") as file:
+        reader = HashingReader(file)
+        try:
+            uploaded = client.uploads.upload_file(
+                UploadFileAttributes(
+                    name=file_name, parent=UploadFileAttributesParentField(id=folder_id)
+                ),
+                reader,
+            )
+        except BoxAPIError as e:
+            # Box may reject the request before reading the whole body
+            existing = identical_conflict(e, file_sha1(file_path))
+            if existing is None:
+                raise
+            logger.info(f"{file_name} already uploaded to folder {folder_id}")
+            return {**existing, "existing": True}
+
+    entry = uploaded.entries[0]
+    sent_sha1 = reader.hexdigest()
+    received_sha1 = entry.sha_1
+    if sent_sha1 and sent_sha1 != received_sha1:
+        # Corrupted on the way: do not leave a damaged copy behind
+        client.files.delete_file_by_id(entry.id)
+        raise IOError(
+            f"Upload of {file_path} failed the SHA-1 check "
+            f"(sent {sent_sha1}, Box received {received_sha1})"
+        )
+    return {"id": entry.id, "name": entry.name, "type": entry.type}
+
+
+class ChunkedUpload:
+    """Upload one file through a Box upload session.
+
+    The file is read once, in order, so the whole-file SHA-1 is computed while
+    streaming; each part is then uploaded on a bounded pool of workers. The
+    session id is recorded in ``state_path`` so that, after a failure, calling
+    again with the same file resumes from the parts Box already holds.
+    """
+
+    def __init__(
+        self,
+        client: BoxClient,
+        file_path: str,
+        file_name: str,
+        folder_id: str,
+        part_workers: int = CONFIG.upload_part_workers,
+        state_path: str | None = CONFIG.upload_session_state_path,
+    ):
+        if part_workers < 1:
+            raise ValueError("part_workers must be at least 1")
+        self.client = client
+        self.file_path = os.path.abspath(file_path)
+        self.file_name = file_name
+        self.folder_id = folder_id
+        self.part_workers = part_workers
+        self.state_path = state_path
+        stat = os.stat(self.file_path)
+        self.file_size = stat.st_size
+        self.file_mtime = stat.st_mtime_ns
+        self.state_key = f"{self.file_path}:{folder_id}:{file_name}"
+        self.parts_uploaded = 0
+        self.parts_resumed = 0
+
+    def run(self) -> dict[str, Any]:
+        session_id, part_size = self._resume_session() or self._create_session()
+        existing = {part.offset: part for part in self._list_parts(session_id)}
+
+        parts, file_sha1 = self._upload_parts(session_id, part_size, existing)
+        entry = self._commit(session_id, parts, file_sha1)
+        self._forget_session()
+        logger.info(
+            f"Uploaded {self.file_name} in {len(parts)} parts "
+            f"({self.parts_resumed} resumed)"
+        )
+        return {"id": entry.id, "name": entry.name, "type": entry.type}
+
+    def _create_session(self) -> tuple[str, int]:
+        session = self.client.chunked_uploads.create_file_upload_session(
+            self.folder_id, self.file_size, self.file_name
+        )
+        self._remember_session(session.id)
+        return session.id, session.part_size
+
+    def _resume_session(self) -> tuple[str, int] | None:
+        entry = self._read_state().get(self.state_key)
+        if not entry or entry.get("file_size") != self.file_size:
+            return None
+        if entry.get("file_mtime") != self.file_mtime:
+            return None
+        try:
+            session = self.client.chunked_uploads.get_file_upload_session_by_id(
+                entry["session_id"]
+            )
+        except BoxAPIError as e:
+            # Sessions expire after a week or once committed
+            logger.info(f"Upload session {entry['session_id']} not resumable: {e}")
+            return None
+        logger.info(f"Resuming upload session {session.id} for {self.file_name}")
+        return session.id, session.part_size
+
+    def _list_parts(self, session_id: str) -> list[UploadPart]:
+        parts: list[UploadPart] = []
+        while True:
+            page = self.client.chunked_uploads.get_file_upload_session_parts(
+                session_id, offset=len(parts), limit=1000
+            )
+            parts.extend(page.entries or [])
+            if not page.entries or len(parts) >= (page.total_count or 0):
+                return parts
+
+    def _upload_parts(
+        self, session_id: str, part_size: int, existing: dict[int, UploadPart]
+    ) -> tuple[list[UploadPart], str]:
+        file_hash = hashlib.sha1()
+        parts: list[UploadPart] = []
+        futures: list[Future] = []
+        # Bounds the parts held in memory to the ones being uploaded
+        in_flight = threading.BoundedSemaphore(self.part_workers)
+
+        with (
+            open(self.file_path, "rb") as file,
+            ThreadPoolExecutor(
+                max_workers=self.part_workers, thread_name_prefix="box-upload"
+            ) as pool,
+        ):
+            offset = 0
+            while offset < self.file_size:
+                in_flight.acquire()
+                if any(f.done() and f.exception() for f in futures):
+                    in_flight.release()
+                    break
+                chunk = file.read(part_size)
+                if not chunk:
+                    in_flight.release()
+                    break
+                file_hash.update(chunk)
+
+                part = existing.get(offset)
+                if part is not None and part.sha_1 == hashlib.sha1(chunk).hexdigest():
+                    parts.append(part)
+                    in_flight.release()
+                else:
+                    futures.append(
+                        pool.submit(
+                            self._upload_part, session_id, chunk, offset, in_flight
+                        )
+                    )
+                offset += len(chunk)
+
+        self.parts_resumed = len(parts)
+        # Raises the first part failure; the session is kept for a retry
+        parts.extend(future.result() for future in futures)
+        if offset != self.file_size:
+            raise RuntimeError(f"{self.file_path} changed while being uploaded")
+        self.parts_uploaded = len(futures)
+
+        parts.sort(key=lambda part: part.offset)
+        return parts, base64.b64encode(file_hash.digest()).decode()
+
+    def _upload_part(
+        self,
+        session_id: str,
+        chunk: bytes,
+        offset: int,
+        in_flight: threading.BoundedSemaphore,
+    ) -> UploadPart:
+        try:
+            digest = base64.b64encode(hashlib.sha1(chunk).digest()).decode()
+            content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{self.file_size}"
+            uploaded = self.client.chunked_uploads.upload_file_part(
+                session_id, io.BytesIO(chunk), f"sha={digest}", content_range
+            )
+            return uploaded.part
+        finally:
+            in_flight.release()
+
+    def _commit(
+        self, session_id: str, parts: list[UploadPart], file_sha1: str
+    ) -> FileFull:
+        for attempt in range(COMMIT_ATTEMPTS):
+            files = self.client.chunked_uploads.create_file_upload_session_commit(
+                session_id, parts, f"sha={file_sha1}"
+            )
+            if files is not None and files.entries:
+                return files.entries[0]
+            # 202: Box is still processing the parts
+            time.sleep(min(2**attempt, 30))
+        raise RuntimeError(f"Upload session {session_id} was not committed in time")
+
+    def _read_state(self) -> dict[str, Any]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, update: Callable[[dict[str, Any]], Any]) -> None:
+        if not self.state_path:
+            return
+        with _state_lock:
+            entries = self._read_state()
+            update(entries)
+            directory = os.path.dirname(os.path.abspath(self.state_path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-state-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.state_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _remember_session(self, session_id: str) -> None:
+        self._write_state(
+            lambda entries: entries.__setitem__(
+                self.state_key,
+                {
+                    "session_id": session_id,
+                    "file_size": self.file_size,
+                    "file_mtime": self.file_mtime,
+                },
+            )
+        )
+
+    def _forget_session(self) -> None:
+        self._write_state(lambda entries: entries.pop(self.state_key, None))
@@ -29,6 +29,46 @@ class ServerConfig:
     box_auth: str = AuthType.OAUTH.value
     require_auth: bool = True
     server_name_prefix: str = "Box Community MCP"
+    workers: int = 1
+    box_executor_max_workers: int = 32
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 32
+    http_pool_block: bool = False
+    http_keep_alive: bool = True
+    box_token_cache_path: str | None = ".auth.token_cache.json"
+    box_token_refresh_margin: int = 300
+    tool_cache_enabled: bool = False
+    tool_cache_max_entries: int = 256
+    coalescing_enabled: bool = True
+    download_chunk_size: int = 1024 * 1024
+    download_spool_max_size: int = 8 * 1024 * 1024
+    download_max_content_bytes: int = 10 * 1024 * 1024
+    folder_traversal_concurrency: int = 8
+    upload_chunked_threshold: int = 50 * 1024 * 1024
+    upload_part_workers: int = 4
+    upload_session_state_path: str | None = ".upload_sessions.json"
+    text_cache_path: str | None = ".text_cache"
+    text_cache_max_bytes: int = 256 * 1024 * 1024
+    # Characters of text returned by a box_read_tool call without max_chars
+    read_max_chars: int = 100_000
+    # Image renditions kept in memory, 0 to disable the cache
+    rendition_cache_max_bytes: int = 64 * 1024 * 1024
+    metrics_enabled: bool = True
+    trace_export_path: str | None = None
+    rate_limit_enabled: bool = True
+    rate_limit_api_per_minute: int = 1000
+    rate_limit_search_per_second: float = 6
+    rate_limit_upload_per_minute: int = 240
+    retry_attempts: int = 4
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout: float = 30.0
+    batch_max_calls: int = 100
+    batch_max_parallelism: int = 8
+    # Tool groups or tool names to register, None for every tool
+    tools: tuple[str, ...] | None = None
+    exclude_tools: tuple[str, ...] = ()
 
 
 # Global instance
@@ -0,0 +1,22 @@
+"""Opaque continuation tokens handed to agents to resume paged results."""
+
+import base64
+import json
+from typing import Any
+
+
+def encode_continuation_token(state: dict[str, Any]) -> str:
+    """Serialize the state needed to fetch the next page into a URL safe token."""
+    payload = json.dumps(state, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_continuation_token(token: str) -> dict[str, Any]:
+    """Return the state stored in ``token``, raising ``ValueError`` if malformed."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid continuation token") from e
+    if not isinstance(state, dict):
+        raise ValueError("Invalid continuation token")
+    return state
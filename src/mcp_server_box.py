@@ -1,11 +1,25 @@
 """Entry point for the Box MCP Server."""
 
 import argparse
+import json
 import logging
+import os
 import sys
+from dataclasses import replace
+
+from mcp.server.fastmcp import FastMCP
 
 from config import CONFIG, AuthType, TransportType
-from server import create_mcp_server, create_server_info_tool, register_tools
+from server import (
+    TOOL_GROUPS,
+    create_mcp_server,
+    create_server_info_tool,
+    register_tools,
+)
+from tool_registry import select_tool_groups
+
+# Command line of the parent process, read back by each worker process
+WORKER_ARGV_ENV = "BOX_MCP_SERVER_WORKER_ARGV"
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -13,7 +27,12 @@ for logger_name in logging.root.manager.loggerDict:
     logging.getLogger(logger_name).setLevel(logging.INFO)
 
 
-def parse_arguments() -> argparse.Namespace:
+def split_names(value: str) -> list[str]:
+    """Split a comma separated list of names."""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Box Community MCP Server")
     parser.add_argument(
@@ -40,40 +59,260 @@ def parse_arguments() -> argparse.Namespace:
         help=f"Authentication type for Box API (default: {CONFIG.box_auth})",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=CONFIG.workers,
+        help="Number of worker processes sharing the listening socket, "
+        f"streamable-http only (default: {CONFIG.workers})",
+    )
+    parser.add_argument(
+        "--box-executor-workers",
+        type=int,
+        default=CONFIG.box_executor_max_workers,
+        help="Maximum number of concurrent Box API calls "
+        f"(default: {CONFIG.box_executor_max_workers})",
+    )
+
+    parser.add_argument(
+        "--http-pool-connections",
+        type=int,
+        default=CONFIG.http_pool_connections,
+        help="Number of per-host connection pools kept for the Box API "
+        f"(default: {CONFIG.http_pool_connections})",
+    )
+    parser.add_argument(
+        "--http-pool-maxsize",
+        type=int,
+        default=CONFIG.http_pool_maxsize,
+        help="Maximum connections kept open per Box API host "
+        f"(default: {CONFIG.http_pool_maxsize})",
+    )
+    parser.add_argument(
+        "--no-http-keep-alive",
+        action="store_true",
+        help="Close the Box API connection after every request",
+    )
+
+    parser.add_argument(
+        "--tool-cache",
+        action="store_true",
+        help="Cache the responses of read-only tools such as box_who_am_i",
+    )
+    parser.add_argument(
+        "--tool-cache-max-entries",
+        type=int,
+        default=CONFIG.tool_cache_max_entries,
+        help="Maximum cached responses per tool "
+        f"(default: {CONFIG.tool_cache_max_entries})",
+    )
+    parser.add_argument(
+        "--no-coalescing",
+        action="store_true",
+        help="Call Box for every read-only tool call, even when an identical "
+        "call is already in flight",
+    )
+
+    parser.add_argument(
+        "--text-cache-dir",
+        default=CONFIG.text_cache_path,
+        help="Directory caching the text extracted by box_read_tool "
+        f"(default: {CONFIG.text_cache_path})",
+    )
+    parser.add_argument(
+        "--no-text-cache",
+        action="store_true",
+        help="Extract the text of a file again on every box_read_tool call",
+    )
+    parser.add_argument(
+        "--read-max-chars",
+        type=int,
+        default=CONFIG.read_max_chars,
+        help="Most characters of text returned by one box_read_tool call, the "
+        f"rest is read with a continuation token (default: {CONFIG.read_max_chars})",
+    )
+
+    parser.add_argument(
+        "--download-max-content-bytes",
+        type=int,
+        default=CONFIG.download_max_content_bytes,
+        help="Largest download returned as tool content, larger files must be "
+        f"saved or read by byte range (default: {CONFIG.download_max_content_bytes})",
+    )
+
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="Send Box requests without waiting for the client-side rate limits",
+    )
+    parser.add_argument(
+        "--rate-limit-api-per-minute",
+        type=int,
+        default=CONFIG.rate_limit_api_per_minute,
+        help="Box API requests sent per minute before queueing "
+        f"(default: {CONFIG.rate_limit_api_per_minute})",
+    )
+
+    parser.add_argument(
+        "--retry-attempts",
+        type=int,
+        default=CONFIG.retry_attempts,
+        help="Attempts made for Box calls that fail with a transient error "
+        f"(default: {CONFIG.retry_attempts})",
+    )
+
+    parser.add_argument(
+        "--batch-max-parallelism",
+        type=int,
+        default=CONFIG.batch_max_parallelism,
+        help="Maximum number of calls of a box_batch_tool request running at the "
+        f"same time (default: {CONFIG.batch_max_parallelism})",
+    )
+
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Do not serve Prometheus metrics on /metrics (HTTP transports)",
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        default=CONFIG.trace_export_path,
+        help="Append trace spans to this file as OTLP/JSON lines "
+        "(default: tracing disabled)",
+    )
+
+    group_names = ", ".join(group.name for group in TOOL_GROUPS)
+    parser.add_argument(
+        "--tools",
+        action="extend",
+        type=split_names,
+        help="Only register these tool groups or tools, comma separated "
+        f"(groups: {group_names}; default: every tool)",
+    )
+    parser.add_argument(
+        "--exclude-tools",
+        action="extend",
+        type=split_names,
+        default=[],
+        help="Do not register these tool groups or tools, comma separated",
+    )
+
     parser.add_argument(
         "--no-mcp-server-auth",
         action="store_true",
         help="Disable authentication (for development only)",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    try:
+        select_tool_groups(TOOL_GROUPS, args.tools, args.exclude_tools)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
 
 
-def main() -> int:
-    """Main entry point for the Box MCP Server."""
-    args = parse_arguments()
+def get_server_name(args: argparse.Namespace) -> str:
+    """Build the server name from the transport."""
+    return f"{CONFIG.server_name_prefix} {args.transport.upper()} Server"
+
+
+def build_server(args: argparse.Namespace) -> FastMCP:
+    """Create the MCP server and register its tools from the parsed arguments."""
+    config = replace(
+        CONFIG,
+        box_executor_max_workers=args.box_executor_workers,
+        http_pool_connections=args.http_pool_connections,
+        http_pool_maxsize=args.http_pool_maxsize,
+        http_keep_alive=not args.no_http_keep_alive,
+        tool_cache_enabled=args.tool_cache,
+        tool_cache_max_entries=args.tool_cache_max_entries,
+        coalescing_enabled=not args.no_coalescing,
+        download_max_content_bytes=args.download_max_content_bytes,
+        text_cache_path=None if args.no_text_cache else args.text_cache_dir,
+        read_max_chars=args.read_max_chars,
+        metrics_enabled=not args.no_metrics,
+        trace_export_path=args.trace_file,
+        rate_limit_enabled=not args.no_rate_limit,
+        rate_limit_api_per_minute=args.rate_limit_api_per_minute,
+        retry_attempts=args.retry_attempts,
+        batch_max_parallelism=args.batch_max_parallelism,
+        tools=tuple(args.tools) if args.tools is not None else None,
+        exclude_tools=tuple(args.exclude_tools),
+    )
 
     # Create MCP server
-    server_name = f"{CONFIG.server_name_prefix} {args.transport.upper()} Server"
     mcp = create_mcp_server(
-        server_name=server_name,
+        server_name=get_server_name(args),
         transport=args.transport,
         host=args.host,
         port=args.port,
         box_auth=args.box_auth,
         require_auth=not args.no_mcp_server_auth,
+        config=config,
     )
 
-    # Register all tools
-    register_tools(mcp)
-
-    # Register server info tool
+    # Register server info tool, first so that it is instrumented with the others
     create_server_info_tool(mcp, args.transport, args.box_auth, args.host, args.port)
 
+    # Register the selected tools
+    register_tools(mcp, config.tools, config.exclude_tools)
+
+    return mcp
+
+
+def create_worker_app():
+    """ASGI application factory run by each worker process.
+
+    Every worker rebuilds the server from the parent's command line, so it owns
+    its own lifespan-created Box client, HTTP pool and executor.
+    """
+    args = parse_arguments(json.loads(os.environ[WORKER_ARGV_ENV]))
+    return build_server(args).streamable_http_app()
+
+
+def run_workers(args: argparse.Namespace) -> None:
+    """Serve streamable-http from a pre-forked pool of worker processes.
+
+    The parent binds the socket once and the workers accept from it. Sending
+    SIGHUP to the parent restarts the workers one at a time for a graceful
+    reload; SIGTTIN and SIGTTOU add or remove a worker.
+    """
+    import uvicorn
+
+    os.environ[WORKER_ARGV_ENV] = json.dumps(sys.argv[1:])
+    uvicorn.run(
+        "mcp_server_box:create_worker_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="info",
+    )
+
+
+def main() -> int:
+    """Main entry point for the Box MCP Server."""
+    args = parse_arguments()
+    server_name = get_server_name(args)
+
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        return 1
+    if args.workers > 1 and args.transport != TransportType.STREAMABLE_HTTP.value:
+        print(
+            "Error: --workers requires the streamable-http transport", file=sys.stderr
+        )
+        return 1
+
     # Run server
     try:
         print(f"Starting {server_name} on {args.host}:{args.port}", file=sys.stderr)
-        mcp.run(transport=args.transport)
+        if args.workers > 1:
+            run_workers(args)
+        else:
+            mcp = build_server(args)
+            mcp.run(transport=args.transport)
         return 0
     except Exception as e:
         print(f"Error starting server: {e}", file=sys.stderr)
@@ -0,0 +1,384 @@
+"""Prometheus metrics for the tools and the Box API calls they make.
+
+The server only needs a handful of counters, gauges and histograms, so they
+are kept in process and rendered in the Prometheus text exposition format by
+``render_metrics`` instead of pulling in a client library. Every worker
+process keeps its own registry.
+"""
+
+import functools
+import inspect
+import logging
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Sequence, TypeVar
+
+from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tools wait on Box, so the tail goes well past the usual 10s
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = tuple[str, ...]
+M = TypeVar("M", bound="Metric")
+
+
+class Metric(ABC):
+    """Base class of a labelled metric family."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Return the exposition lines of every label set."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop the values of every label set."""
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._format_labels(key)} {_number(value)}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count], sum
+        self._values: dict[LabelValues, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted((key, (list(c), s)) for key, (c, s) in self._values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == math.inf else f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}"
+            labels = self._format_labels(key)
+            yield f"{self.name}_sum{labels} {_number(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """Ordered collection of metric families plus callbacks refreshed on scrape."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every render, to refresh derived gauges."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def clear(self) -> None:
+        """Reset every value, keeping the registered families."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = Registry()
+
+TOOL_CALLS = REGISTRY.register(
+    Counter("box_mcp_tool_calls_total", "Tool calls by outcome.", ["tool", "outcome"])
+)
+TOOL_ERRORS = REGISTRY.register(
+    Counter(
+        "box_mcp_tool_errors_total",
+        "Tool calls that raised or returned an error, by error type.",
+        ["tool", "error_type"],
+    )
+)
+TOOL_LATENCY = REGISTRY.register(
+    Histogram(
+        "box_mcp_tool_duration_seconds", "Tool call latency in seconds.", ["tool"]
+    )
+)
+TOOL_IN_FLIGHT = REGISTRY.register(
+    Gauge("box_mcp_tool_in_flight", "Tool calls currently running.", ["tool"])
+)
+BOX_API_REQUESTS = REGISTRY.register(
+    Counter(
+        "box_mcp_box_api_requests_total",
+        "HTTP requests sent to Box by method, endpoint and status code.",
+        ["method", "endpoint", "status"],
+    )
+)
+BOX_API_LATENCY = REGISTRY.register(
+    Histogram(
+        "box_mcp_box_api_request_duration_seconds",
+        "Box API request latency in seconds.",
+        ["method", "endpoint"],
+    )
+)
+BOX_API_RETRIES = REGISTRY.register(
+    Counter(
+        "box_mcp_box_api_retries_total",
+        "Box API requests repeated after a failed attempt.",
+        ["method", "endpoint"],
+    )
+)
+
+
+def render_metrics() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    return REGISTRY.render()
+
+
+# Path segments that identify an object rather than an endpoint: numeric ids
+# and long opaque ids such as upload session ids
+_ID_SEGMENT = re.compile(
+    r"^(\d[\d-]*|[0-9A-Fa-f]{16,}|[A-Za-z0-9_-]*\d[A-Za-z0-9_-]{15,})$"
+)
+# Error messages returned by the tools: "Error: ..." or "Error reading file: ..."
+_ERROR_MESSAGE = re.compile(r"^Error\b[^:]*:")
+
+
+def endpoint_label(path: str) -> str:
+    """Replace the object ids in a Box API path, keeping the label bounded."""
+    segments = path.split("?", 1)[0].split("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(s) else s for s in segments)
+
+
+def record_box_api_request(
+    method: str, path: str, status: int | str, duration: float
+) -> None:
+    endpoint = endpoint_label(path)
+    BOX_API_REQUESTS.inc(method=method, endpoint=endpoint, status=str(status))
+    BOX_API_LATENCY.observe(duration, method=method, endpoint=endpoint)
+
+
+def record_box_api_retry(method: str, path: str) -> None:
+    BOX_API_RETRIES.inc(method=method, endpoint=endpoint_label(path))
+
+
+def _error_type(result: Any) -> str | None:
+    """Return the error type of a tool result, following the tools' convention
+    of returning ``{"error": ...}``, or an ``"Error ...: ..."`` message for
+    the tools returning text, instead of raising."""
+    if isinstance(result, dict) and "error" in result:
+        return "error_response"
+    if isinstance(result, str) and _ERROR_MESSAGE.match(result):
+        return "error_message"
+    return None
+
+
+class _ToolCall:
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.done = False
+
+    def __enter__(self) -> "_ToolCall":
+        TOOL_IN_FLIGHT.inc(tool=self.tool)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.finish(exc_type.__name__ if exc_type else None)
+
+    def finish(self, error_type: str | None) -> None:
+        if self.done:
+            return
+        self.done = True
+        TOOL_LATENCY.observe(time.perf_counter() - self.start, tool=self.tool)
+        TOOL_IN_FLIGHT.dec(tool=self.tool)
+        TOOL_CALLS.inc(tool=self.tool, outcome="error" if error_type else "ok")
+        if error_type:
+            TOOL_ERRORS.inc(tool=self.tool, error_type=error_type)
+
+
+def instrument_tool(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool function so that every call is counted and timed."""
+    if getattr(func, "__box_mcp_instrumented__", False):
+        return func
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _ToolCall(name) as call:
+                result = await func(*args, **kwargs)
+                call.finish(_error_type(result))
+                return result
+
+    else:
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _ToolCall(name) as call:
+                result = func(*args, **kwargs)
+                call.finish(_error_type(result))
+                return result
+
+    wrapper.__box_mcp_instrumented__ = True
+    return wrapper
+
+
+def instrument_tools(mcp: FastMCP) -> None:
+    """Instrument every tool registered on ``mcp`` so far."""
+    for tool in mcp._tool_manager.list_tools():
+        tool.fn = instrument_tool(tool.name, tool.fn)
+
+
+def add_metrics_endpoint(mcp: FastMCP) -> None:
+    """Serve the metrics on ``/metrics`` of the HTTP transports."""
+
+    @mcp.custom_route(METRICS_PATH, methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+    logger.info(f"Serving Prometheus metrics on {METRICS_PATH}")
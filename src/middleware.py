@@ -1,70 +1,123 @@
 """Authentication middleware for MCP server."""
 
+import hmac
 import logging
 import os
+import weakref
+from typing import Iterable
 
-from fastapi import Request, status
 from mcp.server.fastmcp import FastMCP
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette import status
 from starlette.responses import JSONResponse
 from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from config import TransportType
 
 logger = logging.getLogger(__name__)
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to validate Bearer token authentication.
+AUTH_TOKEN_ENV = "BOX_MCP_SERVER_AUTH_TOKEN"
+OAUTH_DISCOVERY_PATH = "/.well-known/oauth-protected-resource"
+
+
+def load_auth_tokens() -> list[str]:
+    """Read the accepted bearer tokens from the environment.
+    Several tokens can be configured as a comma separated list, which allows
+    rotating a token without downtime.
+    """
+    raw_tokens = os.getenv(AUTH_TOKEN_ENV, "")
+    return [token.strip() for token in raw_tokens.split(",") if token.strip()]
+
+
+class AuthMiddleware:
+    """Pure ASGI middleware to validate Bearer token authentication.
     Expects the token to be set in the BOX_MCP_SERVER_AUTH_TOKEN environment variable.
     This middleware wont even be loaded if the --no-mcp-server-auth flag is set.
+
+    The tokens are read once when the middleware is created; call
+    `reload_tokens` (or `reload_auth_tokens` for every instance) after
+    changing them. Authorized requests are passed to the app untouched, so
+    streaming responses are not buffered.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    instances: "weakref.WeakSet[AuthMiddleware]" = weakref.WeakSet()
+
+    def __init__(self, app: ASGIApp, tokens: Iterable[str] | None = None):
+        self.app = app
+        self._tokens: tuple[bytes, ...] = ()
+        self.reload_tokens(tokens)
+        AuthMiddleware.instances.add(self)
+
+    def reload_tokens(self, tokens: Iterable[str] | None = None) -> None:
+        """Replace the accepted tokens, re-reading the environment by default."""
+        if tokens is None:
+            tokens = load_auth_tokens()
+        self._tokens = tuple(token.encode() for token in tokens)
+        if not self._tokens:
+            logger.warning("No token configured, rejecting all requests")
+
+    def is_valid_token(self, token: bytes) -> bool:
+        """Compare against every configured token in constant time."""
+        valid = False
+        for expected_token in self._tokens:
+            valid |= hmac.compare_digest(token, expected_token)
+        return valid
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Validate Bearer token before processing request."""
-        # logger.info(f"AuthMiddleware triggered for {request.url}")
-        # logger.info(f"Headers: {request.headers}")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Always allow OAuth discovery endpoint
-        if request.url.path == "/.well-known/oauth-protected-resource":
-            logger.info("Allowing OAuth discovery endpoint without authentication")
-            return await call_next(request)
-
-        expected_token = os.getenv("BOX_MCP_SERVER_AUTH_TOKEN")
+        if scope["path"] == OAUTH_DISCOVERY_PATH:
+            await self.app(scope, receive, send)
+            return
 
-        # if no expected token is set, reject all requests
-        if not expected_token:
-            logger.warning("No token configured, rejecting all requests")
-            return JSONResponse(
+        error = self.authenticate(scope)
+        if error is not None:
+            response = JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "No authentication token configured"},
+                content={"error": error},
             )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def authenticate(self, scope: Scope) -> str | None:
+        """Return an error message, or None when the request is authorized."""
+        # if no expected token is set, reject all requests
+        if not self._tokens:
+            return "No authentication token configured"
+
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
 
-        auth_header = request.headers.get("authorization")
         if not auth_header:
             logger.warning("Missing authorization header")
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "Missing authorization header"},
-            )
+            return "Missing authorization header"
 
-        if not auth_header.startswith("Bearer "):
+        if not auth_header.startswith(b"Bearer "):
             logger.warning("Invalid authorization header format")
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "Invalid authorization header"},
-            )
+            return "Invalid authorization header"
 
-        token = auth_header.replace("Bearer ", "")
-        if token != expected_token:
+        if not self.is_valid_token(auth_header[len(b"Bearer ") :]):
             logger.warning("Invalid token")
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"error": "Invalid token"},
-            )
+            return "Invalid token"
+
+        logger.debug("Authentication successful")
+        return None
+
 
-        logger.info("Authentication successful")
-        return await call_next(request)
+def reload_auth_tokens() -> None:
+    """Re-read the accepted tokens in every live AuthMiddleware."""
+    for middleware in list(AuthMiddleware.instances):
+        middleware.reload_tokens()
 
 
 def add_oauth_discovery_endpoint(app, transport: str) -> None:
@@ -91,9 +144,7 @@ def add_oauth_discovery_endpoint(app, transport: str) -> None:
     # Add the route at the beginning
     app.routes.insert(
         0,
-        Route(
-            "/.well-known/oauth-protected-resource", oauth_discovery, methods=["GET"]
-        ),
+        Route(OAUTH_DISCOVERY_PATH, oauth_discovery, methods=["GET"]),
     )
     logger.info("Added OAuth discovery endpoint")
 
@@ -1,26 +1,39 @@
 """MCP server configuration and initialization."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Iterable
 
 import tomli
 from mcp.server.fastmcp import FastMCP
 
-from config import CONFIG, TransportType
+from box_executor import configure_box_executor
+from box_http import shared_network_client
+from box_rate_limit import configure_rate_limiter
+from box_renditions import configure_rendition_cache
+from box_resilience import circuit_breaker_stats, configure_resilience
+from config import CONFIG, ServerConfig, TransportType
+from metrics import add_metrics_endpoint
 from middleware import add_auth_middleware
-from server_context import box_lifespan_ccg, box_lifespan_oauth
-from tool_registry import register_all_tools
-from tool_registry.ai_tools import register_ai_tools
-from tool_registry.collaboration_tools import register_collaboration_tools
-from tool_registry.doc_gen_tools import register_doc_gen_tools
-from tool_registry.file_tools import register_file_tools
-from tool_registry.folder_tools import register_folder_tools
-from tool_registry.generic_tools import register_generic_tools
-from tool_registry.group_tools import register_group_tools
-from tool_registry.metadata_tools import register_metadata_tools
-from tool_registry.search_tools import register_search_tools
-from tool_registry.shared_link_tools import register_shared_link_tools
-from tool_registry.user_tools import register_user_tools
-from tool_registry.web_link_tools import register_web_link_tools
+from server_context import get_box_lifespan
+from text_cache import configure_text_cache
+from tool_cache import configure_tool_cache, tool_cache_stats
+from tool_coalescing import configure_coalescing
+from tool_registry import register_all_tools, select_tool_groups
+from tool_registry.ai_tools import AI_TOOLS
+from tool_registry.batch_tools import BATCH_TOOLS
+from tool_registry.collaboration_tools import COLLABORATION_TOOLS
+from tool_registry.doc_gen_tools import DOC_GEN_TOOLS
+from tool_registry.file_tools import FILE_TOOLS
+from tool_registry.folder_tools import FOLDER_TOOLS
+from tool_registry.generic_tools import GENERIC_TOOLS
+from tool_registry.group_tools import GROUP_TOOLS
+from tool_registry.metadata_tools import METADATA_TOOLS
+from tool_registry.search_tools import SEARCH_TOOLS
+from tool_registry.shared_link_tools import SHARED_LINK_TOOLS
+from tool_registry.user_tools import USER_TOOLS
+from tool_registry.web_link_tools import WEB_LINK_TOOLS
+from tracing import add_tracing_middleware, configure_tracing
 
 
 def get_version() -> str:
@@ -41,11 +54,22 @@ def create_mcp_server(
     port: int = CONFIG.port,
     box_auth: str = CONFIG.box_auth,
     require_auth: bool = True,
+    config: ServerConfig = CONFIG,
 ) -> FastMCP:
     """Create and configure the MCP server."""
 
+    # Size the shared pool that runs the blocking Box calls for every tool
+    configure_box_executor(config.box_executor_max_workers)
+    configure_tool_cache(config.tool_cache_enabled, config.tool_cache_max_entries)
+    configure_coalescing(config.coalescing_enabled)
+    configure_text_cache(config)
+    configure_rendition_cache(config)
+    configure_tracing(config.trace_export_path)
+    configure_rate_limiter(config)
+    configure_resilience(config)
+
     # Select appropriate lifespan based on auth type
-    lifespan = box_lifespan_ccg if box_auth == "ccg" else box_lifespan_oauth
+    lifespan = get_box_lifespan(box_auth, config)
 
     # Create MCP server with appropriate transport
     if transport == TransportType.STDIO.value:
@@ -58,32 +82,77 @@ def create_mcp_server(
             port=port,
             lifespan=lifespan,
         )
+        if config.metrics_enabled:
+            add_metrics_endpoint(mcp)
+
         # Add authentication middleware for HTTP transports
         if require_auth:
             add_auth_middleware(mcp, transport)
+        add_tracing_middleware(mcp, transport)
+
+        hold_http_pool_for_app_lifetime(mcp, transport, config)
 
     return mcp
 
 
-def register_tools(mcp: FastMCP) -> None:
-    """Register all tools with the MCP server."""
-    register_all_tools(
-        mcp,
-        [
-            register_generic_tools,
-            register_search_tools,
-            register_ai_tools,
-            register_doc_gen_tools,
-            register_file_tools,
-            register_folder_tools,
-            register_metadata_tools,
-            register_user_tools,
-            register_group_tools,
-            register_collaboration_tools,
-            register_web_link_tools,
-            register_shared_link_tools,
-        ],
+def hold_http_pool_for_app_lifetime(
+    mcp: FastMCP, transport: str, config: ServerConfig = CONFIG
+) -> None:
+    """Keep the shared Box HTTP pool open while the HTTP app is running.
+
+    The Box lifespan runs for every stateless HTTP request, so without an
+    app level reference the pool would be closed between requests.
+    """
+    app_factory_name = (
+        "sse_app" if transport == TransportType.SSE.value else "streamable_http_app"
     )
+    original_app_factory = getattr(mcp, app_factory_name)
+
+    def wrapped_app_factory(*args, **kwargs):
+        app = original_app_factory(*args, **kwargs)
+        app_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app):
+            with shared_network_client(config):
+                async with app_lifespan(app) as state:
+                    yield state
+
+        app.router.lifespan_context = lifespan
+        return app
+
+    setattr(mcp, app_factory_name, wrapped_app_factory)
+
+
+# Every tool group, in the order the tools are listed
+TOOL_GROUPS = [
+    GENERIC_TOOLS,
+    SEARCH_TOOLS,
+    AI_TOOLS,
+    DOC_GEN_TOOLS,
+    FILE_TOOLS,
+    FOLDER_TOOLS,
+    METADATA_TOOLS,
+    USER_TOOLS,
+    GROUP_TOOLS,
+    COLLABORATION_TOOLS,
+    WEB_LINK_TOOLS,
+    SHARED_LINK_TOOLS,
+    BATCH_TOOLS,
+]
+
+
+def register_tools(
+    mcp: FastMCP,
+    tools: Iterable[str] | None = CONFIG.tools,
+    exclude_tools: Iterable[str] = CONFIG.exclude_tools,
+) -> None:
+    """Register the selected tools with the MCP server.
+
+    ``tools`` and ``exclude_tools`` name tool groups or single tools, see
+    ``select_tool_groups``; every tool is registered by default.
+    """
+    register_all_tools(mcp, select_tool_groups(TOOL_GROUPS, tools, exclude_tools))
 
 
 def create_server_info_tool(
@@ -109,4 +178,12 @@ def create_server_info_tool(
             info["host"] = host
             info["port"] = str(port)
 
+        cache_stats = tool_cache_stats()
+        if cache_stats:
+            info["tool_cache"] = cache_stats
+
+        breakers = circuit_breaker_stats()
+        if breakers:
+            info["circuit_breakers"] = breakers
+
         return info
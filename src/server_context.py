@@ -1,33 +1,372 @@
-from contextlib import asynccontextmanager
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
-from typing import AsyncIterator
+from functools import partial
+from typing import Any, AsyncIterator, Iterator, List, Optional
 
 from box_ai_agents_toolkit import BoxClient, get_ccg_client, get_oauth_client
+from box_sdk_gen import AccessToken, Authentication, NetworkSession
+from box_sdk_gen.box.token_storage import FileWithInMemoryCacheTokenStorage
 from mcp.server.fastmcp import FastMCP
 
+from box_http import PooledBoxNetworkClient, shared_network_client
+from config import CONFIG, ServerConfig
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process refresh lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class BoxContext:
     client: BoxClient | None = None
+    http_client: PooledBoxNetworkClient | None = None
+    config: ServerConfig = CONFIG
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Return the connection pool statistics of the Box HTTP transport."""
+        if self.http_client is None:
+            return {}
+        return self.http_client.stats()
+
+
+def use_network_client(
+    client: BoxClient | None, http_client: PooledBoxNetworkClient
+) -> None:
+    """Route every request made by the Box client through the pooled transport"""
+    if client is not None:
+        client.network_session.network_client = http_client
+
+
+class BoxTokenManager(Authentication):
+    """Single-flight access token coordinator shared by every Box client.
+
+    Wraps the OAuth or CCG authentication of the toolkit client so that:
+    - the token is refreshed proactively ``refresh_margin`` seconds before it
+      expires instead of waiting for a 401,
+    - concurrent refreshes collapse into one request to Box, so in-flight
+      tool calls do not invalidate each other's refresh tokens,
+    - the expiry of the token is persisted to ``cache_path``, so a restarted
+      process knows when to refresh it.
+
+    The token itself only lives in the token storage of the wrapped auth
+    (``.auth.oauth`` or ``.auth.ccg``), which the SDK writes on every
+    refresh. ``cache_path`` holds the expiry of each token, identified by a
+    hash of the access token, so a stale entry never applies to another token.
+    """
+
+    def __init__(
+        self,
+        auth: Authentication,
+        cache_key: str,
+        cache_path: str | None = CONFIG.box_token_cache_path,
+        refresh_margin: float = CONFIG.box_token_refresh_margin,
+    ):
+        super().__init__()
+        self.auth = auth
+        self.cache_key = cache_key
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self.refresh_count = 0
+        self._lock = threading.Lock()
+        self._token: AccessToken | None = None
+        self._expires_at: float | None = None
+        self._load_cache()
+
+    @property
+    def expires_at(self) -> float | None:
+        return self._expires_at
+
+    def _needs_refresh(self) -> bool:
+        if self._token is None:
+            return True
+        if self._expires_at is None:
+            return False
+        return time.time() >= self._expires_at - self.refresh_margin
+
+    def retrieve_token(
+        self, *, network_session: Optional[NetworkSession] = None
+    ) -> AccessToken:
+        """Return the current token, refreshing it first if it is about to expire."""
+        token = self._token
+        if token is not None and not self._needs_refresh():
+            return token
+
+        with self._lock:
+            if self._token is None:
+                # First use: the wrapped auth returns its stored token, or
+                # fetches one for CCG; OAuth raises if the app is not authorized.
+                token = self.auth.retrieve_token(network_session=network_session)
+                expires_at = self._cached_expiry(token)
+                if expires_at is None:
+                    self._set_token(token, persist=False)
+                else:
+                    self._token, self._expires_at = token, expires_at
+            if self._needs_refresh():
+                self._refresh_locked(network_session)
+            return self._token
+
+    def refresh_token(
+        self, *, network_session: Optional[NetworkSession] = None
+    ) -> AccessToken:
+        """Refresh the token, sharing the result with concurrent callers.
+
+        Callers that were waiting on an in-flight refresh reuse its token
+        instead of issuing their own request.
+        """
+        seen = self._token
+        with self._lock:
+            if self._token is not None and self._token is not seen:
+                return self._token
+            return self._refresh_locked(network_session)
+
+    def _refresh_locked(self, network_session: Optional[NetworkSession]) -> AccessToken:
+        with self._cache_file_lock():
+            # Another worker process may already have refreshed the token;
+            # refreshing again would invalidate its OAuth refresh token.
+            if self._adopt_cached_token():
+                return self._token
+            token = self.auth.refresh_token(network_session=network_session)
+            self.refresh_count += 1
+            self._set_token(token)
+        logger.info(f"Refreshed Box access token for {self.cache_key}")
+        return token
+
+    def _set_token(self, token: AccessToken, persist: bool = True) -> None:
+        self._token = token
+        expires_in = getattr(token, "expires_in", None)
+        self._expires_at = time.time() + expires_in if expires_in else None
+        if persist:
+            self._save_cache()
+
+    def retrieve_authorization_header(
+        self, *, network_session: Optional[NetworkSession] = None
+    ) -> str:
+        token = self.retrieve_token(network_session=network_session)
+        return "Bearer " + token.access_token
+
+    def revoke_token(self, *, network_session: Optional[NetworkSession] = None) -> None:
+        with self._lock:
+            self.auth.revoke_token(network_session=network_session)
+            self._token = None
+            self._expires_at = None
+            self._save_cache()
+
+    def reset(self) -> None:
+        """Forget the token, as when the app is authorized for another user.
+
+        The next call reads the newly stored token from the wrapped auth.
+        """
+        with self._lock:
+            self._stored_token()
+            self._token = None
+            self._expires_at = None
+            self._save_cache()
+        logger.info(f"Reset Box access token for {self.cache_key}")
+
+    def downscope_token(
+        self,
+        scopes: List[str],
+        *,
+        resource: Optional[str] = None,
+        shared_link: Optional[str] = None,
+        network_session: Optional[NetworkSession] = None,
+    ) -> AccessToken:
+        return self.auth.downscope_token(
+            scopes,
+            resource=resource,
+            shared_link=shared_link,
+            network_session=network_session,
+        )
+
+    def _read_cache_file(self) -> dict[str, Any]:
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.cache_path}: {e}")
+            return {}
+
+    @contextmanager
+    def _cache_file_lock(self) -> Iterator[None]:
+        """Serialize refreshes across the processes sharing the token cache"""
+        if not self.cache_path or fcntl is None:
+            yield
+            return
+        with open(self.cache_path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _stored_token(self) -> AccessToken | None:
+        """Read the token of the wrapped auth, as last stored by any process"""
+        token_storage = getattr(self.auth, "token_storage", None)
+        if token_storage is None:
+            return None
+        if isinstance(token_storage, FileWithInMemoryCacheTokenStorage):
+            # Drop the in-memory copy: another process, or a new
+            # authorization, may have replaced the token on disk
+            token_storage.cached_token = None
+        return token_storage.get()
+
+    def _cached_expiry(self, token: AccessToken) -> float | None:
+        entry = self._read_cache_file().get(self.cache_key)
+        if not entry or entry.get("token_sha256") != token_fingerprint(token):
+            return None
+        return entry.get("expires_at")
+
+    def _load_cache(self) -> None:
+        token = self._stored_token()
+        if token is None:
+            return
+        expires_at = self._cached_expiry(token)
+        if expires_at is None:
+            # Unknown expiry: the token is refreshed on its first 401
+            return
+        if time.time() >= expires_at:
+            # Only the refresh token may still be usable; let the wrapped
+            # auth refresh on first use.
+            expires_at = time.time()
+        self._token = token
+        self._expires_at = expires_at
+        logger.info(f"Loaded cached Box access token expiry for {self.cache_key}")
+
+    def _adopt_cached_token(self) -> bool:
+        """Use a fresher token stored by another process"""
+        if self._token is None:
+            return False
+        token = self._stored_token()
+        if token is None or token.access_token == self._token.access_token:
+            return False
+        expires_at = self._cached_expiry(token)
+        if expires_at is None or time.time() >= expires_at - self.refresh_margin:
+            return False
+        self._token = token
+        self._expires_at = expires_at
+        logger.info("Adopted Box access token refreshed by another process")
+        return True
+
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        entries = self._read_cache_file()
+        if self._token is None:
+            entries.pop(self.cache_key, None)
+        else:
+            entries[self.cache_key] = {
+                "token_sha256": token_fingerprint(self._token),
+                "expires_at": self._expires_at,
+            }
+
+        # Write atomically so a concurrent reader never sees a partial file
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".token_cache")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not persist token cache {self.cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def token_fingerprint(token: AccessToken) -> str:
+    """Identify a token in the expiry cache without storing it there"""
+    return hashlib.sha256((token.access_token or "").encode()).hexdigest()
+
+
+_token_managers: dict[str, BoxTokenManager] = {}
+_token_managers_lock = threading.Lock()
+
+
+def token_cache_key(box_auth: str, auth: Authentication) -> str:
+    """Identify the Box app and subject a token belongs to"""
+    auth_config = getattr(auth, "config", None)
+    parts = [box_auth, str(getattr(auth_config, "client_id", None))]
+    if box_auth == "ccg":
+        parts.append(str(getattr(auth, "subject_id", None)))
+    return ":".join(parts)
+
+
+def get_token_manager(
+    box_auth: str, auth: Authentication, config: ServerConfig = CONFIG
+) -> BoxTokenManager:
+    """Return the process wide token manager for the Box app and subject"""
+    cache_key = token_cache_key(box_auth, auth)
+    with _token_managers_lock:
+        token_manager = _token_managers.get(cache_key)
+        if token_manager is None:
+            token_manager = BoxTokenManager(
+                auth,
+                cache_key,
+                cache_path=config.box_token_cache_path,
+                refresh_margin=config.box_token_refresh_margin,
+            )
+            _token_managers[cache_key] = token_manager
+        return token_manager
+
+
+def reset_token_managers() -> None:
+    """Reset every token manager after the Box app was authorized again"""
+    with _token_managers_lock:
+        token_managers = list(_token_managers.values())
+    for token_manager in token_managers:
+        token_manager.reset()
+
+
+def use_token_manager(client: BoxClient | None, token_manager: BoxTokenManager) -> None:
+    """Authenticate every request made by the Box client through the token manager"""
+    if client is None:
+        return
+    client.auth = token_manager
+    # The resource managers keep their own reference to the auth object
+    for manager in vars(client).values():
+        if hasattr(manager, "auth") and hasattr(manager, "network_session"):
+            manager.auth = token_manager
 
 
 @asynccontextmanager
-async def box_lifespan_oauth(server: FastMCP) -> AsyncIterator[BoxContext]:
+async def box_lifespan_oauth(
+    server: FastMCP, config: ServerConfig = CONFIG
+) -> AsyncIterator[BoxContext]:
     """Manage Box client lifecycle with OAuth handling"""
-    try:
+    with shared_network_client(config) as http_client:
         client = get_oauth_client()
-        yield BoxContext(client=client)
-    finally:
-        # Cleanup (if needed)
-        pass
+        use_network_client(client, http_client)
+        if client is not None:
+            use_token_manager(client, get_token_manager("oauth", client.auth, config))
+        yield BoxContext(client=client, http_client=http_client, config=config)
 
 
 @asynccontextmanager
-async def box_lifespan_ccg(server: FastMCP) -> AsyncIterator[BoxContext]:
+async def box_lifespan_ccg(
+    server: FastMCP, config: ServerConfig = CONFIG
+) -> AsyncIterator[BoxContext]:
     """Manage Box client lifecycle with CCG handling"""
-    try:
+    with shared_network_client(config) as http_client:
         client = get_ccg_client()
-        yield BoxContext(client=client)
-    finally:
-        # Cleanup (if needed)
-        pass
+        use_network_client(client, http_client)
+        if client is not None:
+            use_token_manager(client, get_token_manager("ccg", client.auth, config))
+        yield BoxContext(client=client, http_client=http_client, config=config)
+
+
+def get_box_lifespan(box_auth: str, config: ServerConfig = CONFIG):
+    """Return the lifespan for the auth type, bound to the server configuration"""
+    lifespan = box_lifespan_ccg if box_auth == "ccg" else box_lifespan_oauth
+    return partial(lifespan, config=config)
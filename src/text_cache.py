@@ -0,0 +1,279 @@
+"""Persistent cache of the text extracted from Box files.
+
+Extracting the text of a document means downloading and converting one of
+its representations, which is slow and repeated every time an agent reads
+the same file. The extracted text is therefore stored on disk, one file per
+entry named after the Box file id and the SHA-1 of its current content. A
+cheap metadata request tells whether the file changed since: a new version
+has a new SHA-1, so its text is extracted again and the stale entry is
+replaced.
+
+Entries are written atomically (temporary file and rename) and the least
+recently used ones are evicted once the cache grows beyond ``max_bytes``.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from box_ai_agents_toolkit import BoxClient, box_file_text_extract
+
+from config import CONFIG, ServerConfig
+from metrics import REGISTRY, Counter
+
+logger = logging.getLogger(__name__)
+
+ENTRY_SUFFIX = ".txt"
+# <file id>-<sha1>.txt
+ENTRY_PATTERN = re.compile(r"^(\d+)-([0-9a-f]{40})\.txt$")
+
+TEXT_CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "box_mcp_text_cache_lookups_total",
+        "Extracted text cache lookups, by outcome (hit or miss).",
+        ["outcome"],
+    )
+)
+
+
+class TextCache:
+    """Size bounded LRU cache of extracted text on disk."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry_name(file_id: str, sha1: str) -> str:
+        return f"{file_id}-{sha1.lower()}{ENTRY_SUFFIX}"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> OrderedDict[str, int]:
+        """Index the entries on disk, least recently used first."""
+        if self._entries is None:
+            os.makedirs(self.directory, exist_ok=True)
+            found = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if ENTRY_PATTERN.match(entry.name) and entry.is_file():
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.name, stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((name, size) for _, name, size in found)
+            self._size = sum(self._entries.values())
+        return self._entries
+
+    def get(self, file_id: str, sha1: str) -> str | None:
+        """Return the cached text of this file version, or None."""
+        name = self.entry_name(file_id, sha1)
+        with self._lock:
+            entries = self._load()
+            if name not in entries:
+                TEXT_CACHE_LOOKUPS.inc(outcome="miss")
+                return None
+            try:
+                with open(self._path(name), encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                # Removed behind our back, forget it
+                self._size -= entries.pop(name)
+                TEXT_CACHE_LOOKUPS.inc(outcome="miss")
+                return None
+            entries.move_to_end(name)
+            # The modification time orders the entries when the index is rebuilt
+            os.utime(self._path(name))
+            TEXT_CACHE_LOOKUPS.inc(outcome="hit")
+            return text
+
+    def put(self, file_id: str, sha1: str, text: str) -> None:
+        """Store the text of this file version, replacing older versions."""
+        name = self.entry_name(file_id, sha1)
+        data = text.encode("utf-8")
+        with self._lock:
+            entries = self._load()
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, self._path(name))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._size -= entries.pop(name, 0)
+            entries[name] = len(data)
+            self._size += len(data)
+            for stale in [n for n in entries if n.startswith(f"{file_id}-")]:
+                if stale != name:
+                    self._remove(stale)
+            while self._size > self.max_bytes and len(entries) > 1:
+                self._remove(next(iter(entries)))
+                self.evictions += 1
+
+    def _remove(self, name: str) -> None:
+        self._size -= self._entries.pop(name)
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def purge(self, file_id: str | None = None) -> int:
+        """Remove the entries of ``file_id``, or every entry, returning how many."""
+        with self._lock:
+            entries = self._load()
+            names = [
+                name
+                for name in entries
+                if file_id is None or name.startswith(f"{file_id}-")
+            ]
+            for name in names:
+                self._remove(name)
+            return len(names)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries = self._load()
+            return {
+                "directory": os.path.abspath(self.directory),
+                "entries": len(entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+    def list_entries(self) -> list[dict[str, Any]]:
+        """Describe the entries, most recently used first."""
+        with self._lock:
+            entries = self._load()
+            described = []
+            for name, size in reversed(entries.items()):
+                match = ENTRY_PATTERN.match(name)
+                try:
+                    used = os.path.getmtime(self._path(name))
+                except OSError:
+                    continue
+                described.append(
+                    {
+                        "file_id": match.group(1),
+                        "sha1": match.group(2),
+                        "size_bytes": size,
+                        "last_used": time.strftime(
+                            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(used)
+                        ),
+                    }
+                )
+            return described
+
+
+_text_cache: TextCache | None = None
+_configured = False
+
+
+def configure_text_cache(config: ServerConfig = CONFIG) -> TextCache | None:
+    """Open the cache in ``config.text_cache_path``, or disable it if unset."""
+    global _text_cache, _configured
+    _text_cache = None
+    if config.text_cache_path:
+        _text_cache = TextCache(config.text_cache_path, config.text_cache_max_bytes)
+    _configured = True
+    if _text_cache is not None:
+        logger.info(f"Extracted text cache in {config.text_cache_path}")
+    return _text_cache
+
+
+def get_text_cache() -> TextCache | None:
+    """Return the shared cache, configuring it from ``CONFIG`` if needed."""
+    if not _configured:
+        return configure_text_cache()
+    return _text_cache
+
+
+def file_sha1(client: BoxClient, file_id: str) -> str | None:
+    """Return the SHA-1 of the current version of a file, if Box knows it."""
+    file = client.files.get_file_by_id(file_id, fields=["sha1", "file_version"])
+    return file.sha_1 or (file.file_version.sha_1 if file.file_version else None)
+
+
+def extract_file_text(
+    client: BoxClient,
+    file_id: str,
+    cache: TextCache | None = None,
+    sha1: str | None = None,
+) -> dict[str, Any]:
+    """Return the extracted text of a file, from the cache when unchanged.
+
+    Behaves like ``box_file_text_extract``; only successful extractions of
+    files whose SHA-1 is known are cached. ``sha1`` saves the metadata
+    request when the caller already knows it.
+    """
+    if cache is None or not file_id.isdigit():
+        return box_file_text_extract(client, file_id)
+
+    sha1 = sha1 or file_sha1(client, file_id)
+    if not sha1:
+        return box_file_text_extract(client, file_id)
+
+    text = cache.get(file_id, sha1)
+    if text is not None:
+        return {"content": text}
+
+    result = box_file_text_extract(client, file_id)
+    if isinstance(result.get("content"), str):
+        cache.put(file_id, sha1, result["content"])
+    return result
+
+
+def read_text_window(
+    client: BoxClient,
+    file_id: str,
+    offset: int,
+    max_chars: int,
+    cache: TextCache | None = None,
+    sha1: str | None = None,
+) -> dict[str, Any]:
+    """Return ``max_chars`` characters of the text of a file from ``offset``.
+
+    The result holds the window ``content``, its ``offset``, the
+    ``total_chars`` of the text and the ``next_offset`` to continue from, or
+    None at the end. When ``sha1`` is given, reading fails with
+    ``ValueError`` if the file changed since. Failed extractions are returned
+    as is.
+    """
+    if offset < 0:
+        raise ValueError("offset must be at least 0")
+    if max_chars < 1:
+        raise ValueError("max_chars must be at least 1")
+
+    current_sha1 = None
+    if file_id.isdigit() and (cache is not None or sha1):
+        current_sha1 = file_sha1(client, file_id)
+        if sha1 and current_sha1 and sha1 != current_sha1:
+            raise ValueError(
+                f"File {file_id} changed since the previous window, "
+                "read it again from offset 0"
+            )
+    result = extract_file_text(client, file_id, cache, sha1=current_sha1)
+    text = result.get("content")
+    if not isinstance(text, str):
+        return result
+
+    end = offset + max_chars
+    return {
+        "content": text[offset:end],
+        "offset": offset,
+        "total_chars": len(text),
+        "next_offset": end if end < len(text) else None,
+        "sha1": current_sha1,
+    }
@@ -0,0 +1,201 @@
+"""TTL/LRU response cache for read-only Box tools."""
+
+import copy
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, TypeVar, cast
+
+from box_ai_agents_toolkit import BoxClient
+
+from config import CONFIG
+from metrics import REGISTRY, Gauge
+from server_context import BoxContext
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ToolCache:
+    """Size bounded LRU cache whose entries expire after a per-tool TTL."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(found, value)``, counting the lookup as a hit or miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "maxsize": self.maxsize,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_enabled = CONFIG.tool_cache_enabled
+_default_maxsize = CONFIG.tool_cache_max_entries
+_caches: dict[str, ToolCache] = {}
+_caches_lock = threading.Lock()
+
+
+def configure_tool_cache(
+    enabled: bool, max_entries: int = CONFIG.tool_cache_max_entries
+) -> None:
+    """Enable or disable the cache and drop every cached response."""
+    global _enabled, _default_maxsize
+    if max_entries < 1:
+        raise ValueError("max_entries must be at least 1")
+    with _caches_lock:
+        _enabled = enabled
+        _default_maxsize = max_entries
+        _caches.clear()
+    logger.info(
+        f"Tool cache {'enabled' if enabled else 'disabled'} (max_entries={max_entries})"
+    )
+
+
+def get_tool_cache(name: str, ttl: float, maxsize: int | None = None) -> ToolCache:
+    """Return the cache of tool ``name``, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = ToolCache(name, ttl, maxsize or _default_maxsize)
+            _caches[name] = cache
+        return cache
+
+
+def clear_tool_cache() -> None:
+    """Drop the cached responses of every tool, keeping their counters."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def tool_cache_stats() -> dict[str, dict[str, Any]]:
+    """Return the counters of every tool cache, keyed by tool name."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+# Gauges rather than counters: the caches are dropped on reconfiguration
+CACHE_HITS = REGISTRY.register(
+    Gauge("box_mcp_tool_cache_hits", "Tool cache hits.", ["tool"])
+)
+CACHE_MISSES = REGISTRY.register(
+    Gauge("box_mcp_tool_cache_misses", "Tool cache misses.", ["tool"])
+)
+CACHE_HIT_RATIO = REGISTRY.register(
+    Gauge("box_mcp_tool_cache_hit_ratio", "Tool cache hit ratio.", ["tool"])
+)
+
+
+def _collect_cache_metrics() -> None:
+    for tool, stats in tool_cache_stats().items():
+        CACHE_HITS.set(stats["hits"], tool=tool)
+        CACHE_MISSES.set(stats["misses"], tool=tool)
+        CACHE_HIT_RATIO.set(stats["hit_ratio"], tool=tool)
+
+
+REGISTRY.add_collector(_collect_cache_metrics)
+
+
+def client_identity(client: BoxClient) -> Hashable:
+    """Identify the Box user a client acts as, so users never share entries."""
+    auth = client.auth
+    auth_key = getattr(auth, "cache_key", None) or f"{type(auth).__name__}:{id(auth)}"
+    headers = client.network_session.additional_headers or {}
+    return auth_key, headers.get("As-User"), headers.get("As-Enterprise")
+
+
+def arguments_key(bound: inspect.BoundArguments) -> str:
+    """Serialize the tool arguments, except the context, in a stable order."""
+    arguments = {name: v for name, v in bound.arguments.items() if name != "ctx"}
+    return json.dumps(arguments, sort_keys=True, default=str)
+
+
+def cached_tool(
+    ttl: float, maxsize: int | None = None
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache the results of a read-only async tool for ``ttl`` seconds.
+
+    Entries are keyed by the Box identity of the caller and the tool
+    arguments. Error responses and exceptions are never cached. The cache is
+    bypassed entirely unless enabled with ``configure_tool_cache``.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not _enabled:
+                return await func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            ctx = bound.arguments.get("ctx")
+            client = cast(BoxContext, ctx.request_context.lifespan_context).client
+            if client is None:
+                return await func(*args, **kwargs)
+
+            cache = get_tool_cache(func.__name__, ttl, maxsize)
+            key = (client_identity(client), arguments_key(bound))
+            found, value = cache.get(key)
+            if found:
+                return copy.deepcopy(value)
+
+            result = await func(*args, **kwargs)
+            if not (isinstance(result, dict) and "error" in result):
+                cache.set(key, copy.deepcopy(result))
+            return result
+
+        return wrapper
+
+    return decorator
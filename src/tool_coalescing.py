@@ -0,0 +1,113 @@
+"""Single-flight coalescing of identical concurrent read-only tool calls.
+
+When a read-only tool is called while an identical call (same tool, same
+arguments, same Box identity) is still running, the new call waits for the
+running one and shares its result instead of calling Box again. Unlike the
+tool cache, nothing is kept once the call completes.
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar, cast
+
+from config import CONFIG
+from metrics import REGISTRY, Counter
+from server_context import BoxContext
+from tool_cache import arguments_key, client_identity
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+COALESCED_CALLS = REGISTRY.register(
+    Counter(
+        "box_mcp_tool_calls_coalesced_total",
+        "Tool calls that shared the result of an identical call in flight.",
+        ["tool"],
+    )
+)
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await ``func()``, or the call already running under ``key``.
+
+        The call runs in its own task, so cancelling one of the callers does
+        not cancel it for the others. Callers that joined a running call get
+        a copy of its result.
+        """
+        task = self._calls.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            COALESCED_CALLS.inc(tool=self.name)
+            return copy.deepcopy(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        task.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieved here so that a call left without callers is not logged
+            task.exception()
+
+
+_enabled = CONFIG.coalescing_enabled
+_flights: dict[str, SingleFlight] = {}
+
+
+def configure_coalescing(enabled: bool) -> None:
+    """Enable or disable coalescing of identical concurrent tool calls."""
+    global _enabled
+    _enabled = enabled
+    logger.info(f"Tool call coalescing {'enabled' if enabled else 'disabled'}")
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the single-flight group of tool ``name``, creating it on first use."""
+    flight = _flights.get(name)
+    if flight is None:
+        flight = _flights[name] = SingleFlight(name)
+    return flight
+
+
+def coalesced_tool(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Share one call of a read-only async tool among identical concurrent calls.
+
+    Calls are identical when they come from the same Box identity with the
+    same arguments. Apply it above ``cached_tool`` so that concurrent cache
+    misses are coalesced as well.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        if not _enabled:
+            return await func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        ctx = bound.arguments.get("ctx")
+        client = cast(BoxContext, ctx.request_context.lifespan_context).client
+        if client is None:
+            return await func(*args, **kwargs)
+
+        key = (client_identity(client), arguments_key(bound))
+        flight = get_single_flight(func.__name__)
+        return await flight.do(key, lambda: func(*args, **kwargs))
+
+    return wrapper
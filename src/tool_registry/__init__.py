@@ -1,12 +1,163 @@
 # src/tool_registry/__init__.py
-from typing import Callable, List
+"""Registration of the tools exposed by the server.
+
+Each ``tool_registry`` module describes its tools with a ``ToolGroup``: the
+implementation module and the names of the functions to expose. Registering
+a group through ``register_all_tools`` does not import the implementation;
+the module, and the Box SDK code it pulls in, is imported the first time one
+of its tools is listed or called.
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass, replace
+from typing import Callable, Iterable, List, Sequence, Union
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool, ToolManager
+
+from metrics import instrument_tool, instrument_tools
+from tracing import trace_tool, trace_tools
+
+logger = logging.getLogger(__name__)
 
 ToolRegistrar = Callable[[FastMCP], None]
 
 
-def register_all_tools(mcp: FastMCP, registrars: List[ToolRegistrar]):
-    """Register all tools from provided registrars"""
+@dataclass(frozen=True)
+class ToolGroup:
+    """The tools implemented by one ``tools`` module."""
+
+    name: str
+    module: str
+    tools: tuple[str, ...]
+
+    def load(self) -> list[Callable]:
+        """Import the implementation module and return the tool functions."""
+        module = importlib.import_module(self.module)
+        return [getattr(module, tool) for tool in self.tools]
+
+    def register(self, mcp: FastMCP) -> None:
+        """Register the tools on ``mcp`` right away."""
+        for func in self.load():
+            mcp.tool()(func)
+
+
+def select_tool_groups(
+    groups: Sequence[ToolGroup],
+    tools: Iterable[str] | None = None,
+    exclude_tools: Iterable[str] = (),
+) -> list[ToolGroup]:
+    """Narrow ``groups`` down to the selected tools.
+
+    ``tools`` and ``exclude_tools`` hold group names (the ``tool_registry``
+    module names, such as ``file_tools``) or tool names. Every tool is
+    selected when ``tools`` is None. Raises ``ValueError`` for unknown names.
+    """
+    group_tools = {group.name: set(group.tools) for group in groups}
+    all_tools = set().union(*group_tools.values())
+
+    def expand(names: Iterable[str]) -> set[str]:
+        expanded = set()
+        for name in names:
+            if name in group_tools:
+                expanded |= group_tools[name]
+            elif name in all_tools:
+                expanded.add(name)
+            else:
+                raise ValueError(
+                    f"Unknown tool or tool group: {name} "
+                    f"(groups: {', '.join(sorted(group_tools))})"
+                )
+        return expanded
+
+    selected = all_tools if tools is None else expand(tools)
+    selected = selected - expand(exclude_tools)
+    narrowed = []
+    for group in groups:
+        kept = tuple(tool for tool in group.tools if tool in selected)
+        if kept:
+            narrowed.append(replace(group, tools=kept))
+    return narrowed
+
+
+def prepare_tool(tool: Tool) -> None:
+    """Instrument a registered tool for metrics and tracing."""
+    tool.fn = trace_tool(
+        tool.name, instrument_tool(tool.name, tool.fn), tool.context_kwarg
+    )
+
+
+class LazyToolManager(ToolManager):
+    """Tool manager that registers tool groups on first use.
+
+    Calling a tool loads its group only; listing the tools loads them all.
+    """
+
+    def __init__(self, *args, prepare: Callable[[Tool], None] = prepare_tool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepare = prepare
+        self._pending: dict[str, ToolGroup] = {}
+
+    @classmethod
+    def install(cls, mcp: FastMCP) -> "LazyToolManager":
+        """Replace the tool manager of ``mcp``, keeping its tools."""
+        manager = mcp._tool_manager
+        if not isinstance(manager, cls):
+            manager = cls(manager.warn_on_duplicate_tools, tools=manager.list_tools())
+            mcp._tool_manager = manager
+        return manager
+
+    def add_group(self, group: ToolGroup) -> None:
+        for tool in group.tools:
+            self._pending[tool] = group
+
+    def pending_groups(self) -> list[ToolGroup]:
+        return list(dict.fromkeys(self._pending.values()))
+
+    def _load(self, group: ToolGroup) -> None:
+        logger.debug(f"Loading the {group.name} tools from {group.module}")
+        for tool in group.tools:
+            self._pending.pop(tool, None)
+        for func in group.load():
+            self.prepare(self.add_tool(func))
+
+    def get_tool(self, name: str) -> Tool | None:
+        group = self._pending.get(name)
+        if group is not None:
+            self._load(group)
+        return super().get_tool(name)
+
+    def list_tools(self) -> list[Tool]:
+        for group in self.pending_groups():
+            self._load(group)
+        return super().list_tools()
+
+
+def get_tool(mcp: FastMCP, name: str) -> Tool | None:
+    """Return the tool registered on ``mcp`` as ``name``, or None.
+
+    A tool of a lazily registered group is loaded by the lookup. FastMCP has
+    no public lookup of its tools, so this reads its tool manager, which
+    ``LazyToolManager.install`` replaces as well (mcp 1.x, see pyproject).
+    """
+    return mcp._tool_manager.get_tool(name)
+
+
+def register_all_tools(
+    mcp: FastMCP, registrars: Iterable[Union[ToolRegistrar, ToolGroup]]
+) -> None:
+    """Register all tools from provided registrars, instrumented for metrics
+    and tracing. Tool groups are loaded lazily, on first use."""
+    registrars: List[Union[ToolRegistrar, ToolGroup]] = list(registrars)
     for registrar in registrars:
-        registrar(mcp)
+        if not isinstance(registrar, ToolGroup):
+            registrar(mcp)
+    instrument_tools(mcp)
+    trace_tools(mcp)
+
+    groups = [r for r in registrars if isinstance(r, ToolGroup)]
+    if groups:
+        manager = LazyToolManager.install(mcp)
+        for group in groups:
+            manager.add_group(group)
@@ -0,0 +1,13 @@
+from mcp.server.fastmcp import FastMCP
+
+from tool_registry import ToolGroup
+
+BATCH_TOOLS = ToolGroup(
+    "batch_tools",
+    "tools.box_tools_batch",
+    ("box_batch_tool",),
+)
+
+
+def register_batch_tools(mcp: FastMCP):
+    BATCH_TOOLS.register(mcp)
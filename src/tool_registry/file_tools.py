@@ -1,15 +1,19 @@
 from mcp.server.fastmcp import FastMCP
 
-from tools.box_tools_files import (
-    box_download_file_tool,
-    box_read_tool,
-    box_upload_file_from_content_tool,
-    box_upload_file_from_path_tool,
+from tool_registry import ToolGroup
+
+FILE_TOOLS = ToolGroup(
+    "file_tools",
+    "tools.box_tools_files",
+    (
+        "box_read_tool",
+        "box_download_file_tool",
+        "box_upload_file_from_content_tool",
+        "box_upload_file_from_path_tool",
+        "box_text_cache_tool",
+    ),
 )
 
 
 def register_file_tools(mcp: FastMCP):
-    mcp.tool()(box_read_tool)
-    mcp.tool()(box_download_file_tool)
-    mcp.tool()(box_upload_file_from_content_tool)
-    mcp.tool()(box_upload_file_from_path_tool)
+    FILE_TOOLS.register(mcp)
@@ -1,11 +1,16 @@
 from mcp.server.fastmcp import FastMCP
 
-from tools.box_tools_folders import (
-    box_list_folder_content_by_folder_id,
-    box_manage_folder_tool,
+from tool_registry import ToolGroup
+
+FOLDER_TOOLS = ToolGroup(
+    "folder_tools",
+    "tools.box_tools_folders",
+    (
+        "box_list_folder_content_by_folder_id",
+        "box_manage_folder_tool",
+    ),
 )
 
 
 def register_folder_tools(mcp: FastMCP):
-    mcp.tool()(box_list_folder_content_by_folder_id)
-    mcp.tool()(box_manage_folder_tool)
+    FOLDER_TOOLS.register(mcp)
@@ -1,11 +1,16 @@
 from mcp.server.fastmcp import FastMCP
 
-from tools.box_tools_generic import (
-    box_authorize_app_tool,
-    box_who_am_i,
+from tool_registry import ToolGroup
+
+GENERIC_TOOLS = ToolGroup(
+    "generic_tools",
+    "tools.box_tools_generic",
+    (
+        "box_who_am_i",
+        "box_authorize_app_tool",
+    ),
 )
 
 
 def register_generic_tools(mcp: FastMCP):
-    mcp.tool()(box_who_am_i)
-    mcp.tool()(box_authorize_app_tool)
+    GENERIC_TOOLS.register(mcp)
@@ -1,11 +1,16 @@
 from mcp.server.fastmcp import FastMCP
 
-from tools.box_tools_search import (
-    box_search_folder_by_name_tool,
-    box_search_tool,
+from tool_registry import ToolGroup
+
+SEARCH_TOOLS = ToolGroup(
+    "search_tools",
+    "tools.box_tools_search",
+    (
+        "box_search_tool",
+        "box_search_folder_by_name_tool",
+    ),
 )
 
 
 def register_search_tools(mcp: FastMCP):
-    mcp.tool()(box_search_tool)
-    mcp.tool()(box_search_folder_by_name_tool)
+    SEARCH_TOOLS.register(mcp)
@@ -1,15 +1,18 @@
 from mcp.server.fastmcp import FastMCP
 
-from tools.box_tools_web_link import (
-    box_web_link_create_tool,
-    box_web_link_delete_by_id_tool,
-    box_web_link_get_by_id_tool,
-    box_web_link_update_by_id_tool,
+from tool_registry import ToolGroup
+
+WEB_LINK_TOOLS = ToolGroup(
+    "web_link_tools",
+    "tools.box_tools_web_link",
+    (
+        "box_web_link_create_tool",
+        "box_web_link_get_by_id_tool",
+        "box_web_link_update_by_id_tool",
+        "box_web_link_delete_by_id_tool",
+    ),
 )
 
 
 def register_web_link_tools(mcp: FastMCP):
-    mcp.tool()(box_web_link_create_tool)
-    mcp.tool()(box_web_link_get_by_id_tool)
-    mcp.tool()(box_web_link_update_by_id_tool)
-    mcp.tool()(box_web_link_delete_by_id_tool)
+    WEB_LINK_TOOLS.register(mcp)
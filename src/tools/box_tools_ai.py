@@ -12,6 +12,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
 from tools.box_tools_generic import get_box_client
 
 
@@ -31,8 +32,12 @@ async def box_ai_ask_file_single_tool(
     """
 
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_single(
-        box_client, file_id, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_ask_file_single,
+        box_client,
+        file_id,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -52,8 +57,12 @@ async def box_ai_ask_file_multi_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for processing.
     """
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_multi(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_ask_file_multi,
+        box_client,
+        file_ids,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -77,8 +86,8 @@ async def box_ai_ask_hub_tool(
         hubs_id = str(hubs_id)
 
     box_client = get_box_client(ctx)
-    response = box_ai_ask_hub(
-        box_client, hubs_id, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_ask_hub, box_client, hubs_id, prompt=prompt, ai_agent_id=ai_agent_id
     )
     return response
 
@@ -101,8 +110,12 @@ async def box_ai_extract_freeform_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_freeform(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_extract_freeform,
+        box_client,
+        file_ids,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -177,8 +190,12 @@ async def box_ai_extract_structured_using_fields_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_fields(
-        box_client, file_ids, fields, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_extract_structured_using_fields,
+        box_client,
+        file_ids,
+        fields,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -203,8 +220,12 @@ async def box_ai_extract_structured_using_template_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_template(
-        box_client, file_ids, template_key, ai_agent_id=ai_agent_id
+    response = await run_box_call(
+        box_ai_extract_structured_using_template,
+        box_client,
+        file_ids,
+        template_key,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -228,7 +249,8 @@ async def box_ai_extract_structured_enhanced_using_fields_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_fields(
+    response = await run_box_call(
+        box_ai_extract_structured_enhanced_using_fields,
         box_client,
         file_ids,
         fields,
@@ -254,7 +276,10 @@ async def box_ai_extract_structured_enhanced_using_template_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_template(
-        box_client, file_ids, template_key
+    response = await run_box_call(
+        box_ai_extract_structured_enhanced_using_template,
+        box_client,
+        file_ids,
+        template_key,
     )
     return response
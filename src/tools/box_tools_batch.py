@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Dict, List
+
+from mcp.server.fastmcp import Context
+
+from tool_registry import get_tool
+from tools.box_tools_generic import get_server_config
+
+
+async def _run_batch_call(
+    ctx: Context, call: Any, semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Run one entry of a batch, returning its result or its error."""
+    if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+        return {"tool": None, "error": "Each call must be a dict with a 'tool' name"}
+    name = call["tool"]
+    arguments = call.get("arguments") or {}
+    if name == "box_batch_tool":
+        return {"tool": name, "error": "box_batch_tool cannot be nested"}
+    if not isinstance(arguments, dict):
+        return {"tool": name, "error": "'arguments' must be a dict"}
+    tool = get_tool(ctx.fastmcp, name)
+    if tool is None:
+        return {"tool": name, "error": f"Unknown tool: {name}"}
+
+    async with semaphore:
+        try:
+            result = await tool.run(arguments, context=ctx)
+        except Exception as e:
+            return {"tool": name, "error": str(e)}
+    return {"tool": name, "result": result}
+
+
+async def box_batch_tool(
+    ctx: Context,
+    calls: List[Dict[str, Any]],
+    max_parallelism: int | None = None,
+) -> dict:
+    """
+    Run many tool calls concurrently in a single request.
+    Use it instead of calling the same tool repeatedly, for example to get the
+    metadata of every file in a folder.
+
+    Args:
+        calls (List[Dict[str, Any]]): The calls to make, each a dict with the "tool"
+                                      name and its "arguments" dict,
+                                      e.g. {"tool": "box_who_am_i", "arguments": {}}.
+        max_parallelism (int, optional): How many calls run at the same time.
+                                         Defaults to the server setting.
+
+    return:
+        dict: "results", one entry per call in the order given, each with the "tool"
+              name and either its "result" or its "error".
+    """
+    config = get_server_config(ctx)
+    if len(calls) > config.batch_max_calls:
+        return {
+            "error": f"A batch can hold at most {config.batch_max_calls} calls, "
+            f"got {len(calls)}"
+        }
+    parallelism = min(
+        max_parallelism or config.batch_max_parallelism, config.batch_max_parallelism
+    )
+    semaphore = asyncio.Semaphore(max(parallelism, 1))
+    results = await asyncio.gather(
+        *(_run_batch_call(ctx, call, semaphore) for call in calls)
+    )
+    return {"results": list(results)}
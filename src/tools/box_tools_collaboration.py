@@ -14,6 +14,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
 from tools.box_tools_generic import get_box_client
 
 
@@ -26,7 +27,7 @@ async def box_collaboration_list_by_file_tool(ctx: Context, file_id: str) -> dic
         dict: A dictionary containing the list of collaborations or an error message.
     """
     client = get_box_client(ctx)
-    return box_collaborations_list_by_file(client, file_id)
+    return await run_box_call(box_collaborations_list_by_file, client, file_id)
 
 
 async def box_collaboration_list_by_folder_tool(ctx: Context, folder_id: str) -> dict:
@@ -38,7 +39,7 @@ async def box_collaboration_list_by_folder_tool(ctx: Context, folder_id: str) ->
         dict: A dictionary containing the list of collaborations or an error message.
     """
     client = get_box_client(ctx)
-    return box_collaborations_list_by_folder(client, folder_id)
+    return await run_box_call(box_collaborations_list_by_folder, client, folder_id)
 
 
 async def box_collaboration_delete_tool(ctx: Context, collaboration_id: str) -> dict:
@@ -50,7 +51,7 @@ async def box_collaboration_delete_tool(ctx: Context, collaboration_id: str) ->
         dict: A dictionary containing the result of the deletion or an error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_delete(client, collaboration_id)
+    return await run_box_call(box_collaboration_delete, client, collaboration_id)
 
 
 async def box_collaboration_file_group_by_group_id_tool(
@@ -75,8 +76,15 @@ async def box_collaboration_file_group_by_group_id_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_file_group_by_group_id(
-        client, file_id, group_id, role, is_access_only, expires_at, notify
+    return await run_box_call(
+        box_collaboration_file_group_by_group_id,
+        client,
+        file_id,
+        group_id,
+        role,
+        is_access_only,
+        expires_at,
+        notify,
     )
 
 
@@ -102,8 +110,15 @@ async def box_collaboration_file_user_by_user_id_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_file_user_by_user_id(
-        client, file_id, user_id, role, is_access_only, expires_at, notify
+    return await run_box_call(
+        box_collaboration_file_user_by_user_id,
+        client,
+        file_id,
+        user_id,
+        role,
+        is_access_only,
+        expires_at,
+        notify,
     )
 
 
@@ -129,8 +144,15 @@ async def box_collaboration_file_user_by_user_login_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_file_user_by_user_login(
-        client, file_id, user_login, role, is_access_only, expires_at, notify
+    return await run_box_call(
+        box_collaboration_file_user_by_user_login,
+        client,
+        file_id,
+        user_login,
+        role,
+        is_access_only,
+        expires_at,
+        notify,
     )
 
 
@@ -157,7 +179,8 @@ async def box_collaboration_folder_group_by_group_id_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_folder_group_by_group_id(
+    return await run_box_call(
+        box_collaboration_folder_group_by_group_id,
         client,
         folder_id,
         group_id,
@@ -192,7 +215,8 @@ async def box_collaboration_folder_user_by_user_id_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_folder_user_by_user_id(
+    return await run_box_call(
+        box_collaboration_folder_user_by_user_id,
         client,
         folder_id,
         user_id,
@@ -227,7 +251,8 @@ async def box_collaboration_folder_user_by_user_login_tool(
         Dict[str, Any]: Dictionary containing collaboration details or error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_folder_user_by_user_login(
+    return await run_box_call(
+        box_collaboration_folder_user_by_user_login,
         client,
         folder_id,
         user_login,
@@ -259,4 +284,4 @@ async def box_collaboration_update_tool(
         dict: A dictionary containing the updated collaboration details or an error message.
     """
     client = get_box_client(ctx)
-    return box_collaboration_update(client, collaboration_id, role)
+    return await run_box_call(box_collaboration_update, client, collaboration_id, role)
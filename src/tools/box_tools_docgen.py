@@ -16,6 +16,9 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
+from tool_cache import cached_tool
+from tool_coalescing import coalesced_tool
 from tools.box_tools_generic import get_box_client
 
 # region DocGen Templates
@@ -33,7 +36,7 @@ async def box_docgen_template_create_tool(ctx: Context, file_id: str) -> dict[st
         dict[str, Any]: Metadata of the created template.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_create(box_client, file_id)
+    return await run_box_call(box_docgen_template_create, box_client, file_id)
 
 
 async def box_docgen_template_list_tool(
@@ -53,9 +56,13 @@ async def box_docgen_template_list_tool(
         dict[str, Any] | list[dict[str, Any]]: A list of template metadata or an error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_list(box_client, marker=marker, limit=limit)
+    return await run_box_call(
+        box_docgen_template_list, box_client, marker=marker, limit=limit
+    )
 
 
+@coalesced_tool
+@cached_tool(ttl=300)
 async def box_docgen_template_get_by_id_tool(
     ctx: Context, template_id: str
 ) -> dict[str, Any]:
@@ -70,7 +77,7 @@ async def box_docgen_template_get_by_id_tool(
         dict[str, Any]: Metadata of the template or an error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_get_by_id(box_client, template_id)
+    return await run_box_call(box_docgen_template_get_by_id, box_client, template_id)
 
 
 async def box_docgen_template_get_by_name_tool(
@@ -87,7 +94,9 @@ async def box_docgen_template_get_by_name_tool(
         dict[str, Any]: Metadata of the template or an error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_get_by_name(box_client, template_name)
+    return await run_box_call(
+        box_docgen_template_get_by_name, box_client, template_name
+    )
 
 
 async def box_docgen_template_delete_tool(
@@ -103,7 +112,7 @@ async def box_docgen_template_delete_tool(
         dict[str, Any]: Success message or an error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_delete(box_client, template_id)
+    return await run_box_call(box_docgen_template_delete, box_client, template_id)
 
 
 async def box_docgen_template_list_tags_tool(
@@ -127,7 +136,8 @@ async def box_docgen_template_list_tags_tool(
         list[dict[str, Any]]: A list of tags for the template or an error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_list_tags(
+    return await run_box_call(
+        box_docgen_template_list_tags,
         box_client,
         template_id,
         template_version_id=template_version_id,
@@ -155,8 +165,12 @@ async def box_docgen_template_list_jobs_tool(
         DocGenJobsV2025R0: A page of Doc Gen jobs for the template.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_template_list_jobs(
-        box_client, template_id=template_id, marker=marker, limit=limit
+    return await run_box_call(
+        box_docgen_template_list_jobs,
+        box_client,
+        template_id=template_id,
+        marker=marker,
+        limit=limit,
     )
 
 
@@ -210,7 +224,8 @@ async def box_docgen_create_batch_tool(
         If an error occurs, contains an "error" key with the error message.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_create_batch(
+    return await run_box_call(
+        box_docgen_create_batch,
         box_client,
         docgen_template_id=docgen_template_id,
         destination_folder_id=destination_folder_id,
@@ -262,7 +277,8 @@ async def box_docgen_create_single_file_from_user_input_tool(
         dict[str, Any]: Information about the created batch job.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_create_single_file_from_user_input(
+    return await run_box_call(
+        box_docgen_create_single_file_from_user_input,
         box_client,
         docgen_template_id=docgen_template_id,
         destination_folder_id=destination_folder_id,
@@ -291,8 +307,12 @@ async def box_docgen_list_jobs_by_batch_tool(
         list[dict[str, Any]]: A list of Doc Gen jobs in the batch.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_list_jobs_by_batch(
-        box_client, batch_id=batch_id, marker=marker, limit=limit
+    return await run_box_call(
+        box_docgen_list_jobs_by_batch,
+        box_client,
+        batch_id=batch_id,
+        marker=marker,
+        limit=limit,
     )
 
 
@@ -308,7 +328,7 @@ async def box_docgen_get_job_by_id_tool(ctx: Context, job_id: str) -> dict[str,
         dict[str, Any]: Details of the specified Doc Gen job.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_get_job_by_id(box_client, job_id)
+    return await run_box_call(box_docgen_get_job_by_id, box_client, job_id)
 
 
 async def box_docgen_list_jobs_tool(
@@ -328,7 +348,9 @@ async def box_docgen_list_jobs_tool(
         list[dict[str, Any]]: A list of Doc Gen jobs.
     """
     box_client = get_box_client(ctx)
-    return box_docgen_list_jobs(box_client, marker=marker, limit=limit)
+    return await run_box_call(
+        box_docgen_list_jobs, box_client, marker=marker, limit=limit
+    )
 
 
 # endregion DocGen Batches and Jobs
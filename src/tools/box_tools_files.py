@@ -2,34 +2,119 @@ import base64
 import os
 from typing import Any
 
-from box_ai_agents_toolkit import (
-    DocumentFiles,
-    ImageFiles,
-    box_file_download,
-    box_file_text_extract,
-    box_upload_file,
-)
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_download import DOCUMENT, IMAGE, stream_file_download
+from box_executor import run_box_call
+from box_renditions import download_rendition, get_rendition_cache
+from box_resilience import retry_box_call
+from box_upload import upload_file_content, upload_file_from_path
+from continuation import decode_continuation_token, encode_continuation_token
+from text_cache import get_text_cache, read_text_window
+from tool_coalescing import coalesced_tool
+from tools.box_tools_generic import get_box_client, get_server_config
 
 
-async def box_read_tool(ctx: Context, file_id: str) -> dict[str, Any]:
+@coalesced_tool
+async def box_read_tool(
+    ctx: Context,
+    file_id: str,
+    offset: int | None = None,
+    max_chars: int | None = None,
+    continuation_token: str | None = None,
+) -> dict[str, Any]:
     """
-    Read the text content of a file in Box.
+    Read the text content of a file in Box, one window at a time.
+    The text is cached on the server until the file changes, so reading the next
+    windows does not extract it again.
 
     Args:
         file_id (str): The ID of the file to read.
+        offset (int, optional): First character to return. Defaults to 0.
+        max_chars (int, optional): Most characters to return. Defaults to the server
+                                   limit (100000 unless configured otherwise).
+        continuation_token (str, optional): The continuation_token returned by the
+                                            previous call, to read the next window.
     return:
-        str: The text content of the file.
+        dict: The text "content" of the window, its "offset", the "total_chars" of the
+              file text, and a "continuation_token" to read the next window, or None
+              once the end of the text is reached.
     """
     # check if file id isn't a string and convert to a string
     if not isinstance(file_id, str):
         file_id = str(file_id)
 
     box_client = get_box_client(ctx)
-    response = box_file_text_extract(box_client, file_id)
-    return response
+    config = get_server_config(ctx)
+    sha1 = None
+    if continuation_token:
+        try:
+            state = decode_continuation_token(continuation_token)
+        except ValueError as e:
+            return {"error": str(e)}
+        file_id = state.get("file_id", file_id)
+        offset = state.get("offset", offset)
+        max_chars = state.get("max_chars", max_chars)
+        sha1 = state.get("sha1")
+
+    try:
+        window = await retry_box_call(
+            read_text_window,
+            box_client,
+            file_id,
+            offset or 0,
+            max_chars or config.read_max_chars,
+            get_text_cache(),
+            sha1=sha1,
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    if "total_chars" not in window:
+        # The text could not be extracted
+        return window
+
+    next_offset = window.pop("next_offset")
+    window_sha1 = window.pop("sha1")
+    window["continuation_token"] = None
+    if next_offset is not None:
+        state = {"file_id": file_id, "offset": next_offset}
+        if max_chars:
+            state["max_chars"] = max_chars
+        if window_sha1:
+            state["sha1"] = window_sha1
+        window["continuation_token"] = encode_continuation_token(state)
+    return window
+
+
+async def box_text_cache_tool(
+    ctx: Context, action: str = "inspect", file_id: str | None = None
+) -> dict[str, Any]:
+    """
+    Inspect or purge the server cache of text read from Box files.
+
+    Args:
+        action (str, optional): "inspect" to list the cached files, "purge" to remove
+                                them. Defaults to "inspect".
+        file_id (str, optional): With "purge", only remove the text of this file.
+
+    return:
+        dict: For "inspect", the cache "stats" and its "entries" (file id, SHA-1, size
+              and last use), most recently used first.
+              For "purge", the number of "purged" entries.
+    """
+    cache = get_text_cache()
+    if cache is None:
+        return {"error": "The text cache is disabled"}
+    if file_id is not None and not isinstance(file_id, str):
+        file_id = str(file_id)
+
+    if action == "inspect":
+        stats = await run_box_call(cache.stats)
+        entries = await run_box_call(cache.list_entries)
+        return {"stats": stats, "entries": entries}
+    if action == "purge":
+        return {"purged": await run_box_call(cache.purge, file_id)}
+    return {"error": f"Unknown action: {action}, use 'inspect' or 'purge'"}
 
 
 async def box_upload_file_from_path_tool(
@@ -59,29 +144,19 @@ async def box_upload_file_from_path_tool(
 
         # Determine the file name to use
         actual_file_name = new_file_name.strip() or os.path.basename(file_path_expanded)
-        # Determine file extension to detect binary types
-        _, ext = os.path.splitext(actual_file_name)
-        binary_exts = {
-            ".docx",
-            ".pptx",
-            ".xlsx",
-            ".pdf",
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-        }
-        # Read file content as bytes for binary types, else as text
-        if ext.lower() in binary_exts:
-            # Binary file: read raw bytes
-            with open(file_path_expanded, "rb") as f:
-                content = f.read()
-        else:
-            # Text file: read as UTF-8
-            with open(file_path_expanded, "r", encoding="utf-8") as f:
-                content = f.read()
-        # Upload using toolkit (supports str or bytes)
-        result = box_upload_file(box_client, content, actual_file_name, folder_id)
+        # Stream the file as is; large files use a chunked upload session.
+        # Both kinds of uploads can be repeated safely after a failure.
+        config = get_server_config(ctx)
+        result = await retry_box_call(
+            upload_file_from_path,
+            box_client,
+            file_path_expanded,
+            actual_file_name,
+            folder_id,
+            chunked_threshold=config.upload_chunked_threshold,
+            part_workers=config.upload_part_workers,
+            state_path=config.upload_session_state_path,
+        )
         return f"File uploaded successfully. File ID: {result['id']}, Name: {result['name']}"
     except Exception as e:
         return f"Error uploading file: {str(e)}"
@@ -109,28 +184,48 @@ async def box_upload_file_from_content_tool(
         # Handle base64 encoded content
         if is_base64 and isinstance(content, str):
             content = base64.b64decode(content)
+        elif isinstance(content, str):
+            content = content.encode("utf-8")
 
-        # Upload using toolkit
-        result = box_upload_file(box_client, content, file_name, folder_id)
+        # Safe to retry: an upload that already reached Box is detected
+        result = await retry_box_call(
+            upload_file_content, box_client, content, file_name, folder_id
+        )
+        if result.get("existing"):
+            return f"File already exists with the same content. File ID: {result['id']}, Name: {result['name']}"
         return f"File uploaded successfully. File ID: {result['id']}, Name: {result['name']}"
     except Exception as e:
         return f"Error uploading file: {str(e)}"
 
 
 async def box_download_file_tool(
-    ctx: Context, file_id: str, save_file: bool = False, save_path: str | None = None
+    ctx: Context,
+    file_id: str,
+    save_file: bool = False,
+    save_path: str | None = None,
+    range_start: int | None = None,
+    range_end: int | None = None,
+    max_image_dimension: int | None = None,
 ) -> str:
     """
     Download a file from Box and return its content as a string.
     Supports text files (returns content directly) and images (returns base64-encoded).
     Other file types will return an error message.
     Optionally saves the file locally.
+    The file is streamed in chunks, and content is only returned when it fits the
+    server's download size limit; larger files can be saved or read by byte range.
 
     Args:
         file_id (str): The ID of the file to download.
         save_file (bool, optional): Whether to save the file locally. Defaults to False.
         save_path (str, optional): Path where to save the file. If not provided but save_file is True,
                                   uses a temporary directory. Defaults to None.
+        range_start (int, optional): First byte to download (0-based). Defaults to None.
+        range_end (int, optional): Last byte to download, inclusive. Without range_start,
+                                  downloads the last range_end bytes. Defaults to None.
+        max_image_dimension (int, optional): For images that are not saved, return a JPEG
+                                  rendition generated by Box that fits within this many
+                                  pixels (up to 2048) instead of the original. Defaults to None.
 
     return:
         str: For text files: content as string.
@@ -139,45 +234,76 @@ async def box_download_file_tool(
              If save_file is True, includes the path where the file was saved.
     """
     box_client = get_box_client(ctx)
+    config = get_server_config(ctx)
 
     # Convert file_id to string if it's not already
     if not isinstance(file_id, str):
         file_id = str(file_id)
 
     try:
-        # Use the box_api function for downloading
-        saved_path, file_content, mime_type = box_file_download(
-            client=box_client, file_id=file_id, save_file=save_file, save_path=save_path
-        )
+        whole_file = range_start is None and range_end is None
+        if max_image_dimension and not save_file and whole_file:
+            rendition = await retry_box_call(
+                download_rendition,
+                box_client,
+                file_id,
+                max_image_dimension,
+                config.download_max_content_bytes,
+                get_rendition_cache(),
+            )
+            # Not an image, or no rendition available: use the original
+            if rendition is not None:
+                base64_data = base64.b64encode(rendition.content).decode("utf-8")
+                return (
+                    f"Image downloaded successfully: {rendition.file_name}\n"
+                    f"MIME type: {rendition.mime_type}\n"
+                    f"Rendition: {rendition.dimensions} JPEG\n"
+                    f"Base64 encoded data:\n{base64_data}"
+                )
 
-        # Get file info to include name in response
-        file_info = box_client.files.get_file_by_id(file_id)
-        file_name = file_info.name
-        file_extension = file_name.split(".")[-1].lower() if "." in file_name else ""
+        download = await retry_box_call(
+            stream_file_download,
+            box_client,
+            file_id,
+            save_file=save_file,
+            save_path=save_path,
+            range_start=range_start,
+            range_end=range_end,
+            max_content_bytes=config.download_max_content_bytes,
+            chunk_size=config.download_chunk_size,
+            spool_max_size=config.download_spool_max_size,
+            displayable_only=True,
+        )
+        saved_path = download.saved_path
+        file_content = download.content
+        mime_type = download.mime_type
+        file_name = download.file_name
 
         # Prepare response based on content type
         response = ""
         if saved_path:
             response += f"File saved to: {saved_path}\n\n"
-
-        # Check if file is a document (text-based file)
-        is_document = (
-            mime_type
-            and mime_type.startswith("text/")
-            or file_extension in [e.value for e in DocumentFiles]
-        )
-
-        # Check if file is an image
-        is_image = (
-            mime_type
-            and mime_type.startswith("image/")
-            or file_extension in [e.value for e in ImageFiles]
-        )
-
-        if is_document:
+        if download.content_range:
+            response += f"Content-Range: {download.content_range}\n\n"
+
+        is_document = download.kind == DOCUMENT
+        is_image = download.kind == IMAGE
+
+        if (is_document or is_image) and download.too_large:
+            response += (
+                f"File {file_name} ({download.file_size} bytes) is larger than the "
+                f"{config.download_max_content_bytes} bytes limit for content display. "
+                "Save it locally or download a byte range instead."
+            )
+            if is_image:
+                response += " Use max_image_dimension to get a downscaled rendition."
+
+        elif is_document:
             # Text file - return content directly
             try:
-                content_text = file_content.decode("utf-8")
+                # A byte range may split a multi-byte character at its edges
+                errors = "replace" if download.content_range else "strict"
+                content_text = file_content.decode("utf-8", errors=errors)
                 response += (
                     f"File downloaded successfully: {file_name}\n\n{content_text}"
                 )
@@ -1,32 +1,56 @@
-from typing import List, Union
+from typing import List
 
 from box_ai_agents_toolkit import (
-    File,
-    Folder,
     box_create_folder,
     box_delete_folder,
-    box_folder_list_content,
     box_update_folder,
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_executor import run_box_call
+from box_folders import box_folder_list_page, walk_folder_tree
+from tools.box_tools_generic import get_box_client, get_server_config
+
+# Items between progress notifications of recursive listings
+TRAVERSAL_PROGRESS_INTERVAL = 100
 
 
 async def box_list_folder_content_by_folder_id(
     ctx: Context,
     folder_id: str,
     is_recursive: bool = False,
+    limit: int | None = None,
+    marker: str | None = None,
+    offset: int | None = None,
+    sort: str | None = None,
+    direction: str | None = None,
+    fields: List[str] | None = None,
+    max_depth: int | None = None,
+    max_items: int | None = None,
 ) -> dict:
     """
-    List the content of a folder in Box by its ID.
+    List the content of a folder in Box by its ID, one page at a time.
 
     Args:
         folder_id (str): The ID of the folder to list the content of.
         is_recursive (bool): Whether to list the content recursively.
+        limit (int, optional): Maximum number of items per page (1-1000). Defaults to 100.
+        marker (str, optional): The continuation_token returned by the previous page.
+        offset (int, optional): Start at this item instead of using markers.
+        sort (str, optional): Sort by "id", "name", "date" or "size" (uses offset paging).
+        direction (str, optional): Sort direction, "ASC" or "DESC".
+        fields (List[str], optional): Box fields to return for each item. "id" and "type"
+                                      are always returned, other fields are dropped.
+        max_depth (int, optional): With is_recursive, how many levels of subfolders to open
+                                   (0 lists only this folder). Defaults to no limit.
+        max_items (int, optional): With is_recursive, stop after this many items.
 
     return:
-        dict: The content of the folder in a json string format, including the "id", "name", "type", and "description".
+        dict: The page "entries" (by default with "id", "name", "type" and "description"),
+              the folder "total_count" when known, and a "continuation_token" to pass as
+              marker to get the next page, or None on the last page.
+              With is_recursive, the list of items in the folder tree, breadth first,
+              each with its "parent_id" and "depth".
     """
     box_client = get_box_client(ctx)
 
@@ -34,22 +58,36 @@ async def box_list_folder_content_by_folder_id(
     if not isinstance(folder_id, str):
         folder_id = str(folder_id)
 
-    response: List[Union[File, Folder]] = box_folder_list_content(
-        box_client, folder_id, is_recursive
-    )
-
-    # Convert the response to a json string
-    response = [
-        {
-            "id": item.id,
-            "name": item.name,
-            "type": item.type,
-            "description": item.description if hasattr(item, "description") else None,
-        }
-        for item in response
-    ]
-    return response
-    # return json.dumps(response)
+    if not is_recursive:
+        try:
+            return await run_box_call(
+                box_folder_list_page,
+                box_client,
+                folder_id,
+                limit=limit,
+                marker=marker,
+                offset=offset,
+                sort=sort,
+                direction=direction,
+                fields=fields,
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+
+    config = get_server_config(ctx)
+    items = []
+    async for item in walk_folder_tree(
+        box_client,
+        folder_id,
+        max_depth=max_depth,
+        max_items=max_items,
+        max_concurrency=config.folder_traversal_concurrency,
+        fields=fields,
+    ):
+        items.append(item)
+        if len(items) % TRAVERSAL_PROGRESS_INTERVAL == 0:
+            await ctx.report_progress(len(items), max_items)
+    return items
 
 
 async def box_manage_folder_tool(
@@ -100,8 +138,8 @@ async def box_manage_folder_tool(
             # Default to root folder ("0") if no parent_id provided
             parent_id_str = parent_id or "0"
 
-            new_folder = box_create_folder(
-                client=box_client, name=name, parent_id=parent_id_str
+            new_folder = await run_box_call(
+                box_create_folder, client=box_client, name=name, parent_id=parent_id_str
             )
             return f"Folder created successfully. Folder ID: {new_folder.id}, Name: {new_folder.name}"
         except Exception as e:
@@ -113,8 +151,11 @@ async def box_manage_folder_tool(
             return "Error: folder_id is required for delete action"
 
         try:
-            box_delete_folder(
-                client=box_client, folder_id=folder_id, recursive=recursive
+            await run_box_call(
+                box_delete_folder,
+                client=box_client,
+                folder_id=folder_id,
+                recursive=recursive,
             )
             return f"Folder with ID {folder_id} deleted successfully"
         except Exception as e:
@@ -126,7 +167,8 @@ async def box_manage_folder_tool(
             return "Error: folder_id is required for update action"
 
         try:
-            updated_folder = box_update_folder(
+            updated_folder = await run_box_call(
+                box_update_folder,
                 client=box_client,
                 folder_id=folder_id,
                 name=name,
@@ -3,7 +3,11 @@ from typing import cast
 from box_ai_agents_toolkit import BoxClient, authorize_app
 from mcp.server.fastmcp import Context
 
-from server_context import BoxContext
+from box_executor import run_box_call
+from config import ServerConfig
+from server_context import BoxContext, reset_token_managers
+from tool_cache import cached_tool, clear_tool_cache
+from tool_coalescing import coalesced_tool
 
 
 def get_box_client(ctx: Context) -> BoxClient:
@@ -14,6 +18,13 @@ def get_box_client(ctx: Context) -> BoxClient:
     return client
 
 
+def get_server_config(ctx: Context) -> ServerConfig:
+    """Helper function to get the server configuration from context"""
+    return cast(BoxContext, ctx.request_context.lifespan_context).config
+
+
+@coalesced_tool
+@cached_tool(ttl=300)
 async def box_who_am_i(ctx: Context) -> dict:
     """
     Get the current user's information.
@@ -23,7 +34,8 @@ async def box_who_am_i(ctx: Context) -> dict:
         dict: The current user's information.
     """
     box_client = get_box_client(ctx)
-    return box_client.users.get_user_me().to_dict()
+    current_user = await run_box_call(box_client.users.get_user_me)
+    return current_user.to_dict()
     # return f"Authenticated as: {current_user.name}"
 
 
@@ -35,8 +47,11 @@ async def box_authorize_app_tool() -> str:
     return:
         str: Message
     """
-    result = authorize_app()
+    result = await run_box_call(authorize_app)
+    # The authorized user may differ from the previous one
+    clear_tool_cache()
     if result:
+        reset_token_managers()
         return "Box application authorized successfully"
     else:
         return "Box application not authorized"
@@ -5,6 +5,9 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
+from tool_cache import cached_tool
+from tool_coalescing import coalesced_tool
 from tools.box_tools_generic import get_box_client
 
 
@@ -16,9 +19,11 @@ async def box_groups_search_tool(ctx: Context, query: str) -> dict:
     Returns:
         dict: A dictionary containing the list of matching groups."""
     client = get_box_client(ctx)
-    return box_groups_search(client, query)
+    return await run_box_call(box_groups_search, client, query)
 
 
+@coalesced_tool
+@cached_tool(ttl=120)
 async def box_groups_list_members_tool(ctx: Context, group_id: str) -> dict:
     """List all members of a specific group.
     Args:
@@ -27,7 +32,7 @@ async def box_groups_list_members_tool(ctx: Context, group_id: str) -> dict:
     Returns:
         dict: A dictionary containing the list of group members."""
     client = get_box_client(ctx)
-    return box_groups_list_members(client, group_id)
+    return await run_box_call(box_groups_list_members, client, group_id)
 
 
 async def box_groups_list_by_user_tool(ctx: Context, user_id: str) -> dict:
@@ -38,4 +43,4 @@ async def box_groups_list_by_user_tool(ctx: Context, user_id: str) -> dict:
     Returns:
         dict: A dictionary containing the list of groups the user belongs to."""
     client = get_box_client(ctx)
-    return box_groups_list_by_user(client, user_id)
+    return await run_box_call(box_groups_list_by_user, client, user_id)
@@ -11,6 +11,9 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
+from tool_cache import cached_tool
+from tool_coalescing import coalesced_tool
 from tools.box_tools_generic import get_box_client
 
 
@@ -71,11 +74,17 @@ async def box_metadata_template_create_tool(
         dict: The created metadata template.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_create(
-        box_client, display_name, fields, template_key=template_key
+    return await run_box_call(
+        box_metadata_template_create,
+        box_client,
+        display_name,
+        fields,
+        template_key=template_key,
     )
 
 
+@coalesced_tool
+@cached_tool(ttl=600)
 async def box_metadata_template_get_by_key_tool(
     ctx: Context, template_name: str
 ) -> dict:
@@ -90,9 +99,12 @@ async def box_metadata_template_get_by_key_tool(
         dict: The metadata template associated with the provided key.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_get_by_key(box_client, template_name)
+    return await run_box_call(
+        box_metadata_template_get_by_key, box_client, template_name
+    )
 
 
+@coalesced_tool
 async def box_metadata_template_get_by_name_tool(
     ctx: Context, template_name: str
 ) -> dict:
@@ -107,7 +119,9 @@ async def box_metadata_template_get_by_name_tool(
         dict: The metadata template associated with the provided name.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_get_by_name(box_client, template_name)
+    return await run_box_call(
+        box_metadata_template_get_by_name, box_client, template_name
+    )
 
 
 async def box_metadata_set_instance_on_file_tool(
@@ -131,11 +145,12 @@ async def box_metadata_set_instance_on_file_tool(
         dict: The response from the Box API after setting the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_set_instance_on_file(
-        box_client, template_key, file_id, metadata
+    return await run_box_call(
+        box_metadata_set_instance_on_file, box_client, template_key, file_id, metadata
     )
 
 
+@coalesced_tool
 async def box_metadata_get_instance_on_file_tool(
     ctx: Context,
     file_id: str,
@@ -153,7 +168,9 @@ async def box_metadata_get_instance_on_file_tool(
         dict: The metadata instance associated with the file.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_get_instance_on_file(box_client, file_id, template_key)
+    return await run_box_call(
+        box_metadata_get_instance_on_file, box_client, file_id, template_key
+    )
 
 
 async def box_metadata_update_instance_on_file_tool(
@@ -177,7 +194,8 @@ async def box_metadata_update_instance_on_file_tool(
         dict: The response from the Box API after updating the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_update_instance_on_file(
+    return await run_box_call(
+        box_metadata_update_instance_on_file,
         box_client,
         file_id,
         template_key,
@@ -203,4 +221,6 @@ async def box_metadata_delete_instance_on_file_tool(
         dict: The response from the Box API after deleting the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_delete_instance_on_file(box_client, file_id, template_key)
+    return await run_box_call(
+        box_metadata_delete_instance_on_file, box_client, file_id, template_key
+    )
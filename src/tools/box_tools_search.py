@@ -1,21 +1,28 @@
 from typing import List
 
-from box_ai_agents_toolkit import (
-    SearchForContentContentTypes,
-    box_locate_folder_by_name,
-    box_search,
-)
+from box_ai_agents_toolkit import SearchForContentContentTypes
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
+from box_fields import (
+    FOLDER_SEARCH_FIELDS,
+    SEARCH_FIELDS,
+    project_fields,
+    resolve_fields,
+)
+from box_search import box_locate_folder_by_name, box_search
+from tool_coalescing import coalesced_tool
 from tools.box_tools_generic import get_box_client
 
 
+@coalesced_tool
 async def box_search_tool(
     ctx: Context,
     query: str,
     file_extensions: List[str] | None = None,
     where_to_look_for_query: List[str] | None = None,
     ancestor_folder_ids: List[str] | None = None,
+    fields: List[str] | None = None,
 ) -> List[dict]:
     """
     Search for files in Box with the given query.
@@ -30,10 +37,15 @@ async def box_search_tool(
             COMMENTS,
             TAG,
         ancestor_folder_ids (List[str]): The ancestor folder IDs to search in.
+        fields (List[str], optional): Box fields to return for each file, for example
+                                      ["name", "modified_at", "parent"]. "id" and "type"
+                                      are always returned. Defaults to id, type, name,
+                                      size and description.
     return:
         List[dict]: The search results.
     """
     box_client = get_box_client(ctx)
+    fields = resolve_fields(fields, SEARCH_FIELDS)
 
     # Convert the where to look for query to content types
     content_types: List[SearchForContentContentTypes] = []
@@ -42,22 +54,37 @@ async def box_search_tool(
             content_types.append(SearchForContentContentTypes[content_type])
 
     # Search for files with the query
-    search_results = box_search(
-        box_client, query, file_extensions, content_types, ancestor_folder_ids
+    search_results = await run_box_call(
+        box_search,
+        box_client,
+        query,
+        file_extensions,
+        content_types,
+        ancestor_folder_ids,
+        fields=fields,
     )
 
-    return [search_result.to_dict() for search_result in search_results]
+    return [project_fields(search_result, fields) for search_result in search_results]
 
 
-async def box_search_folder_by_name_tool(ctx: Context, folder_name: str) -> List[dict]:
+@coalesced_tool
+async def box_search_folder_by_name_tool(
+    ctx: Context, folder_name: str, fields: List[str] | None = None
+) -> List[dict]:
     """
     Locate a folder in Box by its name.
 
     Args:
         folder_name (str): The name of the folder to locate.
+        fields (List[str], optional): Box fields to return for each folder. "id" and
+                                      "type" are always returned. Defaults to id, type
+                                      and name.
     return:
-        List[dict]: The folder ID.
+        List[dict]: The matching folders.
     """
     box_client = get_box_client(ctx)
-    search_results = box_locate_folder_by_name(box_client, folder_name)
-    return [search_result.to_dict() for search_result in search_results]
+    fields = resolve_fields(fields, FOLDER_SEARCH_FIELDS)
+    search_results = await run_box_call(
+        box_locate_folder_by_name, box_client, folder_name, fields=fields
+    )
+    return [project_fields(search_result, fields) for search_result in search_results]
@@ -6,9 +6,14 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from box_executor import run_box_call
+from tool_cache import cached_tool
+from tool_coalescing import coalesced_tool
 from tools.box_tools_generic import get_box_client
 
 
+@coalesced_tool
+@cached_tool(ttl=120)
 async def box_users_list_tool(ctx: Context) -> dict:
     """List all users in the Box account.
     Args:
@@ -16,7 +21,7 @@ async def box_users_list_tool(ctx: Context) -> dict:
     Returns:
         dict: A dictionary containing the list of users."""
     client = get_box_client(ctx)
-    return box_users_list(client)
+    return await run_box_call(box_users_list, client)
 
 
 async def box_users_locate_by_name_tool(ctx: Context, name: str) -> dict:
@@ -27,7 +32,7 @@ async def box_users_locate_by_name_tool(ctx: Context, name: str) -> dict:
     Returns:
         dict: A dictionary containing the user information if found, otherwise a message with no user found."""
     client = get_box_client(ctx)
-    return box_users_locate_by_name(client, name)
+    return await run_box_call(box_users_locate_by_name, client, name)
 
 
 async def box_users_locate_by_email_tool(ctx: Context, email: str) -> dict:
@@ -38,7 +43,7 @@ async def box_users_locate_by_email_tool(ctx: Context, email: str) -> dict:
     Returns:
         dict: A dictionary containing the user information if found, otherwise a message with no user found."""
     client = get_box_client(ctx)
-    return box_users_locate_by_email(client, email)
+    return await run_box_call(box_users_locate_by_email, client, email)
 
 
 async def box_users_search_by_name_or_email_tool(ctx: Context, query: str) -> dict:
@@ -49,4 +54,4 @@ async def box_users_search_by_name_or_email_tool(ctx: Context, query: str) -> di
     Returns:
         dict: A dictionary containing the list of matching users."""
     client = get_box_client(ctx)
-    return box_users_search_by_name_or_email(client, query)
+    return await run_box_call(box_users_search_by_name_or_email, client, query)
@@ -0,0 +1,334 @@
+"""Trace spans for MCP requests, tool calls and Box API requests.
+
+Spans follow the W3C trace context: an incoming ``traceparent`` header (or a
+``traceparent`` entry in the MCP request ``_meta``) becomes the parent of the
+server spans, and every outbound Box request carries the ``traceparent`` of
+its span. Finished spans are appended to a file as OTLP/JSON lines, the format
+read by the OpenTelemetry collector ``otlpjsonfile`` receiver.
+
+Tracing is disabled, and costs a single check per span, until
+``configure_tracing`` is given an export path.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Iterator
+
+from mcp.server.fastmcp import FastMCP
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "box-mcp-server"
+TRACEPARENT_HEADER = "traceparent"
+# Key of the server span in the ASGI scope, read back by the tool spans
+SCOPE_SPAN_KEY = "box_mcp.span"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanKind(IntEnum):
+    """OTLP span kinds."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+@dataclass
+class Span:
+    """A timed operation, exported once ended."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None = None
+    kind: SpanKind = SpanKind.INTERNAL
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+@dataclass(frozen=True)
+class RemoteParent:
+    """Span context received from another service."""
+
+    trace_id: str
+    span_id: str
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def parse_traceparent(value: str | None) -> RemoteParent | None:
+    """Parse a W3C ``traceparent`` value, ignoring malformed ones."""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, _ = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return RemoteParent(trace_id, span_id)
+
+
+class FileSpanExporter:
+    """Append finished spans to a file, one OTLP/JSON document per line."""
+
+    def __init__(self, path: str, service_name: str = SERVICE_NAME):
+        self.path = path
+        self.resource = {
+            "attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]
+        }
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [
+                        {"scope": {"name": SERVICE_NAME}, "spans": [span.to_otlp()]}
+                    ],
+                }
+            ]
+        }
+        line = json.dumps(document, separators=(",", ":")) + "\n"
+        with self._lock:
+            # One write per span keeps lines whole across worker processes
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_exporter: FileSpanExporter | None = None
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "box_mcp_current_span", default=None
+)
+
+
+def configure_tracing(export_path: str | None) -> None:
+    """Export spans to ``export_path``, or disable tracing when it is None."""
+    global _exporter
+    previous, _exporter = _exporter, None
+    if previous is not None:
+        previous.close()
+    if export_path:
+        _exporter = FileSpanExporter(export_path)
+        logger.info(f"Exporting trace spans to {export_path}")
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    parent: Span | RemoteParent | None = None,
+    attributes: dict[str, Any] | None = None,
+) -> Iterator[Span | None]:
+    """Run the block in a new span, the child of ``parent`` or the current span.
+
+    Yields None when tracing is disabled. Exceptions mark the span as failed.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    parent = parent or _current_span.get()
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_span_id=parent.span_id if parent else None,
+        kind=kind,
+        attributes=dict(attributes or {}),
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_attribute("exception.type", type(e).__name__)
+        span.set_error(str(e) or type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_time_ns = time.time_ns()
+        try:
+            exporter.export(span)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not export span {span.name}: {e}")
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a server span for every HTTP request.
+
+    The span continues the caller's trace when the request has a valid
+    ``traceparent`` header, and is stored in the ASGI scope because the MCP
+    session runs tools outside of the request's context.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        attributes = {"http.request.method": scope["method"], "url.path": scope["path"]}
+        with start_span(
+            f"{scope['method']} {scope['path']}", SpanKind.SERVER, parent, attributes
+        ) as span:
+            scope[SCOPE_SPAN_KEY] = span
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error(f"HTTP {message['status']}")
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+
+def add_tracing_middleware(mcp: FastMCP, transport: str) -> None:
+    """Open a server span for every request of the HTTP app of ``transport``.
+
+    Installed after the auth middleware, so that the time spent
+    authenticating is part of the request span.
+    """
+    app_factory_name = "sse_app" if transport == "sse" else "streamable_http_app"
+    original_app_factory = getattr(mcp, app_factory_name)
+
+    def wrapped_app_factory(*args, **kwargs):
+        app = original_app_factory(*args, **kwargs)
+        app.add_middleware(TracingMiddleware)
+        return app
+
+    setattr(mcp, app_factory_name, wrapped_app_factory)
+
+
+def _request_parent(ctx: Any) -> Span | RemoteParent | None:
+    """Find the parent of a tool span from its MCP request context."""
+    request_context = getattr(ctx, "_request_context", None)
+    if request_context is None:
+        return None
+    request = getattr(request_context, "request", None)
+    scope = getattr(request, "scope", None) or {}
+    if scope.get(SCOPE_SPAN_KEY) is not None:
+        return scope[SCOPE_SPAN_KEY]
+    meta = request_context.meta
+    extra = getattr(meta, "model_extra", None) or {}
+    return parse_traceparent(extra.get(TRACEPARENT_HEADER))
+
+
+def trace_tool(
+    name: str, func: Callable[..., Any], context_kwarg: str | None = None
+) -> Callable[..., Any]:
+    """Wrap a tool function so that every call runs in its own span."""
+    if getattr(func, "__box_mcp_traced__", False):
+        return func
+
+    def span_for(kwargs: dict[str, Any]):
+        parent = None
+        if tracing_enabled() and context_kwarg and current_span() is None:
+            parent = _request_parent(kwargs.get(context_kwarg))
+        return start_span(f"tool {name}", parent=parent, attributes={"mcp.tool": name})
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span_for(kwargs) as span:
+                result = await func(*args, **kwargs)
+                if span is not None and isinstance(result, dict) and "error" in result:
+                    span.set_error(str(result["error"]))
+                return result
+
+    else:
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span_for(kwargs) as span:
+                result = func(*args, **kwargs)
+                if span is not None and isinstance(result, dict) and "error" in result:
+                    span.set_error(str(result["error"]))
+                return result
+
+    wrapper.__box_mcp_traced__ = True
+    return wrapper
+
+
+def trace_tools(mcp: FastMCP) -> None:
+    """Trace every tool registered on ``mcp`` so far."""
+    for tool in mcp._tool_manager.list_tools():
+        tool.fn = trace_tool(tool.name, tool.fn, tool.context_kwarg)
@@ -0,0 +1,189 @@
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from box_sdk_gen.schemas.file_full import FileFull
+
+from box_download import (
+    DOCUMENT_EXTENSIONS,
+    content_kind,
+    expected_length,
+    format_range,
+    stream_file_download,
+)
+
+CONTENT = bytes(range(256)) * 400  # 102400 bytes
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = CONTENT
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start, end = match.groups()
+            if start:
+                first, last = int(start), int(end) if end else len(CONTENT) - 1
+            else:
+                first, last = len(CONTENT) - int(end), len(CONTENT) - 1
+            body = CONTENT[first : last + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(CONTENT)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def download_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/content"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(download_url):
+    client = MagicMock()
+    client.files.get_file_by_id.return_value = FileFull.from_dict(
+        {
+            "id": "123",
+            "type": "file",
+            "name": "data.bin",
+            "size": len(CONTENT),
+            "sha1": "f" * 40,
+        }
+    )
+    client.downloads.get_download_file_url.return_value = download_url
+    client.network_session.network_client.requests_session = requests.Session()
+    return client
+
+
+def test_format_range():
+    assert format_range(None, None) is None
+    assert format_range(10, None) == "bytes=10-"
+    assert format_range(10, 19) == "bytes=10-19"
+    assert format_range(None, 5) == "bytes=-5"
+    with pytest.raises(ValueError):
+        format_range(10, 5)
+
+
+def test_expected_length():
+    assert expected_length(100, None, None) == 100
+    assert expected_length(100, 10, 19) == 10
+    assert expected_length(100, 90, 200) == 10
+    assert expected_length(100, None, 5) == 5
+    assert expected_length(None, 0, 10) is None
+
+
+def test_content_kind():
+    assert isinstance(DOCUMENT_EXTENSIONS, frozenset)
+    assert content_kind("notes.TXT", "text/plain") == "document"
+    assert content_kind("report.docx", None) == "document"
+    assert content_kind("photo.png", "image/png") == "image"
+    assert content_kind("archive.zip", "application/zip") is None
+    assert content_kind("README", None) is None
+
+
+def test_download_small_file_materializes_content(client):
+    result = stream_file_download(client, "123", chunk_size=4096, spool_max_size=1024)
+    assert result.content == CONTENT
+    assert result.sha1 == "f" * 40
+    assert result.kind is None
+    client.files.get_file_by_id.assert_called_once_with(
+        "123", fields=["name", "size", "sha1"]
+    )
+    assert result.bytes_downloaded == len(CONTENT)
+    assert result.saved_path is None
+    assert result.content_range is None
+
+
+def test_download_range(client):
+    result = stream_file_download(client, "123", range_start=100, range_end=199)
+    assert result.content == CONTENT[100:200]
+    assert result.content_range == f"bytes 100-199/{len(CONTENT)}"
+
+
+def test_download_suffix_range(client):
+    result = stream_file_download(client, "123", range_end=10)
+    assert result.content == CONTENT[-10:]
+
+
+def test_large_file_is_not_downloaded_without_save(client):
+    result = stream_file_download(client, "123", max_content_bytes=1000)
+    assert result.too_large
+    assert result.bytes_downloaded == 0
+    client.downloads.get_download_file_url.assert_not_called()
+
+
+def test_undisplayable_file_is_not_downloaded_without_save(client, tmp_path):
+    result = stream_file_download(client, "123", displayable_only=True)
+    assert result.too_large
+    assert result.bytes_downloaded == 0
+    client.downloads.get_download_file_url.assert_not_called()
+
+    result = stream_file_download(
+        client, "123", save_file=True, save_path=str(tmp_path), displayable_only=True
+    )
+    assert result.bytes_downloaded == len(CONTENT)
+
+
+def test_unknown_size_stops_streaming_past_limit(client):
+    client.files.get_file_by_id.return_value = FileFull.from_dict(
+        {"id": "123", "type": "file", "name": "data.bin"}
+    )
+    result = stream_file_download(client, "123", max_content_bytes=1000, chunk_size=512)
+    assert result.too_large
+    assert result.bytes_downloaded < len(CONTENT)
+
+
+def test_large_file_is_saved_without_materializing(client, tmp_path):
+    result = stream_file_download(
+        client,
+        "123",
+        save_file=True,
+        save_path=str(tmp_path),
+        max_content_bytes=1000,
+        chunk_size=4096,
+    )
+    assert result.too_large
+    assert result.saved_path == str(tmp_path / "data.bin")
+    assert (tmp_path / "data.bin").read_bytes() == CONTENT
+    assert [p.name for p in tmp_path.iterdir()] == ["data.bin"]
+
+
+def test_saved_small_file_is_returned(client, tmp_path):
+    target = tmp_path / "copy.bin"
+    result = stream_file_download(client, "123", save_file=True, save_path=str(target))
+    assert result.content == CONTENT
+    assert target.read_bytes() == CONTENT
+
+
+def test_saved_file_mode_follows_the_umask(client, tmp_path):
+    umask = os.umask(0o027)
+    try:
+        stream_file_download(client, "123", save_file=True, save_path=str(tmp_path))
+    finally:
+        os.umask(umask)
+    assert (tmp_path / "data.bin").stat().st_mode & 0o777 == 0o640
+
+
+def test_failed_save_leaves_no_partial_file(client, tmp_path):
+    client.downloads.get_download_file_url.return_value += "/missing"
+    session = client.network_session.network_client.requests_session
+    session.get = MagicMock(side_effect=requests.ConnectionError("reset"))
+    with pytest.raises(requests.ConnectionError):
+        stream_file_download(client, "123", save_file=True, save_path=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from box_executor import (
+    BoxExecutor,
+    configure_box_executor,
+    get_box_executor,
+    run_box_call,
+)
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def executor():
+    executor = BoxExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_and_passes_arguments(executor):
+    def add(a, b, *, c=0):
+        return a + b + c
+
+    assert await executor.run(add, 1, 2, c=3) == 6
+
+
+@pytest.mark.asyncio
+async def test_run_executes_off_the_event_loop_thread(executor):
+    loop_thread = threading.get_ident()
+    worker_thread = await executor.run(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_exceptions(executor):
+    def fail():
+        raise ValueError("Box API error")
+
+    with pytest.raises(ValueError, match="Box API error"):
+        await executor.run(fail)
+
+
+@pytest.mark.asyncio
+async def test_run_copies_context_variables(executor):
+    request_id.set("req-1")
+    assert await executor.run(request_id.get) == "req-1"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_overlap(executor):
+    def slow():
+        time.sleep(0.1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(executor.run(slow) for _ in range(4)))
+    assert time.perf_counter() - start < 0.3
+
+
+@pytest.mark.asyncio
+async def test_max_workers_bounds_concurrency():
+    executor = BoxExecutor(max_workers=2)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*(executor.run(work) for _ in range(6)))
+    executor.shutdown()
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_load(executor):
+    release = threading.Event()
+    task = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+
+    stats = executor.stats()
+    assert stats["max_workers"] == 4
+    assert stats["active"] == 1
+    assert stats["pending"] == 0
+
+    release.set()
+    await task
+    assert executor.stats()["active"] == 0
+
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError):
+        BoxExecutor(max_workers=0)
+
+
+@pytest.mark.asyncio
+async def test_configure_box_executor_replaces_shared_executor():
+    executor = configure_box_executor(3)
+    assert get_box_executor() is executor
+    assert executor.max_workers == 3
+    assert await run_box_call(lambda: "ok") == "ok"
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from box_fields import FOLDER_ITEM_FIELDS, project_fields, resolve_fields
+from box_search import box_locate_folder_by_name, box_search
+
+
+def test_resolve_fields():
+    assert resolve_fields(None, FOLDER_ITEM_FIELDS) == list(FOLDER_ITEM_FIELDS)
+    assert resolve_fields([], ("name",)) == ["id", "type", "name"]
+    assert resolve_fields(["size", " name ", "id", "size"]) == [
+        "id",
+        "type",
+        "size",
+        "name",
+    ]
+
+
+def test_project_fields_keeps_known_fields_only():
+    item = SimpleNamespace(
+        to_dict=lambda: {"id": "1", "type": "file", "name": "a", "owned_by": {}}
+    )
+    assert project_fields(item, ["id", "type", "name", "size"]) == {
+        "id": "1",
+        "type": "file",
+        "name": "a",
+    }
+
+
+def test_searches_request_the_fields():
+    client = MagicMock()
+    client.search.search_for_content.return_value = SimpleNamespace(entries=["hit"])
+
+    assert box_search(client, "q", fields=["id", "type", "parent"]) == ["hit"]
+    kwargs = client.search.search_for_content.call_args.kwargs
+    assert kwargs["fields"] == ["id", "type", "parent"]
+    assert kwargs["type"][0].value == "file"
+
+    box_locate_folder_by_name(client, "Reports")
+    kwargs = client.search.search_for_content.call_args.kwargs
+    assert kwargs["fields"] == ["id", "type", "name"]
+    assert kwargs["ancestor_folder_ids"] == ["0"]
+    assert kwargs["type"][0].value == "folder"
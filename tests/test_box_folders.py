@@ -0,0 +1,228 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from box_sdk_gen import BoxAPIError
+from box_sdk_gen.box.errors import ResponseInfo
+
+from box_folders import box_folder_list_page, walk_folder_tree
+from continuation import decode_continuation_token, encode_continuation_token
+
+
+def item(item_id, item_type="file"):
+    entry = SimpleNamespace(id=item_id, name=f"item {item_id}", type=item_type)
+    entry.to_dict = lambda: {"id": item_id, "type": item_type, "size": 10}
+    return entry
+
+
+def page(entries, next_marker=None, total_count=None):
+    return SimpleNamespace(
+        entries=entries, next_marker=next_marker, total_count=total_count
+    )
+
+
+@pytest.fixture
+def client():
+    return MagicMock()
+
+
+def test_continuation_token_round_trip():
+    state = {"folder_id": "1", "marker": "abc", "fields": ["id"]}
+    assert decode_continuation_token(encode_continuation_token(state)) == state
+    with pytest.raises(ValueError):
+        decode_continuation_token("not a token")
+
+
+def test_marker_pagination(client):
+    client.folders.get_folder_items.side_effect = [
+        page([item("1"), item("2", "folder")], next_marker="box-marker"),
+        page([item("3"), item("4", "web_link")]),
+    ]
+
+    first = box_folder_list_page(client, "123", limit=2)
+    assert [e["id"] for e in first["entries"]] == ["1", "2"]
+    assert first["entries"][0] == {
+        "id": "1",
+        "name": "item 1",
+        "type": "file",
+        "description": None,
+    }
+    assert first["continuation_token"]
+    assert client.folders.get_folder_items.call_args.kwargs["fields"] == [
+        "id",
+        "type",
+        "name",
+        "description",
+    ]
+
+    # The token alone restores the folder and page size
+    second = box_folder_list_page(client, "ignored", marker=first["continuation_token"])
+    assert [e["id"] for e in second["entries"]] == ["3"]
+    assert second["continuation_token"] is None
+
+    kwargs = client.folders.get_folder_items.call_args.kwargs
+    assert client.folders.get_folder_items.call_args.args == ("123",)
+    assert kwargs["usemarker"] is True
+    assert kwargs["marker"] == "box-marker"
+    assert kwargs["limit"] == 2
+
+
+def test_sorted_listing_uses_offset_pagination(client):
+    client.folders.get_folder_items.side_effect = [
+        page([item("1"), item("2")], total_count=3),
+        page([item("3")], total_count=3),
+    ]
+
+    first = box_folder_list_page(
+        client, "0", limit=2, sort="name", direction="desc", fields=["id", "size"]
+    )
+    assert first["entries"][0] == {"id": "1", "type": "file", "size": 10}
+    assert first["total_count"] == 3
+    second = box_folder_list_page(client, "0", marker=first["continuation_token"])
+    assert second["continuation_token"] is None
+
+    kwargs = client.folders.get_folder_items.call_args.kwargs
+    assert kwargs["offset"] == 2
+    assert kwargs["usemarker"] is None
+    assert kwargs["sort"].value == "name"
+    assert kwargs["direction"].value == "DESC"
+    assert kwargs["fields"] == ["id", "type", "size"]
+
+
+def test_raw_box_marker_is_accepted(client):
+    client.folders.get_folder_items.return_value = page([])
+    box_folder_list_page(client, "123", marker="raw-marker")
+    assert client.folders.get_folder_items.call_args.kwargs["marker"] == "raw-marker"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"limit": 0}, {"limit": 1001}, {"sort": "color"}, {"direction": "up"}],
+)
+def test_invalid_parameters(client, kwargs):
+    with pytest.raises(ValueError):
+        box_folder_list_page(client, "123", **kwargs)
+    client.folders.get_folder_items.assert_not_called()
+
+
+class FakeTree:
+    """Folder items source: every folder holds two subfolders and a file."""
+
+    def __init__(self, depth, delay=0.0, rate_limited=0, retry_after="0"):
+        self.depth = depth
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.listed = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def get_folder_items(self, folder_id, **kwargs):
+        with self.lock:
+            if self.rate_limited:
+                self.rate_limited -= 1
+                raise BoxAPIError(
+                    request_info=MagicMock(),
+                    response_info=ResponseInfo(429, {"Retry-After": self.retry_after}),
+                    message="Too many requests",
+                )
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.listed.append(folder_id)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        level = folder_id.count("/")
+        entries = [item(f"{folder_id}/file", "file")]
+        if level < self.depth:
+            entries += [item(f"{folder_id}/{n}", "folder") for n in "ab"]
+        return page(entries)
+
+
+def walk_client(tree):
+    client = MagicMock()
+    client.folders = tree
+    return client
+
+
+async def collect(walk):
+    return [entry async for entry in walk]
+
+
+@pytest.mark.asyncio
+async def test_walk_lists_the_whole_tree_breadth_first():
+    tree = FakeTree(depth=3)
+    entries = await collect(walk_folder_tree(walk_client(tree), "0", max_concurrency=1))
+
+    # 1 + 2 + 4 + 8 folders listed, each with a file, plus 14 subfolders
+    assert len(tree.listed) == 15
+    assert len(entries) == 15 + 14
+    # Folders are opened level by level; with more workers, a deeper folder
+    # can be opened while the previous level is still being listed
+    levels = [folder.count("/") for folder in tree.listed]
+    assert levels == sorted(levels)
+    assert entries[0]["parent_id"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_walk_lists_folders_concurrently_within_bounds():
+    tree = FakeTree(depth=4, delay=0.02)
+    await collect(walk_folder_tree(walk_client(tree), "0", max_concurrency=4))
+    assert 1 < tree.peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_walk_max_depth():
+    tree = FakeTree(depth=5)
+    entries = await collect(walk_folder_tree(walk_client(tree), "0", max_depth=1))
+    assert len(tree.listed) == 3
+    assert max(entry["depth"] for entry in entries) == 1
+
+
+@pytest.mark.asyncio
+async def test_walk_max_items_stops_listing():
+    tree = FakeTree(depth=8, delay=0.01)
+    entries = await collect(
+        walk_folder_tree(walk_client(tree), "0", max_items=10, max_concurrency=2)
+    )
+    assert len(entries) == 10
+    assert len(tree.listed) < 20
+
+
+@pytest.mark.asyncio
+async def test_walk_retries_rate_limited_pages(monkeypatch):
+    tree = FakeTree(depth=1, rate_limited=2)
+    entries = await collect(walk_folder_tree(walk_client(tree), "0"))
+    assert len(entries) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "retry_after, expected",
+    [
+        ("Wed, 21 Oct 2015 07:28:00 GMT", [0.0]),
+        ("soon", [1]),
+    ],
+)
+async def test_walk_retry_after_dates_and_garbage(monkeypatch, retry_after, expected):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("box_folders.asyncio.sleep", sleep)
+    tree = FakeTree(depth=0, rate_limited=1, retry_after=retry_after)
+    entries = await collect(walk_folder_tree(walk_client(tree), "0"))
+    assert len(entries) == 1
+    assert delays == expected
+
+
+@pytest.mark.asyncio
+async def test_walk_propagates_errors():
+    client = MagicMock()
+    client.folders.get_folder_items.side_effect = RuntimeError("boom")
+    with pytest.raises(RuntimeError, match="boom"):
+        await collect(walk_folder_tree(client, "0"))
@@ -0,0 +1,96 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from box_sdk_gen.networking.box_network_client import APIRequest
+
+from box_http import PooledBoxNetworkClient, shared_network_client
+from config import CONFIG
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def http_server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(client: PooledBoxNetworkClient, url: str):
+    response = client._make_request(
+        APIRequest(method="GET", url=url, headers={}, params={}, data=None)
+    )
+    assert response.raised_exception is None
+    response.network_response.content  # release the connection to the pool
+    return response.network_response
+
+
+def test_pool_settings_applied():
+    client = PooledBoxNetworkClient(pool_connections=3, pool_maxsize=7)
+    stats = client.stats()
+    assert stats["pool_connections"] == 3
+    assert stats["pool_maxsize"] == 7
+    assert stats["keep_alive"] is True
+    assert stats["requests_sent"] == 0
+    assert stats["hosts"] == {}
+    client.close()
+
+
+def test_keep_alive_reuses_connections(http_server_url):
+    client = PooledBoxNetworkClient()
+    for _ in range(5):
+        assert get(client, http_server_url).status_code == 200
+
+    stats = client.stats()
+    assert stats["requests_sent"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+    (host_stats,) = stats["hosts"].values()
+    assert host_stats["requests"] == 5
+    assert host_stats["idle_connections"] == 1
+    client.close()
+
+
+def test_keep_alive_disabled_sends_connection_close(http_server_url):
+    client = PooledBoxNetworkClient(keep_alive=False)
+    response = get(client, http_server_url)
+    assert response.request.headers["Connection"] == "close"
+    client.close()
+
+
+def test_close_is_idempotent():
+    client = PooledBoxNetworkClient()
+    client.close()
+    client.close()
+    assert client.closed
+    assert client.stats()["closed"] is True
+
+
+def test_shared_network_client_is_reference_counted():
+    with shared_network_client(CONFIG) as outer:
+        with shared_network_client(CONFIG) as inner:
+            assert inner is outer
+        assert not outer.closed
+    assert outer.closed
+
+    with shared_network_client(CONFIG) as fresh:
+        assert fresh is not outer
+        assert not fresh.closed
+    assert fresh.closed
@@ -0,0 +1,166 @@
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from box_http import PooledBoxNetworkClient
+from box_rate_limit import (
+    QUEUE_DEPTH,
+    THROTTLED,
+    RateLimiter,
+    RateLimits,
+    TokenBucket,
+    bucket_name,
+    configure_rate_limiter,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from config import CONFIG
+from metrics import REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+@pytest.mark.parametrize(
+    "host, path, expected",
+    [
+        ("api.box.com", "/2.0/files/1", "api"),
+        ("api.box.com", "/2.0/search", "search"),
+        ("upload.box.com", "/api/2.0/files/content", "upload"),
+        ("api.box.com", "/oauth2/token", None),
+        ("dl.boxcloud.com", "/d/1/abc/download", None),
+    ],
+)
+def test_bucket_name(host, path, expected):
+    assert bucket_name(host, path) == expected
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(later, usegmt=True)) <= 30
+
+
+def test_bucket_allows_a_burst_then_queues():
+    bucket = TokenBucket("api", rate=50, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Later arrivals are scheduled one refill interval apart
+    assert bucket.reserve() == pytest.approx(0.02, abs=0.005)
+    assert bucket.reserve() == pytest.approx(0.04, abs=0.005)
+
+
+def test_acquire_waits_for_a_token():
+    bucket = TokenBucket("api", rate=50, capacity=1)
+    assert bucket.acquire() == 0
+    start = time.monotonic()
+    assert bucket.acquire() > 0
+    assert time.monotonic() - start >= 0.015
+
+
+def test_pause_holds_queued_requests():
+    bucket = TokenBucket("api", rate=1000)
+    bucket.pause(0.1)
+    depths = []
+
+    def watch():
+        time.sleep(0.03)
+        depths.append(QUEUE_DEPTH.value(bucket="api"))
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    waited = bucket.acquire()
+    watcher.join()
+
+    assert waited >= 0.09
+    assert depths == [1]
+    assert QUEUE_DEPTH.value(bucket="api") == 0
+
+
+def test_pause_during_wait_extends_it():
+    # The pause lands well within the 0.2s wait for the next token
+    bucket = TokenBucket("api", rate=5, capacity=1)
+    bucket.acquire()
+    timer = threading.Timer(0.01, bucket.pause, args=(0.3,))
+    timer.start()
+    waited = bucket.acquire()
+    timer.join()
+    assert waited >= 0.3
+
+
+def test_throttled_response_pauses_its_bucket_only():
+    limiter = RateLimiter(RateLimits(api=100, search=100, upload=100))
+    limiter.observe_response("api.box.com", "/2.0/search", 429, "5")
+    assert limiter.buckets["search"].paused_for() > 4
+    assert limiter.buckets["api"].paused_for() == 0
+    assert THROTTLED.value(bucket="search", status="429") == 1
+
+    limiter.observe_response("api.box.com", "/2.0/files/1", 503, None)
+    limiter.observe_response("api.box.com", "/2.0/files/1", 200, "5")
+    assert limiter.buckets["api"].paused_for() == 0
+
+
+def test_configure_rate_limiter_can_disable():
+    assert configure_rate_limiter(replace(CONFIG, rate_limit_enabled=False)) is None
+    assert get_rate_limiter() is None
+    limiter = configure_rate_limiter(replace(CONFIG, rate_limit_api_per_minute=120))
+    assert get_rate_limiter() is limiter
+    assert limiter.buckets["api"].rate == 2
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttle = True
+
+    def do_GET(self):
+        if ThrottlingHandler.throttle:
+            ThrottlingHandler.throttle = False
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def throttling_server_url():
+    ThrottlingHandler.throttle = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_requests_honor_retry_after(throttling_server_url):
+    configure_rate_limiter(CONFIG)
+    client = PooledBoxNetworkClient()
+    try:
+        first = client.requests_session.get(f"{throttling_server_url}/2.0/users/me")
+        start = time.monotonic()
+        second = client.requests_session.get(f"{throttling_server_url}/2.0/files/1")
+        elapsed = time.monotonic() - start
+    finally:
+        client.close()
+        configure_rate_limiter(CONFIG)
+
+    assert first.status_code == 429
+    assert second.status_code == 200
+    assert elapsed >= 0.15
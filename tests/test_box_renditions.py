@@ -0,0 +1,169 @@
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+from box_sdk_gen.schemas.file_full import FileFull
+from mcp.server.fastmcp import Context
+
+from box_renditions import (
+    RENDITION_CACHE_LOOKUPS,
+    RenditionCache,
+    download_rendition,
+    rendition_dimensions,
+)
+from config import CONFIG
+from metrics import REGISTRY
+from tools.box_tools_files import box_download_file_tool
+
+SHA1_A = "a" * 40
+SHA1_B = "b" * 40
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+def representation(dimensions, state="success"):
+    entry = {
+        "representation": "jpg",
+        "properties": {"dimensions": dimensions},
+        "status": {"state": state},
+        "info": {"url": f"https://api.box.test/info/{dimensions}"},
+    }
+    if state == "success":
+        entry["content"] = {
+            "url_template": f"https://dl.box.test/rep/{dimensions}/{{+asset_path}}"
+        }
+    return entry
+
+
+def make_client(name="photo.jpg", sha1=SHA1_A, sizes=None, state="success", missing=()):
+    """A client whose renditions of each dimensions weigh ``sizes[dims]`` bytes."""
+    sizes = sizes or {}
+    client = MagicMock()
+    client.auth.retrieve_authorization_header.return_value = "Bearer token"
+
+    def get_file_by_id(file_id, fields, x_rep_hints):
+        hinted = re.findall(r"\[jpg\?dimensions=(\w+)\]", x_rep_hints)
+        client.hints.append(hinted)
+        return FileFull.from_dict(
+            {
+                "id": file_id,
+                "type": "file",
+                "name": name,
+                "sha1": sha1,
+                "representations": {
+                    "entries": [
+                        representation(d, state) for d in hinted if d not in missing
+                    ]
+                },
+            }
+        )
+
+    def get(url, headers, timeout):
+        assert headers == {"Authorization": "Bearer token"}
+        dimensions = url.rstrip("/").rsplit("/", 1)[1]
+        if "/info/" in url:
+            return MagicMock(json=lambda: representation(dimensions))
+        client.downloaded.append(dimensions)
+        return MagicMock(content=b"j" * sizes.get(dimensions, 100))
+
+    client.hints = []
+    client.downloaded = []
+    client.files.get_file_by_id.side_effect = get_file_by_id
+    client.network_session.network_client.requests_session.get.side_effect = get
+    return client
+
+
+def test_rendition_dimensions():
+    assert rendition_dimensions(300) == ["320x320", "160x160", "94x94", "32x32"]
+    assert rendition_dimensions(32) == ["32x32"]
+    assert rendition_dimensions(5000)[0] == "2048x2048"
+    with pytest.raises(ValueError):
+        rendition_dimensions(0)
+
+
+def test_download_steps_down_until_the_rendition_fits():
+    client = make_client(sizes={"1024x1024": 5000, "320x320": 900})
+    rendition = download_rendition(client, "1", 1000, max_bytes=1000)
+    assert rendition.dimensions == "320x320"
+    assert rendition.content == b"j" * 900
+    # One metadata request covers every candidate size
+    assert client.hints == [["1024x1024", "320x320", "160x160", "94x94", "32x32"]]
+    assert client.downloaded == ["1024x1024", "320x320"]
+    client.auth.retrieve_authorization_header.assert_called_with(
+        network_session=client.network_session
+    )
+
+
+def test_download_skips_sizes_box_does_not_offer():
+    client = make_client(missing=("320x320",))
+    rendition = download_rendition(client, "1", 300)
+    assert rendition.dimensions == "160x160"
+    assert client.downloaded == ["160x160"]
+
+
+def test_pending_representation_is_polled():
+    client = make_client(state="pending")
+    with patch("box_renditions.time.sleep"):
+        rendition = download_rendition(client, "1", 100)
+    assert rendition.dimensions == "160x160"
+    urls = [
+        c.args[0]
+        for c in client.network_session.network_client.requests_session.get.mock_calls
+    ]
+    assert urls == [
+        "https://api.box.test/info/160x160",
+        "https://dl.box.test/rep/160x160/",
+    ]
+
+
+def test_files_that_are_not_images_have_no_rendition():
+    client = make_client(name="report.pdf")
+    assert download_rendition(client, "1", 100) is None
+    client.network_session.network_client.requests_session.get.assert_not_called()
+
+
+def test_renditions_are_cached_by_version_and_dimensions():
+    cache = RenditionCache(max_bytes=10_000)
+    client = make_client()
+    download_rendition(client, "1", 100, cache=cache)
+    download_rendition(client, "1", 100, cache=cache)
+    session = client.network_session.network_client.requests_session
+    assert session.get.call_count == 1
+    assert RENDITION_CACHE_LOOKUPS.value(outcome="hit") == 1
+
+    # Another size, then a new version of the file
+    download_rendition(client, "1", 300, cache=cache)
+    assert cache.stats()["entries"] == 2
+    download_rendition(make_client(sha1=SHA1_B), "1", 100, cache=cache)
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RenditionCache(max_bytes=250)
+    cache.put("1", SHA1_A, "32x32", b"x" * 100)
+    cache.put("2", SHA1_A, "32x32", b"x" * 100)
+    cache.get("1", SHA1_A, "32x32")
+    cache.put("3", SHA1_A, "32x32", b"x" * 100)
+    assert cache.get("2", SHA1_A, "32x32") is None
+    assert cache.get("1", SHA1_A, "32x32") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_download_tool_returns_the_rendition():
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_files.get_box_client", return_value=make_client()),
+        patch("tools.box_tools_files.get_server_config", return_value=CONFIG),
+        patch("tools.box_tools_files.get_rendition_cache", return_value=None),
+        patch("tools.box_tools_files.stream_file_download") as mock_download,
+    ):
+        resp = await box_download_file_tool(ctx, "123", max_image_dimension=1024)
+    assert "Rendition: 1024x1024 JPEG" in resp
+    assert "MIME type: image/jpeg" in resp
+    mock_download.assert_not_called()
@@ -0,0 +1,350 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from box_sdk_gen import BoxAPIError, BoxClient, BoxDeveloperTokenAuth, BoxSDKError
+from box_sdk_gen.box.errors import ResponseInfo
+from box_sdk_gen.networking.base_urls import BaseUrls
+from box_sdk_gen.networking.box_network_client import APIRequest
+from box_sdk_gen.networking.fetch_options import FetchOptions
+from box_sdk_gen.networking.network import NetworkSession
+from box_sdk_gen.networking.retries import BoxRetryStrategy
+
+import box_http
+from box_http import PooledBoxNetworkClient
+from box_resilience import (
+    CALL_RETRIES,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    SingleAttemptRetryStrategy,
+    configure_resilience,
+    get_circuit_breaker,
+    is_transient_error,
+    retry_box_call,
+)
+from box_upload import upload_file_content
+from config import CONFIG
+from metrics import BOX_API_RETRIES, REGISTRY
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    REGISTRY.clear()
+    configure_resilience(CONFIG)
+    yield
+    configure_resilience(CONFIG)
+
+
+def api_error(status, code=None, context_info=None):
+    return BoxAPIError(
+        request_info=MagicMock(),
+        response_info=ResponseInfo(
+            status, {}, code=code, context_info=context_info or {}
+        ),
+        message=f"{status} error",
+    )
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("api.box.com/2.0/files/{id}", 3, reset_timeout=60)
+    for _ in range(2):
+        breaker.allow()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.allow()
+    assert 59 < error.value.retry_in <= 60
+
+
+def test_breaker_lets_a_single_probe_through_after_timeout():
+    breaker = CircuitBreaker("endpoint", 1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker("endpoint", 5, reset_timeout=0.01)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.02)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (api_error(503), True),
+        (api_error(429), True),
+        (api_error(404), False),
+        (BoxSDKError("network", error=requests.ConnectionError()), True),
+        (BoxSDKError("bad input"), False),
+        (requests.Timeout(), True),
+        (CircuitOpenError("endpoint", 10), False),
+        (ValueError("bad"), False),
+    ],
+)
+def test_is_transient_error(error, expected):
+    assert is_transient_error(error) is expected
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(attempts=5, base_delay=1, max_delay=4)
+    for attempt, cap in [(0, 1), (1, 2), (2, 4), (5, 4)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= cap for delay in delays)
+
+
+@pytest.mark.asyncio
+async def test_retry_box_call_retries_transient_failures():
+    outcomes = [api_error(502), requests.ConnectionError(), "ok"]
+
+    def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert await retry_box_call(call, policy=NO_DELAY) == "ok"
+    assert CALL_RETRIES.value(call="call") == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_box_call_gives_up():
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise api_error(500)
+
+    with pytest.raises(BoxAPIError):
+        await retry_box_call(call, policy=NO_DELAY)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_box_call_does_not_retry_client_errors():
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise api_error(404)
+
+    with pytest.raises(BoxAPIError):
+        await retry_box_call(call, policy=NO_DELAY)
+    assert len(calls) == 1
+
+
+class FailingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        FailingHandler.hits += 1
+        self.send_response(500)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def failing_server_url():
+    FailingHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FailingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_failing_endpoint_fails_fast(failing_server_url):
+    client = PooledBoxNetworkClient()
+    session = client.requests_session
+    try:
+        for _ in range(CONFIG.circuit_breaker_failure_threshold):
+            assert session.get(f"{failing_server_url}/2.0/files/1").status_code == 500
+        with pytest.raises(CircuitOpenError):
+            session.get(f"{failing_server_url}/2.0/files/2")
+        # Other endpoints are unaffected
+        assert session.get(f"{failing_server_url}/2.0/users/me").status_code == 500
+    finally:
+        client.close()
+    assert FailingHandler.hits == CONFIG.circuit_breaker_failure_threshold + 1
+
+
+def test_sdk_retries_count_as_one_breaker_failure(failing_server_url):
+    client = PooledBoxNetworkClient()
+    session = NetworkSession(
+        network_client=client,
+        retry_strategy=BoxRetryStrategy(max_attempts=3, retry_base_interval=0.001),
+    )
+    try:
+        with pytest.raises(BoxAPIError):
+            client.fetch(
+                FetchOptions(
+                    f"{failing_server_url}/2.0/files/1",
+                    "GET",
+                    network_session=session,
+                )
+            )
+    finally:
+        client.close()
+
+    assert FailingHandler.hits == 3
+    assert get_circuit_breaker("127.0.0.1/2.0/files/{id}").failures == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_box_call_is_the_only_retry_layer(failing_server_url):
+    network_client = PooledBoxNetworkClient()
+    client = BoxClient(
+        auth=BoxDeveloperTokenAuth(token="token"),
+        network_session=NetworkSession(
+            network_client=network_client,
+            base_urls=BaseUrls(base_url=failing_server_url),
+        ),
+    )
+    used = []
+
+    def get_file(box_client, file_id):
+        used.append(box_client)
+        return box_client.files.get_file_by_id(file_id)
+
+    try:
+        with pytest.raises(BoxAPIError):
+            await retry_box_call(get_file, client, "1", policy=NO_DELAY)
+    finally:
+        network_client.close()
+
+    assert FailingHandler.hits == NO_DELAY.attempts
+    assert len(used) == NO_DELAY.attempts
+    assert used[0] is not client
+    assert isinstance(
+        used[0].network_session.retry_strategy, SingleAttemptRetryStrategy
+    )
+    assert used[0].network_session.network_client is network_client
+
+
+def test_probe_failing_before_the_endpoint_frees_its_slot(monkeypatch):
+    client = PooledBoxNetworkClient()
+    breaker = get_circuit_breaker("api.box.com/2.0/files/{id}")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.reset_timeout = 0
+    options = FetchOptions("https://api.box.com/2.0/files/1", "GET")
+
+    def no_token(self, options):
+        raise BoxSDKError(message="Access and refresh tokens not available.")
+
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient.fetch", no_token
+    )
+    with pytest.raises(BoxSDKError):
+        client.fetch(options)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # The next call probes the endpoint instead of failing fast forever
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient.fetch",
+        lambda self, options: "response",
+    )
+    assert client.fetch(options) == "response"
+    assert breaker.state == CircuitBreaker.CLOSED
+    client.close()
+
+
+def test_nested_fetch_keeps_the_outer_fetch_state(monkeypatch):
+    client = PooledBoxNetworkClient()
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient._make_request",
+        lambda self, request: None,
+    )
+    outer_url = "https://api.box.com/2.0/users/me"
+    depths = []
+
+    def fetch(self, options):
+        if options.url != outer_url:
+            return "token"
+        self._make_request(APIRequest("GET", outer_url, {}, {}, None))
+        # A token refresh in the middle of the call
+        self.fetch(FetchOptions("https://api.box.com/oauth2/token", "POST"))
+        depths.append(box_http._fetching.depth)
+        self._make_request(APIRequest("GET", outer_url, {}, {}, None))
+        return "response"
+
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient.fetch", fetch
+    )
+    assert client.fetch(FetchOptions(outer_url, "GET")) == "response"
+    assert depths == [1]
+    assert box_http._fetching.depth == 0
+    assert BOX_API_RETRIES.value(method="GET", endpoint="/2.0/users/me") == 1
+    client.close()
+
+
+def test_upload_file_content_sends_its_sha1():
+    client = MagicMock()
+    client.uploads.upload_file.return_value.entries = [
+        SimpleNamespace(id="1", type="file", name="a.txt")
+    ]
+    result = upload_file_content(client, b"hello", "a.txt", "0")
+
+    assert result == {"id": "1", "name": "a.txt", "type": "file"}
+    kwargs = client.uploads.upload_file.call_args.kwargs
+    assert kwargs["content_md_5"] == "aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d"
+
+
+def test_upload_file_content_returns_an_identical_existing_file():
+    client = MagicMock()
+    client.uploads.upload_file.side_effect = api_error(
+        409,
+        code="item_name_in_use",
+        context_info={
+            "conflicts": {
+                "type": "file",
+                "id": "7",
+                "name": "a.txt",
+                "sha1": "aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d",
+            }
+        },
+    )
+    result = upload_file_content(client, b"hello", "a.txt", "0")
+    assert result == {"id": "7", "name": "a.txt", "type": "file", "existing": True}
+
+
+def test_upload_file_content_keeps_conflicts_with_other_content():
+    client = MagicMock()
+    client.uploads.upload_file.side_effect = api_error(
+        409,
+        code="item_name_in_use",
+        context_info={"conflicts": {"type": "file", "id": "7", "sha1": "other"}},
+    )
+    with pytest.raises(BoxAPIError):
+        upload_file_content(client, b"hello", "a.txt", "0")
@@ -0,0 +1,130 @@
+import asyncio
+from dataclasses import replace
+from unittest.mock import MagicMock
+
+import pytest
+from mcp.server.fastmcp import Context, FastMCP
+
+from config import CONFIG
+from tool_registry import LazyToolManager, ToolGroup, get_tool, register_all_tools
+from tool_registry.batch_tools import BATCH_TOOLS, register_batch_tools
+from tools.box_tools_batch import box_batch_tool
+
+
+async def echo(ctx: Context, value: str) -> dict:
+    """Echo tool of the lazily registered group below."""
+    return {"value": value}
+
+
+ECHO_TOOLS = ToolGroup("echo_tools", __name__, ("echo",))
+
+
+@pytest.fixture
+def mcp():
+    server = FastMCP("test")
+    state = {"running": 0, "peak": 0}
+
+    @server.tool()
+    async def slow_echo(ctx: Context, value: str, delay: float = 0.01) -> dict:
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(delay)
+        state["running"] -= 1
+        return {"value": value}
+
+    @server.tool()
+    def fail(ctx: Context) -> dict:
+        raise RuntimeError("boom")
+
+    register_batch_tools(server)
+    server.state = state
+    return server
+
+
+def make_ctx(mcp, config=CONFIG):
+    ctx = MagicMock()
+    ctx.fastmcp = mcp
+    ctx.request_context.lifespan_context.config = config
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_results_and_errors_in_order(mcp):
+    calls = [
+        {"tool": "slow_echo", "arguments": {"value": "a", "delay": 0.03}},
+        {"tool": "fail"},
+        {"tool": "slow_echo", "arguments": {"value": "b"}},
+        {"tool": "missing_tool", "arguments": {}},
+        {"tool": "slow_echo", "arguments": {}},
+        {"tool": "box_batch_tool", "arguments": {"calls": []}},
+        {"arguments": {}},
+    ]
+    result = await box_batch_tool(make_ctx(mcp), calls)
+
+    results = result["results"]
+    assert [item["tool"] for item in results] == [
+        "slow_echo",
+        "fail",
+        "slow_echo",
+        "missing_tool",
+        "slow_echo",
+        "box_batch_tool",
+        None,
+    ]
+    assert results[0] == {"tool": "slow_echo", "result": {"value": "a"}}
+    assert "boom" in results[1]["error"]
+    assert results[2] == {"tool": "slow_echo", "result": {"value": "b"}}
+    assert results[3]["error"] == "Unknown tool: missing_tool"
+    # Invalid arguments are reported like any other failure
+    assert "value" in results[4]["error"]
+    assert results[5]["error"] == "box_batch_tool cannot be nested"
+    assert "error" in results[6]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_calls_concurrently_up_to_the_limit(mcp):
+    calls = [{"tool": "slow_echo", "arguments": {"value": str(i)}} for i in range(10)]
+
+    await box_batch_tool(make_ctx(mcp), calls, max_parallelism=3)
+    assert mcp.state["peak"] == 3
+
+    # The server setting caps the requested parallelism
+    mcp.state["peak"] = 0
+    config = replace(CONFIG, batch_max_parallelism=2)
+    await box_batch_tool(make_ctx(mcp, config), calls, max_parallelism=50)
+    assert mcp.state["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_too_many_calls(mcp):
+    config = replace(CONFIG, batch_max_calls=2)
+    calls = [{"tool": "slow_echo", "arguments": {"value": "a"}}] * 3
+    result = await box_batch_tool(make_ctx(mcp, config), calls)
+    assert "at most 2 calls" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_tool_is_callable_through_the_server(mcp):
+    tool = get_tool(mcp, "box_batch_tool")
+    result = await tool.run(
+        {"calls": [{"tool": "slow_echo", "arguments": {"value": "a"}}]},
+        context=make_ctx(mcp),
+    )
+    assert result == {"results": [{"tool": "slow_echo", "result": {"value": "a"}}]}
+
+
+@pytest.mark.asyncio
+async def test_batch_loads_lazily_registered_tools():
+    server = FastMCP("lazy")
+    register_all_tools(server, [BATCH_TOOLS, ECHO_TOOLS])
+    manager = server._tool_manager
+    assert isinstance(manager, LazyToolManager)
+    assert manager.pending_groups() == [BATCH_TOOLS, ECHO_TOOLS]
+
+    tool = get_tool(server, "box_batch_tool")
+    result = await tool.run(
+        {"calls": [{"tool": "echo", "arguments": {"value": "a"}}]},
+        context=make_ctx(server),
+    )
+    assert result == {"results": [{"tool": "echo", "result": {"value": "a"}}]}
+    assert manager.pending_groups() == []
@@ -1,5 +1,10 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
+from mcp.server.fastmcp import Context
 
+from box_download import DownloadResult
+from config import CONFIG
 from tools.box_tools_files import (
     box_download_file_tool,
     box_read_tool,
@@ -60,3 +65,62 @@ async def test_box_upload_file_from_content_tool(ctx):
     assert resp is not None
     assert isinstance(resp, str)
     assert len(resp) > 0
+
+
+@pytest.mark.asyncio
+async def test_box_download_file_tool_too_large():
+    ctx = MagicMock(spec=Context)
+    download = DownloadResult(
+        file_name="photo.png", mime_type="image/png", file_size=50_000_000, kind="image"
+    )
+    with (
+        patch("tools.box_tools_files.get_box_client"),
+        patch("tools.box_tools_files.get_server_config", return_value=CONFIG),
+        patch(
+            "tools.box_tools_files.stream_file_download", return_value=download
+        ) as mock_download,
+    ):
+        resp = await box_download_file_tool(ctx, "123", range_start=0)
+    assert "larger than the" in resp
+    assert "base64" not in resp.lower()
+    assert mock_download.call_args.kwargs["range_start"] == 0
+
+
+@pytest.mark.asyncio
+async def test_box_download_file_tool_range():
+    ctx = MagicMock(spec=Context)
+    download = DownloadResult(
+        file_name="notes.txt",
+        mime_type="text/plain",
+        file_size=1000,
+        bytes_downloaded=5,
+        content_range="bytes 0-4/1000",
+        content=b"hello",
+        kind="document",
+    )
+    with (
+        patch("tools.box_tools_files.get_box_client"),
+        patch("tools.box_tools_files.get_server_config", return_value=CONFIG),
+        patch("tools.box_tools_files.stream_file_download", return_value=download),
+    ):
+        resp = await box_download_file_tool(ctx, "123", range_start=0, range_end=4)
+    assert "Content-Range: bytes 0-4/1000" in resp
+    assert resp.endswith("hello")
+
+
+@pytest.mark.asyncio
+async def test_box_download_file_tool_skips_unsupported_content():
+    ctx = MagicMock(spec=Context)
+    download = DownloadResult(
+        file_name="archive.zip", mime_type="application/zip", file_size=1000
+    )
+    with (
+        patch("tools.box_tools_files.get_box_client"),
+        patch("tools.box_tools_files.get_server_config", return_value=CONFIG),
+        patch(
+            "tools.box_tools_files.stream_file_download", return_value=download
+        ) as mock_download,
+    ):
+        resp = await box_download_file_tool(ctx, "123")
+    assert "unsupported type (application/zip)" in resp
+    assert mock_download.call_args.kwargs["displayable_only"] is True
@@ -9,7 +9,8 @@ from tools.box_tools_folders import (
 @pytest.mark.asyncio
 async def test_box_api_list_content_folders(ctx):
     # This folder only has folders
-    items: dict = await box_list_folder_content_by_folder_id(ctx, "298939523710")
+    page: dict = await box_list_folder_content_by_folder_id(ctx, "298939523710")
+    items = page["entries"]
 
     assert len(items) > 0
     # check if items are files or folder in their type
@@ -20,7 +21,7 @@ async def test_box_api_list_content_folders(ctx):
 @pytest.mark.asyncio
 async def test_box_api_list_content_files(ctx):
     # This filter only has files
-    items = await box_list_folder_content_by_folder_id(ctx, "298939487242")
+    items = (await box_list_folder_content_by_folder_id(ctx, "298939487242"))["entries"]
 
     assert len(items) > 0
     assert all(item.get("type") in ["file", "folder"] for item in items)
@@ -1,8 +1,12 @@
+from dataclasses import replace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from box_sdk_gen import AccessToken, BoxOAuth, OAuthConfig
+from box_sdk_gen.box.token_storage import FileWithInMemoryCacheTokenStorage
 
-from server_context import BoxContext
+from config import CONFIG
+from server_context import BoxContext, get_token_manager
 from tools.box_tools_generic import (
     box_authorize_app_tool,
     box_who_am_i,
@@ -101,6 +105,39 @@ async def test_box_authorize_app_tool_success(mock_authorize_app):
     assert result == "Box application authorized successfully"
 
 
+@pytest.mark.asyncio
+async def test_box_authorize_app_tool_switches_the_token_in_use(tmp_path):
+    """After a new authorization, calls use the newly authorized user's token"""
+    storage_path = str(tmp_path / ".auth.oauth")
+
+    def store(access_token):
+        # Like the toolkit, every authorization writes through its own storage
+        FileWithInMemoryCacheTokenStorage(storage_path).store(
+            AccessToken(access_token=access_token, refresh_token="r", expires_in=3600)
+        )
+
+    store("user-a")
+    auth = BoxOAuth(
+        OAuthConfig(
+            client_id="reauthorize-test",
+            client_secret="secret",
+            token_storage=FileWithInMemoryCacheTokenStorage(storage_path),
+        )
+    )
+    config = replace(CONFIG, box_token_cache_path=str(tmp_path / "cache.json"))
+    manager = get_token_manager("oauth", auth, config)
+    assert manager.retrieve_token().access_token == "user-a"
+
+    with patch(
+        "tools.box_tools_generic.authorize_app",
+        side_effect=lambda: store("user-b") or True,
+    ):
+        assert await box_authorize_app_tool() == (
+            "Box application authorized successfully"
+        )
+    assert manager.retrieve_token().access_token == "user-b"
+
+
 @pytest.mark.asyncio
 @patch("tools.box_tools_generic.authorize_app")
 async def test_box_authorize_app_tool_failure(mock_authorize_app):
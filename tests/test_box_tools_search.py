@@ -2,11 +2,16 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from box_fields import FOLDER_SEARCH_FIELDS as DEFAULT_FOLDER_FIELDS
+from box_fields import SEARCH_FIELDS as DEFAULT_SEARCH_FIELDS
 from tools.box_tools_search import (
     box_search_folder_by_name_tool,
     box_search_tool,
 )
 
+SEARCH_FIELDS = list(DEFAULT_SEARCH_FIELDS)
+FOLDER_SEARCH_FIELDS = list(DEFAULT_FOLDER_FIELDS)
+
 
 @pytest.fixture
 def mock_ctx():
@@ -76,6 +81,7 @@ async def test_box_search_tool_basic(
         None,  # file_extensions
         [],  # content_types (empty because where_to_look_for_query is None)
         None,  # ancestor_folder_ids
+        fields=SEARCH_FIELDS,
     )
 
     assert isinstance(result, list)
@@ -101,7 +107,12 @@ async def test_box_search_tool_with_file_extensions(
     )
 
     mock_search.assert_called_once_with(
-        mock_box_client, "test document", ["pdf", "docx"], [], None
+        mock_box_client,
+        "test document",
+        ["pdf", "docx"],
+        [],
+        None,
+        fields=SEARCH_FIELDS,
     )
     assert len(result) == 3
 
@@ -148,7 +159,12 @@ async def test_box_search_tool_with_ancestor_folders(
     )
 
     mock_search.assert_called_once_with(
-        mock_box_client, "test document", None, [], ["folder_123", "folder_456"]
+        mock_box_client,
+        "test document",
+        None,
+        [],
+        ["folder_123", "folder_456"],
+        fields=SEARCH_FIELDS,
     )
     assert len(result) == 3
 
@@ -179,6 +195,7 @@ async def test_box_search_tool_all_parameters(
             3
         ],  # content_types (converted from where_to_look_for_query)
         ["folder_123"],
+        fields=SEARCH_FIELDS,
     )
     assert len(result) == 3
 
@@ -202,7 +219,9 @@ async def test_box_search_folder_by_name_tool(
     )
 
     mock_get_client.assert_called_once_with(mock_ctx)
-    mock_locate_folder.assert_called_once_with(mock_box_client, "test_folder")
+    mock_locate_folder.assert_called_once_with(
+        mock_box_client, "test_folder", fields=FOLDER_SEARCH_FIELDS
+    )
 
     assert isinstance(result, list)
     assert len(result) == 2
@@ -243,7 +262,9 @@ async def test_box_search_folder_by_name_tool_empty_results(
         ctx=mock_ctx, folder_name="nonexistent_folder"
     )
 
-    mock_locate_folder.assert_called_once_with(mock_box_client, "nonexistent_folder")
+    mock_locate_folder.assert_called_once_with(
+        mock_box_client, "nonexistent_folder", fields=FOLDER_SEARCH_FIELDS
+    )
     assert isinstance(result, list)
     assert len(result) == 0
 
@@ -312,7 +333,9 @@ async def test_box_search_tool_empty_string_query(
 
     result = await box_search_tool(ctx=mock_ctx, query="")
 
-    mock_search.assert_called_once_with(mock_box_client, "", None, [], None)
+    mock_search.assert_called_once_with(
+        mock_box_client, "", None, [], None, fields=SEARCH_FIELDS
+    )
     assert len(result) == 3
 
 
@@ -329,7 +352,9 @@ async def test_box_search_tool_special_characters_query(
     special_query = "test@file#123!.pdf"
     result = await box_search_tool(ctx=mock_ctx, query=special_query)
 
-    mock_search.assert_called_once_with(mock_box_client, special_query, None, [], None)
+    mock_search.assert_called_once_with(
+        mock_box_client, special_query, None, [], None, fields=SEARCH_FIELDS
+    )
     assert len(result) == 3
 
 
@@ -352,5 +377,71 @@ async def test_box_search_folder_by_name_tool_special_characters(
         ctx=mock_ctx, folder_name=special_folder_name
     )
 
-    mock_locate_folder.assert_called_once_with(mock_box_client, special_folder_name)
+    mock_locate_folder.assert_called_once_with(
+        mock_box_client, special_folder_name, fields=FOLDER_SEARCH_FIELDS
+    )
     assert len(result) == 2
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+@patch("tools.box_tools_search.box_search")
+async def test_box_search_tool_default_projection(
+    mock_search, mock_get_client, mock_ctx, sample_search_results
+):
+    """Fields outside the compact default projection are dropped"""
+    mock_search.return_value = sample_search_results
+
+    result = await box_search_tool(ctx=mock_ctx, query="test")
+
+    assert result[0] == {
+        "id": "123450",
+        "type": "file",
+        "name": "test_file_0.pdf",
+        "size": 1024,
+        "description": "Test file description",
+    }
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+@patch("tools.box_tools_search.box_search")
+async def test_box_search_tool_selected_fields(
+    mock_search, mock_get_client, mock_ctx, sample_search_results
+):
+    """Selected fields are requested from Box and trim the results"""
+    mock_search.return_value = sample_search_results
+
+    result = await box_search_tool(
+        ctx=mock_ctx, query="test", fields=["created_at", "name", "name", " "]
+    )
+
+    assert mock_search.call_args.kwargs["fields"] == [
+        "id",
+        "type",
+        "created_at",
+        "name",
+    ]
+    assert result[0] == {
+        "id": "123450",
+        "type": "file",
+        "created_at": "2023-01-01T00:00:00Z",
+        "name": "test_file_0.pdf",
+    }
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+@patch("tools.box_tools_search.box_locate_folder_by_name")
+async def test_box_search_folder_by_name_tool_selected_fields(
+    mock_locate_folder, mock_get_client, mock_ctx, sample_folder_results
+):
+    """Folder searches accept a field selection too"""
+    mock_locate_folder.return_value = sample_folder_results
+
+    result = await box_search_folder_by_name_tool(
+        ctx=mock_ctx, folder_name="test", fields=["item_count"]
+    )
+
+    assert mock_locate_folder.call_args.kwargs["fields"] == ["id", "type", "item_count"]
+    assert result[1] == {"id": "folder_123451", "type": "folder", "item_count": 11}
@@ -0,0 +1,330 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from box_sdk_gen import BoxAPIError, BoxClient, BoxDeveloperTokenAuth
+from box_sdk_gen.box.errors import ResponseInfo
+from box_sdk_gen.networking.base_urls import BaseUrls
+from box_sdk_gen.networking.network import NetworkSession
+from box_sdk_gen.networking.retries import BoxRetryStrategy
+from box_sdk_gen.schemas.upload_part import UploadPart
+
+import box_upload
+from box_upload import ChunkedUpload, HashingReader, upload_file_from_path
+
+PART_SIZE = 1024
+
+
+class FakeChunkedUploads:
+    """In-memory stand-in for the Box upload session endpoints."""
+
+    def __init__(self, fail_offsets=()):
+        self.sessions = {}
+        self.sessions_created = 0
+        self.fail_offsets = set(fail_offsets)
+        self.uploads = []
+        self.concurrent = 0
+        self.peak_concurrent = 0
+        self.lock = threading.Lock()
+
+    def create_file_upload_session(self, folder_id, file_size, file_name):
+        self.sessions_created += 1
+        session_id = f"session-{self.sessions_created}"
+        self.sessions[session_id] = {"parts": {}, "file_size": file_size}
+        return SimpleNamespace(id=session_id, part_size=PART_SIZE)
+
+    def get_file_upload_session_by_id(self, session_id):
+        if session_id not in self.sessions:
+            raise BoxAPIError(
+                request_info=MagicMock(), response_info=MagicMock(), message="404"
+            )
+        return SimpleNamespace(id=session_id, part_size=PART_SIZE)
+
+    def get_file_upload_session_parts(self, session_id, offset=0, limit=1000):
+        parts = sorted(
+            self.sessions[session_id]["parts"].values(), key=lambda p: p.offset
+        )
+        return SimpleNamespace(
+            entries=parts[offset : offset + limit], total_count=len(parts)
+        )
+
+    def upload_file_part(self, session_id, request_body, digest, content_range):
+        data = request_body.read()
+        offset = int(content_range.split(" ")[1].split("-")[0])
+        with self.lock:
+            self.concurrent += 1
+            self.peak_concurrent = max(self.peak_concurrent, self.concurrent)
+        try:
+            time.sleep(0.01)
+            if offset in self.fail_offsets:
+                self.fail_offsets.discard(offset)
+                raise ConnectionError(f"part at {offset} failed")
+            assert (
+                digest
+                == "sha=" + base64.b64encode(hashlib.sha1(data).digest()).decode()
+            )
+            part = UploadPart(
+                part_id=f"p{offset}",
+                offset=offset,
+                size=len(data),
+                sha_1=hashlib.sha1(data).hexdigest(),
+            )
+            with self.lock:
+                self.sessions[session_id]["parts"][offset] = part
+                self.uploads.append(offset)
+            return SimpleNamespace(part=part)
+        finally:
+            with self.lock:
+                self.concurrent -= 1
+
+    def create_file_upload_session_commit(self, session_id, parts, digest):
+        self.committed = (session_id, [p.offset for p in parts], digest)
+        del self.sessions[session_id]
+        entry = SimpleNamespace(id="file-1", name="big.bin", type="file")
+        return SimpleNamespace(entries=[entry])
+
+
+@pytest.fixture
+def big_file(tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(os.urandom(PART_SIZE * 10 + 100))
+    return path
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "sessions.json")
+
+
+def make_client(fake):
+    client = MagicMock()
+    client.chunked_uploads = fake
+    return client
+
+
+def expected_digest(path):
+    return "sha=" + base64.b64encode(hashlib.sha1(path.read_bytes()).digest()).decode()
+
+
+def test_chunked_upload_commits_all_parts(big_file, state_path):
+    fake = FakeChunkedUploads()
+    upload = ChunkedUpload(
+        make_client(fake), str(big_file), "big.bin", "0", 3, state_path
+    )
+    result = upload.run()
+
+    assert result == {"id": "file-1", "name": "big.bin", "type": "file"}
+    session_id, offsets, digest = fake.committed
+    assert offsets == [i * PART_SIZE for i in range(11)]
+    assert digest == expected_digest(big_file)
+    assert 1 < fake.peak_concurrent <= 3
+    assert upload.parts_uploaded == 11
+
+
+def test_failed_upload_resumes_from_uploaded_parts(big_file, state_path):
+    fake = FakeChunkedUploads(fail_offsets=[PART_SIZE * 5])
+    client = make_client(fake)
+
+    with pytest.raises(ConnectionError):
+        ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path).run()
+    uploaded_before = set(fake.uploads)
+    assert PART_SIZE * 5 not in uploaded_before
+
+    upload = ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path)
+    upload.run()
+    assert upload.parts_resumed == len(uploaded_before)
+    assert upload.parts_uploaded == 11 - len(uploaded_before)
+    assert fake.committed[2] == expected_digest(big_file)
+    assert len(fake.sessions) == 0
+
+
+def test_modified_file_starts_a_new_session(big_file, state_path):
+    fake = FakeChunkedUploads(fail_offsets=[PART_SIZE * 2])
+    client = make_client(fake)
+    with pytest.raises(ConnectionError):
+        ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path).run()
+
+    big_file.write_bytes(os.urandom(PART_SIZE * 10 + 100))
+    upload = ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path)
+    upload.run()
+    assert upload.parts_resumed == 0
+    assert fake.committed[0] == "session-2"
+
+
+def test_expired_session_starts_a_new_session(big_file, state_path):
+    fake = FakeChunkedUploads(fail_offsets=[0])
+    client = make_client(fake)
+    with pytest.raises(ConnectionError):
+        ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path).run()
+    fake.sessions.clear()
+
+    ChunkedUpload(client, str(big_file), "big.bin", "0", 1, state_path).run()
+    assert fake.committed[0] == "session-2"
+
+
+def test_hashing_reader_reads_with_a_fixed_buffer(tmp_path):
+    data = os.urandom(10_000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    with open(path, "rb") as file:
+        reader = HashingReader(file, buffer_size=4096)
+        assert len(reader.read()) == 4096
+        # A retry rewinds the stream and restarts the digest
+        reader.seek(0)
+        chunks = iter(lambda: reader.read(8192), b"")
+        assert max(len(c) for c in chunks) == 4096
+        assert reader.hexdigest() == hashlib.sha1(data).hexdigest()
+        reader.seek(10)
+        reader.read()
+        assert reader.hexdigest() is None
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Box upload and delete endpoints, reporting the SHA-1 of what they got."""
+
+    protocol_version = "HTTP/1.1"
+    corrupt = False
+    fail_first = False
+    received = []
+    deleted = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if UploadHandler.fail_first:
+            UploadHandler.fail_first = False
+            self.reply(500, {"type": "error", "status": 500})
+            return
+        form = BytesParser(policy=default).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        content = next(
+            part.get_payload(decode=True)
+            for part in form.iter_parts()
+            if part.get_param("name", header="content-disposition") == "file"
+        )
+        UploadHandler.received.append(content)
+        sha1 = "0" * 40 if UploadHandler.corrupt else hashlib.sha1(content).hexdigest()
+        entry = {"id": "1", "type": "file", "name": "a.bin", "sha1": sha1}
+        self.reply(201, {"total_count": 1, "entries": [entry]})
+
+    def do_DELETE(self):
+        UploadHandler.deleted.append(self.path)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upload_client():
+    """A real Box client sending its requests to ``UploadHandler``."""
+    UploadHandler.corrupt = False
+    UploadHandler.fail_first = False
+    UploadHandler.received = []
+    UploadHandler.deleted = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    yield BoxClient(
+        auth=BoxDeveloperTokenAuth(token="token"),
+        network_session=NetworkSession(
+            base_urls=BaseUrls(base_url=url, upload_url=f"{url}/api"),
+            retry_strategy=BoxRetryStrategy(max_attempts=2, retry_base_interval=0),
+        ),
+    )
+    server.shutdown()
+    server.server_close()
+
+
+def test_small_file_uses_a_single_request(tmp_path, state_path, upload_client):
+    path = tmp_path / "small.txt"
+    path.write_bytes(b"\xff not utf-8")
+
+    result = upload_file_from_path(
+        upload_client, str(path), "small.txt", "0", state_path=state_path
+    )
+    assert result["id"] == "1"
+    assert UploadHandler.received == [b"\xff not utf-8"]
+
+
+def test_small_upload_is_checked_against_the_box_sha1(tmp_path, upload_client):
+    data = os.urandom(5000)
+    path = tmp_path / "a.bin"
+    path.write_bytes(data)
+
+    assert upload_file_from_path(upload_client, str(path), "a.bin")["id"] == "1"
+    assert UploadHandler.received == [data]
+
+    UploadHandler.corrupt = True
+    with pytest.raises(IOError, match="SHA-1"):
+        upload_file_from_path(upload_client, str(path), "a.bin")
+    assert UploadHandler.deleted == ["/2.0/files/1"]
+
+
+def test_small_upload_rewinds_its_stream_for_sdk_retries(tmp_path, upload_client):
+    data = os.urandom(5000)
+    path = tmp_path / "a.bin"
+    path.write_bytes(data)
+    UploadHandler.fail_first = True
+
+    assert upload_file_from_path(upload_client, str(path), "a.bin")["id"] == "1"
+    assert UploadHandler.received == [data]
+    assert UploadHandler.deleted == []
+
+
+def test_small_upload_returns_an_identical_existing_file(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"hello")
+    client = MagicMock()
+    client.uploads.upload_file.side_effect = BoxAPIError(
+        request_info=MagicMock(),
+        response_info=ResponseInfo(
+            409,
+            {},
+            code="item_name_in_use",
+            context_info={
+                "conflicts": {
+                    "type": "file",
+                    "id": "7",
+                    "name": "a.bin",
+                    "sha1": hashlib.sha1(b"hello").hexdigest(),
+                }
+            },
+        ),
+        message="409 error",
+    )
+    result = upload_file_from_path(client, str(path), "a.bin")
+    assert result == {"id": "7", "name": "a.bin", "type": "file", "existing": True}
+
+
+def test_threshold_selects_chunked_upload(big_file, state_path, monkeypatch):
+    monkeypatch.setattr(box_upload, "CHUNKED_UPLOAD_MIN_SIZE", PART_SIZE)
+    fake = FakeChunkedUploads()
+    result = upload_file_from_path(
+        make_client(fake),
+        str(big_file),
+        "big.bin",
+        chunked_threshold=PART_SIZE,
+        state_path=state_path,
+    )
+    assert result["id"] == "file-1"
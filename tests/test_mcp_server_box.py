@@ -0,0 +1,81 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+
+import mcp_server_box
+from mcp_server_box import (
+    WORKER_ARGV_ENV,
+    build_server,
+    create_worker_app,
+    main,
+    parse_arguments,
+)
+from metrics import TOOL_CALLS
+
+
+def test_parse_arguments_workers_default():
+    args = parse_arguments([])
+    assert args.workers == 1
+
+
+@patch("mcp_server_box.run_workers")
+def test_main_rejects_workers_without_streamable_http(mock_run_workers):
+    with patch("sys.argv", ["mcp_server_box.py", "--transport=sse", "--workers=2"]):
+        assert main() == 1
+    mock_run_workers.assert_not_called()
+
+
+@patch("mcp_server_box.run_workers")
+def test_main_starts_workers(mock_run_workers):
+    argv = ["--transport=streamable-http", "--workers=4"]
+    with patch("sys.argv", ["mcp_server_box.py", *argv]):
+        assert main() == 0
+    (args,) = mock_run_workers.call_args.args
+    assert args.workers == 4
+
+
+def test_create_worker_app_uses_parent_arguments(monkeypatch):
+    argv = ["--transport=streamable-http", "--no-mcp-server-auth", "--port=9000"]
+    monkeypatch.setenv(WORKER_ARGV_ENV, json.dumps(argv))
+
+    with patch.object(
+        mcp_server_box, "build_server", wraps=mcp_server_box.build_server
+    ) as mock_build_server:
+        app = create_worker_app()
+
+    assert isinstance(app, Starlette)
+    (args,) = mock_build_server.call_args.args
+    assert args.port == 9000
+    assert args.no_mcp_server_auth is True
+
+
+@pytest.mark.asyncio
+async def test_server_info_tool_is_instrumented():
+    mcp = build_server(parse_arguments(["--tools", "box_who_am_i"]))
+    calls = TOOL_CALLS.value(tool="mcp_server_info", outcome="ok")
+    await mcp.call_tool("mcp_server_info", {})
+    assert TOOL_CALLS.value(tool="mcp_server_info", outcome="ok") == calls + 1
+
+
+def test_tool_cache_arguments():
+    args = parse_arguments(["--tool-cache", "--tool-cache-max-entries", "8"])
+    assert args.tool_cache is True
+    assert args.tool_cache_max_entries == 8
+    assert parse_arguments([]).tool_cache is False
+
+
+def test_tool_selection_arguments(capsys):
+    args = parse_arguments(
+        ["--tools", "file_tools,box_who_am_i", "--tools", "search_tools"]
+    )
+    assert args.tools == ["file_tools", "box_who_am_i", "search_tools"]
+    assert parse_arguments([]).tools is None
+    assert parse_arguments(["--exclude-tools", "ai_tools"]).exclude_tools == [
+        "ai_tools"
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--tools", "unknown_tools"])
+    assert "Unknown tool or tool group: unknown_tools" in capsys.readouterr().err
@@ -0,0 +1,248 @@
+import asyncio
+
+import pytest
+from box_sdk_gen.networking.box_network_client import APIRequest
+from box_sdk_gen.networking.fetch_options import FetchOptions
+from mcp.server.fastmcp import FastMCP
+from starlette.testclient import TestClient
+
+import metrics
+from box_http import MeteredHTTPAdapter, PooledBoxNetworkClient
+from metrics import (
+    BOX_API_REQUESTS,
+    BOX_API_RETRIES,
+    REGISTRY,
+    TOOL_CALLS,
+    TOOL_ERRORS,
+    TOOL_IN_FLIGHT,
+    TOOL_LATENCY,
+    Counter,
+    Histogram,
+    Metric,
+    Registry,
+    endpoint_label,
+    render_metrics,
+)
+from tool_registry import register_all_tools
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+def test_counter_renders_labels_sorted_by_value():
+    registry = Registry()
+    counter = registry.register(Counter("calls_total", "Calls.", ["tool"]))
+    counter.inc(tool="b")
+    counter.inc(2, tool="a")
+    assert registry.render() == (
+        "# HELP calls_total Calls.\n"
+        "# TYPE calls_total counter\n"
+        'calls_total{tool="a"} 2\n'
+        'calls_total{tool="b"} 1\n'
+    )
+
+
+def test_counter_rejects_wrong_labels():
+    counter = Counter("calls_total", "Calls.", ["tool"])
+    with pytest.raises(ValueError):
+        counter.inc(name="x")
+
+
+def test_label_values_are_escaped():
+    counter = Counter("calls_total", "Calls.", ["tool"])
+    counter.inc(tool='a"b\\c')
+    assert 'calls_total{tool="a\\"b\\\\c"} 1' in counter.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ["tool"], buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value, tool="t")
+    lines = histogram.render().splitlines()[2:]
+    assert lines == [
+        'latency_seconds_bucket{tool="t",le="0.1"} 1',
+        'latency_seconds_bucket{tool="t",le="1"} 3',
+        'latency_seconds_bucket{tool="t",le="+Inf"} 4',
+        'latency_seconds_sum{tool="t"} 6.05',
+        'latency_seconds_count{tool="t"} 4',
+    ]
+
+
+def test_metric_kinds_must_render_and_clear_their_samples():
+    class Incomplete(Metric):
+        def samples(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Lacks clear().")
+
+
+def test_duplicate_registration_rejected():
+    registry = Registry()
+    registry.register(Counter("calls_total", "Calls."))
+    with pytest.raises(ValueError):
+        registry.register(Counter("calls_total", "Calls."))
+
+
+def test_failing_collector_does_not_break_render():
+    registry = Registry()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    registry.add_collector(broken)
+    registry.register(Counter("calls_total", "Calls."))
+    assert "# TYPE calls_total counter" in registry.render()
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/2.0/folders/12345/items", "/2.0/folders/{id}/items"),
+        ("/2.0/files/0-1-2", "/2.0/files/{id}"),
+        (
+            "/2.0/files/upload_sessions/F971964745A5CD0C001BBE4E58196BFD/commit",
+            "/2.0/files/upload_sessions/{id}/commit",
+        ),
+        ("/2.0/users/me", "/2.0/users/me"),
+        (
+            "/2.0/metadata_templates/enterprise/invoice/schema",
+            "/2.0/metadata_templates/enterprise/invoice/schema",
+        ),
+        ("/2.0/search?query=123", "/2.0/search"),
+    ],
+)
+def test_endpoint_label(path, expected):
+    assert endpoint_label(path) == expected
+
+
+def make_server(*tools) -> FastMCP:
+    mcp = FastMCP("test")
+
+    def registrar(mcp):
+        for tool in tools:
+            mcp.tool()(tool)
+
+    register_all_tools(mcp, [registrar])
+    return mcp
+
+
+@pytest.mark.asyncio
+async def test_register_all_tools_instruments_tools():
+    release = asyncio.Event()
+
+    async def slow_tool(item_id: str) -> dict:
+        await release.wait()
+        return {"id": item_id}
+
+    async def error_tool() -> dict:
+        return {"error": "not found"}
+
+    async def message_tool() -> str:
+        return "Error downloading file: 404 not found"
+
+    def raising_tool() -> str:
+        raise KeyError("missing")
+
+    mcp = make_server(slow_tool, error_tool, message_tool, raising_tool)
+
+    call = asyncio.create_task(mcp.call_tool("slow_tool", {"item_id": "1"}))
+    await asyncio.sleep(0)
+    assert TOOL_IN_FLIGHT.value(tool="slow_tool") == 1
+    release.set()
+    await call
+    assert TOOL_IN_FLIGHT.value(tool="slow_tool") == 0
+    assert TOOL_CALLS.value(tool="slow_tool", outcome="ok") == 1
+    assert TOOL_LATENCY.count(tool="slow_tool") == 1
+
+    await mcp.call_tool("error_tool", {})
+    assert TOOL_CALLS.value(tool="error_tool", outcome="error") == 1
+    assert TOOL_ERRORS.value(tool="error_tool", error_type="error_response") == 1
+
+    await mcp.call_tool("message_tool", {})
+    assert TOOL_ERRORS.value(tool="message_tool", error_type="error_message") == 1
+
+    with pytest.raises(Exception):
+        await mcp.call_tool("raising_tool", {})
+    assert TOOL_ERRORS.value(tool="raising_tool", error_type="KeyError") == 1
+    assert TOOL_IN_FLIGHT.value(tool="raising_tool") == 0
+
+
+def test_instrumentation_keeps_the_tool_schema():
+    async def tool(folder_id: str, limit: int = 10) -> dict:
+        """List a folder."""
+        return {}
+
+    plain = FastMCP("plain")
+    plain.tool()(tool)
+    instrumented = make_server(tool)
+    expected = plain._tool_manager.get_tool("tool")
+    actual = instrumented._tool_manager.get_tool("tool")
+    assert actual.parameters == expected.parameters
+    assert actual.description == "List a folder."
+
+    # Instrumenting again does not wrap twice
+    fn = actual.fn
+    metrics.instrument_tools(instrumented)
+    assert actual.fn is fn
+
+
+def test_metered_adapter_records_box_requests():
+    client = PooledBoxNetworkClient()
+    assert isinstance(client._adapter, MeteredHTTPAdapter)
+    with pytest.raises(Exception):
+        client.requests_session.get("http://127.0.0.1:1/2.0/files/42", timeout=1)
+    assert (
+        BOX_API_REQUESTS.value(method="GET", endpoint="/2.0/files/{id}", status="error")
+        == 1
+    )
+    client.close()
+
+
+def test_sdk_retries_are_counted(monkeypatch):
+    client = PooledBoxNetworkClient()
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient._make_request",
+        lambda self, request: None,
+    )
+
+    def fetch(self, options):
+        for _ in range(3):
+            self._make_request(
+                APIRequest(
+                    method="GET",
+                    url="https://api.box.com/2.0/users/me",
+                    headers={},
+                    params={},
+                    data=None,
+                )
+            )
+
+    monkeypatch.setattr(
+        "box_sdk_gen.networking.box_network_client.BoxNetworkClient.fetch", fetch
+    )
+    options = FetchOptions("https://api.box.com/2.0/users/me", "GET")
+    client.fetch(options)
+    client.fetch(options)
+    assert BOX_API_RETRIES.value(method="GET", endpoint="/2.0/users/me") == 4
+    client.close()
+
+
+def test_metrics_endpoint_serves_exposition_format():
+    mcp = FastMCP("test")
+    metrics.add_metrics_endpoint(mcp)
+    TOOL_CALLS.inc(tool="box_who_am_i", outcome="ok")
+
+    with TestClient(mcp.streamable_http_app()) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'box_mcp_tool_calls_total{tool="box_who_am_i",outcome="ok"} 1' in (
+        response.text
+    )
+    assert response.text == render_metrics()
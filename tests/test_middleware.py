@@ -0,0 +1,131 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from middleware import (
+    OAUTH_DISCOVERY_PATH,
+    AuthMiddleware,
+    load_auth_tokens,
+    reload_auth_tokens,
+)
+
+
+async def homepage(request):
+    return PlainTextResponse("ok")
+
+
+async def discovery(request):
+    return PlainTextResponse("discovery")
+
+
+def build_app(tokens=None):
+    app = Starlette(
+        routes=[
+            Route("/", homepage),
+            Route(OAUTH_DISCOVERY_PATH, discovery),
+        ]
+    )
+    app.add_middleware(AuthMiddleware, tokens=tokens)
+    return app
+
+
+@pytest.fixture
+def client():
+    return TestClient(build_app(tokens=["token-a", "token-b"]))
+
+
+def test_load_auth_tokens_supports_multiple_tokens(monkeypatch):
+    monkeypatch.setenv("BOX_MCP_SERVER_AUTH_TOKEN", "token-a, token-b,")
+    assert load_auth_tokens() == ["token-a", "token-b"]
+
+
+def test_valid_tokens_are_accepted(client):
+    for token in ("token-a", "token-b"):
+        response = client.get("/", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.text == "ok"
+
+
+@pytest.mark.parametrize(
+    "headers, error",
+    [
+        ({}, "Missing authorization header"),
+        ({"Authorization": "Basic token-a"}, "Invalid authorization header"),
+        ({"Authorization": "Bearer wrong"}, "Invalid token"),
+        ({"Authorization": "Bearer token-a-suffix"}, "Invalid token"),
+    ],
+)
+def test_invalid_requests_are_rejected(client, headers, error):
+    response = client.get("/", headers=headers)
+    assert response.status_code == 401
+    assert response.json() == {"error": error}
+
+
+def test_oauth_discovery_does_not_require_auth(client):
+    response = client.get(OAUTH_DISCOVERY_PATH)
+    assert response.status_code == 200
+
+
+def test_no_configured_token_rejects_everything(monkeypatch):
+    monkeypatch.delenv("BOX_MCP_SERVER_AUTH_TOKEN", raising=False)
+    client = TestClient(build_app())
+    response = client.get("/", headers={"Authorization": "Bearer anything"})
+    assert response.status_code == 401
+    assert response.json() == {"error": "No authentication token configured"}
+
+
+def test_token_is_read_once_until_reloaded(monkeypatch):
+    monkeypatch.setenv("BOX_MCP_SERVER_AUTH_TOKEN", "old-token")
+    client = TestClient(build_app())
+    headers_old = {"Authorization": "Bearer old-token"}
+    headers_new = {"Authorization": "Bearer new-token"}
+    assert client.get("/", headers=headers_old).status_code == 200
+
+    monkeypatch.setenv("BOX_MCP_SERVER_AUTH_TOKEN", "new-token")
+    assert client.get("/", headers=headers_new).status_code == 401
+
+    reload_auth_tokens()
+    assert client.get("/", headers=headers_new).status_code == 200
+    assert client.get("/", headers=headers_old).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_not_buffered():
+    async def chunks():
+        for chunk in (b"first", b"second", b"third"):
+            yield chunk
+
+    app = StreamingResponse(chunks())
+    middleware = AuthMiddleware(app, tokens=["token-a"])
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", b"Bearer token-a")],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+    assert bodies[:3] == [b"first", b"second", b"third"]
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_pass_through():
+    called = []
+
+    async def app(scope, receive, send):
+        called.append(scope["type"])
+
+    middleware = AuthMiddleware(app, tokens=[])
+    await middleware({"type": "lifespan"}, None, None)
+    assert called == ["lifespan"]
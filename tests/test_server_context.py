@@ -1,10 +1,30 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from dataclasses import replace
 from typing import AsyncIterator
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-
-from server_context import BoxContext, box_lifespan_oauth
+from box_sdk_gen import AccessToken, BoxClient
+from box_sdk_gen.box.token_storage import (
+    FileWithInMemoryCacheTokenStorage,
+    InMemoryTokenStorage,
+)
+
+from box_http import PooledBoxNetworkClient, shared_network_client
+from config import CONFIG
+from server_context import (
+    BoxContext,
+    BoxTokenManager,
+    box_lifespan_ccg,
+    box_lifespan_oauth,
+    get_token_manager,
+    token_fingerprint,
+)
 
 
 class TestBoxContext:
@@ -265,3 +285,237 @@ class TestBoxContextIntegration:
 
             assert context.client != original_client
             assert context.client == new_mock_client
+
+
+class TestBoxLifespanHttpPool:
+    """Test the pooled HTTP transport owned by the Box lifespan."""
+
+    @pytest.mark.asyncio
+    @patch("server_context.get_oauth_client")
+    async def test_lifespan_injects_pooled_network_client(self, mock_get_oauth_client):
+        """The Box client sends its requests through the pooled transport."""
+        mock_client = MagicMock()
+        mock_get_oauth_client.return_value = mock_client
+
+        async with box_lifespan_oauth(MagicMock()) as context:
+            assert isinstance(context.http_client, PooledBoxNetworkClient)
+            assert mock_client.network_session.network_client is context.http_client
+
+    @pytest.mark.asyncio
+    @patch("server_context.get_ccg_client")
+    async def test_lifespan_closes_pool_on_exit(self, mock_get_ccg_client):
+        """The pool is closed in the lifespan cleanup."""
+        mock_get_ccg_client.return_value = MagicMock()
+
+        async with box_lifespan_ccg(MagicMock()) as context:
+            http_client = context.http_client
+            assert not http_client.closed
+
+        assert http_client.closed
+
+    @pytest.mark.asyncio
+    @patch("server_context.get_oauth_client")
+    async def test_lifespan_closes_pool_on_error(self, mock_get_oauth_client):
+        """The pool is closed when the client cannot be created."""
+        mock_get_oauth_client.side_effect = Exception("OAuth failed")
+
+        with shared_network_client() as held:
+            with pytest.raises(Exception, match="OAuth failed"):
+                async with box_lifespan_oauth(MagicMock()):
+                    pass
+            assert not held.closed
+        assert held.closed
+
+    @pytest.mark.asyncio
+    @patch("server_context.get_oauth_client")
+    async def test_lifespan_uses_config(self, mock_get_oauth_client):
+        """Pool settings come from the server configuration."""
+        mock_get_oauth_client.return_value = MagicMock()
+        config = replace(CONFIG, http_pool_maxsize=5, http_keep_alive=False)
+
+        async with box_lifespan_oauth(MagicMock(), config=config) as context:
+            stats = context.pool_stats()
+            assert stats["pool_maxsize"] == 5
+            assert stats["keep_alive"] is False
+
+    def test_pool_stats_without_http_client(self):
+        """A context without transport reports no pool statistics."""
+        assert BoxContext().pool_stats() == {}
+
+
+class FakeAuth:
+    """Authentication stand-in that counts token requests.
+
+    Like the SDK auths, it returns its stored token, fetching one when there
+    is none, and stores every refreshed token.
+    """
+
+    def __init__(self, expires_in=3600, delay=0.0, token_storage=None):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.refresh_calls = 0
+        self.token_storage = token_storage or InMemoryTokenStorage()
+        self.config = MagicMock(client_id="client-id")
+        self._lock = threading.Lock()
+
+    def _new_token(self):
+        with self._lock:
+            self.refresh_calls += 1
+            n = self.refresh_calls
+        time.sleep(self.delay)
+        token = AccessToken(
+            access_token=f"access-{n}",
+            refresh_token=f"refresh-{n}",
+            expires_in=self.expires_in,
+        )
+        self.token_storage.store(token)
+        return token
+
+    def retrieve_token(self, *, network_session=None):
+        return self.token_storage.get() or self._new_token()
+
+    def refresh_token(self, *, network_session=None):
+        return self._new_token()
+
+
+def file_storage(tmp_path):
+    """The toolkit's token storage, as shared by the worker processes."""
+    return FileWithInMemoryCacheTokenStorage(str(tmp_path / ".auth.oauth"))
+
+
+class TestBoxTokenManager:
+    """Test the single-flight token refresh coordinator."""
+
+    def test_retrieve_token_caches_token(self, tmp_path):
+        auth = FakeAuth()
+        manager = BoxTokenManager(auth, "oauth:test", str(tmp_path / "cache.json"))
+
+        first = manager.retrieve_token()
+        second = manager.retrieve_token()
+
+        assert first is second
+        assert auth.refresh_calls == 1
+        assert manager.retrieve_authorization_header() == "Bearer access-1"
+
+    def test_concurrent_refreshes_are_coalesced(self, tmp_path):
+        auth = FakeAuth(delay=0.1)
+        manager = BoxTokenManager(auth, "oauth:test", str(tmp_path / "cache.json"))
+        manager.retrieve_token()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = list(
+                pool.map(lambda _: manager.refresh_token().access_token, range(8))
+            )
+
+        # One initial retrieval plus a single shared refresh
+        assert auth.refresh_calls == 2
+        assert set(tokens) == {"access-2"}
+        assert manager.refresh_count == 1
+
+    def test_token_is_refreshed_before_expiry(self, tmp_path):
+        auth = FakeAuth(expires_in=60)
+        manager = BoxTokenManager(
+            auth, "oauth:test", str(tmp_path / "cache.json"), refresh_margin=30
+        )
+        assert manager.retrieve_token().access_token == "access-1"
+
+        # Inside the refresh margin, but before the token actually expires
+        with patch("server_context.time.time", return_value=time.time() + 45):
+            token = manager.retrieve_token()
+
+        assert token.access_token == "access-2"
+        assert manager.refresh_count == 1
+
+    def test_token_expiry_is_persisted_and_reloaded(self, tmp_path):
+        cache_path = str(tmp_path / "cache.json")
+        auth = FakeAuth(token_storage=file_storage(tmp_path))
+        manager = BoxTokenManager(auth, "ccg:client-id:user", cache_path)
+        manager.retrieve_token()
+        manager.refresh_token()
+
+        restarted_auth = FakeAuth(token_storage=file_storage(tmp_path))
+        restarted = BoxTokenManager(restarted_auth, "ccg:client-id:user", cache_path)
+
+        assert restarted.retrieve_token().access_token == "access-2"
+        assert restarted_auth.refresh_calls == 0
+        assert restarted.expires_at == pytest.approx(manager.expires_at)
+        assert oct(os.stat(cache_path).st_mode & 0o777) == "0o600"
+        # The cache identifies the token without holding it
+        with open(cache_path) as f:
+            assert "access-2" not in f.read()
+
+    def test_expired_cached_token_is_refreshed(self, tmp_path):
+        cache_path = str(tmp_path / "cache.json")
+        old = AccessToken(access_token="old", refresh_token="r")
+        storage = file_storage(tmp_path)
+        storage.store(old)
+        with open(cache_path, "w") as f:
+            json.dump(
+                {
+                    "oauth:test": {
+                        "token_sha256": token_fingerprint(old),
+                        "expires_at": time.time() - 10,
+                    }
+                },
+                f,
+            )
+        auth = FakeAuth(token_storage=storage)
+        manager = BoxTokenManager(auth, "oauth:test", cache_path)
+
+        assert manager.retrieve_token().access_token == "access-1"
+        assert auth.refresh_calls == 1
+
+    def test_expiry_of_an_older_token_does_not_replace_the_stored_one(self, tmp_path):
+        cache_path = str(tmp_path / "cache.json")
+        user_a = FakeAuth(token_storage=file_storage(tmp_path))
+        BoxTokenManager(user_a, "oauth:test", cache_path).refresh_token()
+
+        # Another user authorizes the app, replacing the stored token
+        user_b = AccessToken(access_token="user-b", refresh_token="r", expires_in=3600)
+        file_storage(tmp_path).store(user_b)
+
+        auth = FakeAuth(token_storage=file_storage(tmp_path))
+        manager = BoxTokenManager(auth, "oauth:test", cache_path)
+        assert manager.retrieve_token().access_token == "user-b"
+        assert file_storage(tmp_path).get().access_token == "user-b"
+        assert auth.refresh_calls == 0
+
+    def test_unreadable_cache_is_ignored(self, tmp_path):
+        cache_path = tmp_path / "cache.json"
+        cache_path.write_text("not json")
+        manager = BoxTokenManager(FakeAuth(), "oauth:test", str(cache_path))
+        assert manager.retrieve_token().access_token == "access-1"
+
+    def test_get_token_manager_is_shared_per_identity(self):
+        config = replace(CONFIG, box_token_cache_path=None)
+        first = get_token_manager("ccg", FakeAuth(), config)
+        second = get_token_manager("ccg", FakeAuth(), config)
+        assert first is second
+
+    @pytest.mark.asyncio
+    @patch("server_context.get_ccg_client")
+    async def test_lifespan_uses_token_manager(self, mock_get_ccg_client):
+        """The Box client and its managers authenticate through the manager."""
+        mock_get_ccg_client.return_value = BoxClient(auth=FakeAuth())
+        config = replace(CONFIG, box_token_cache_path=None)
+
+        async with box_lifespan_ccg(MagicMock(), config=config) as context:
+            assert isinstance(context.client.auth, BoxTokenManager)
+            assert context.client.files.auth is context.client.auth
+
+    def test_refresh_adopts_token_refreshed_by_another_process(self, tmp_path):
+        cache_path = str(tmp_path / "cache.json")
+        worker_a_auth = FakeAuth(token_storage=file_storage(tmp_path))
+        worker_a = BoxTokenManager(worker_a_auth, "oauth:test", cache_path)
+        worker_b_auth = FakeAuth(token_storage=file_storage(tmp_path))
+        worker_b = BoxTokenManager(worker_b_auth, "oauth:test", cache_path)
+        worker_a.retrieve_token()
+        worker_b.retrieve_token()
+        worker_b_auth.refresh_calls = 0
+
+        worker_a.refresh_token()
+        token = worker_b.refresh_token()
+
+        # Worker B reuses A's token instead of spending the refresh token again
+        assert token.access_token == "access-2"
+        assert worker_b_auth.refresh_calls == 0
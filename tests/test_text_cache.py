@@ -0,0 +1,221 @@
+import os
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from box_sdk_gen.schemas.file_full import FileFull
+
+import text_cache
+from config import CONFIG
+from metrics import REGISTRY
+from text_cache import (
+    TEXT_CACHE_LOOKUPS,
+    TextCache,
+    configure_text_cache,
+    extract_file_text,
+    file_sha1,
+    read_text_window,
+)
+from tools.box_tools_files import box_read_tool, box_text_cache_tool
+
+SHA1_A = "a" * 40
+SHA1_B = "b" * 40
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TextCache(str(tmp_path / "text"), max_bytes=1000)
+
+
+def test_put_then_get(cache):
+    assert cache.get("1", SHA1_A) is None
+    cache.put("1", SHA1_A, "héllo")
+    assert cache.get("1", SHA1_A) == "héllo"
+    assert cache.get("1", SHA1_B) is None
+    assert TEXT_CACHE_LOOKUPS.value(outcome="hit") == 1
+    assert TEXT_CACHE_LOOKUPS.value(outcome="miss") == 2
+    # Nothing but the entry is left behind by the atomic write
+    assert os.listdir(cache.directory) == [f"1-{SHA1_A}.txt"]
+
+
+def test_new_version_replaces_the_old_one(cache):
+    cache.put("1", SHA1_A, "old")
+    cache.put("12", SHA1_A, "other file")
+    cache.put("1", SHA1_B, "new")
+    assert cache.get("1", SHA1_A) is None
+    assert cache.get("1", SHA1_B) == "new"
+    assert cache.get("12", SHA1_A) == "other file"
+    assert cache.stats()["size_bytes"] == len("new") + len("other file")
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put("1", SHA1_A, "x" * 400)
+    cache.put("2", SHA1_A, "x" * 400)
+    cache.get("1", SHA1_A)
+    cache.put("3", SHA1_A, "x" * 400)
+
+    assert cache.get("2", SHA1_A) is None
+    assert cache.get("1", SHA1_A) is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] == 800
+    assert stats["evictions"] == 1
+
+
+def test_entries_survive_a_restart(cache):
+    cache.put("1", SHA1_A, "kept")
+    cache.put("2", SHA1_A, "also kept")
+    reopened = TextCache(cache.directory, max_bytes=1000)
+    assert reopened.get("1", SHA1_A) == "kept"
+    assert [entry["file_id"] for entry in reopened.list_entries()] == ["1", "2"]
+    assert reopened.stats()["size_bytes"] == len("kept") + len("also kept")
+
+
+def test_purge(cache):
+    cache.put("1", SHA1_A, "one")
+    cache.put("2", SHA1_A, "two")
+    assert cache.purge("1") == 1
+    assert cache.get("1", SHA1_A) is None
+    assert cache.purge() == 1
+    assert cache.stats()["entries"] == 0
+    assert os.listdir(cache.directory) == []
+
+
+def make_client(sha1=SHA1_A):
+    client = MagicMock()
+    client.files.get_file_by_id.return_value = FileFull.from_dict(
+        {"id": "1", "type": "file", "sha1": sha1}
+    )
+    return client
+
+
+def test_file_sha1_falls_back_to_the_file_version():
+    client = make_client(None)
+    assert file_sha1(client, "1") is None
+    client.files.get_file_by_id.return_value = FileFull.from_dict(
+        {
+            "id": "1",
+            "type": "file",
+            "file_version": {"id": "2", "type": "file_version", "sha1": SHA1_B},
+        }
+    )
+    assert file_sha1(client, "1") == SHA1_B
+
+
+def test_extract_file_text_uses_the_cache_until_the_file_changes(cache):
+    with patch(
+        "text_cache.box_file_text_extract", return_value={"content": "text"}
+    ) as extract:
+        client = make_client()
+        assert extract_file_text(client, "1", cache) == {"content": "text"}
+        assert extract_file_text(client, "1", cache) == {"content": "text"}
+        assert extract.call_count == 1
+        client.files.get_file_by_id.assert_called_with(
+            "1", fields=["sha1", "file_version"]
+        )
+
+        extract_file_text(make_client(SHA1_B), "1", cache)
+        assert extract.call_count == 2
+
+
+def test_extract_file_text_does_not_cache_failures(cache):
+    failure = {"error": "representation is impossible", "status": "impossible"}
+    with patch("text_cache.box_file_text_extract", return_value=failure) as extract:
+        client = make_client()
+        assert extract_file_text(client, "1", cache) == failure
+        assert extract_file_text(client, "1", cache) == failure
+        assert extract.call_count == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_extract_file_text_without_cache():
+    client = make_client()
+    with patch("text_cache.box_file_text_extract", return_value={"content": "t"}):
+        assert extract_file_text(client, "1") == {"content": "t"}
+    client.files.get_file_by_id.assert_not_called()
+
+
+def test_read_text_window(cache):
+    client = make_client()
+    with patch(
+        "text_cache.box_file_text_extract", return_value={"content": "0123456789"}
+    ) as extract:
+        first = read_text_window(client, "1", 0, 4, cache)
+        assert first == {
+            "content": "0123",
+            "offset": 0,
+            "total_chars": 10,
+            "next_offset": 4,
+            "sha1": SHA1_A,
+        }
+        last = read_text_window(client, "1", 8, 4, cache, sha1=SHA1_A)
+        assert last["content"] == "89"
+        assert last["next_offset"] is None
+        # The following windows come from the cache
+        assert extract.call_count == 1
+
+        with pytest.raises(ValueError, match="changed"):
+            read_text_window(make_client(SHA1_B), "1", 4, 4, cache, sha1=SHA1_A)
+        with pytest.raises(ValueError):
+            read_text_window(client, "1", -1, 4, cache)
+
+
+@pytest.mark.asyncio
+async def test_box_read_tool_continues_with_a_token(tmp_path):
+    configure_text_cache(replace(CONFIG, text_cache_path=str(tmp_path)))
+    ctx = MagicMock()
+    text = "x" * 25
+    try:
+        with (
+            patch("tools.box_tools_files.get_box_client", return_value=make_client()),
+            patch(
+                "tools.box_tools_files.get_server_config",
+                return_value=replace(CONFIG, read_max_chars=10),
+            ),
+            patch("text_cache.box_file_text_extract", return_value={"content": text}),
+        ):
+            windows = [await box_read_tool(ctx, 1)]
+            while windows[-1]["continuation_token"]:
+                token = windows[-1]["continuation_token"]
+                windows.append(await box_read_tool(ctx, 1, continuation_token=token))
+            assert [w["offset"] for w in windows] == [0, 10, 20]
+            assert "".join(w["content"] for w in windows) == text
+            assert windows[0]["total_chars"] == 25
+
+            resp = await box_read_tool(ctx, 1, offset=20, max_chars=2)
+            assert resp["content"] == "xx"
+            assert resp["continuation_token"]
+            assert "error" in await box_read_tool(ctx, 1, continuation_token="bad")
+            assert "error" in await box_read_tool(ctx, 1, max_chars=-1)
+    finally:
+        configure_text_cache(replace(CONFIG, text_cache_path=None))
+
+
+@pytest.mark.asyncio
+async def test_text_cache_tool(tmp_path):
+    cache = configure_text_cache(replace(CONFIG, text_cache_path=str(tmp_path)))
+    try:
+        cache.put("1", SHA1_A, "one")
+        cache.put("2", SHA1_A, "two")
+        ctx = MagicMock()
+
+        inspected = await box_text_cache_tool(ctx)
+        assert inspected["stats"]["entries"] == 2
+        assert [entry["file_id"] for entry in inspected["entries"]] == ["2", "1"]
+
+        assert await box_text_cache_tool(ctx, "purge", file_id=1) == {"purged": 1}
+        assert await box_text_cache_tool(ctx, "purge") == {"purged": 1}
+        assert "error" in await box_text_cache_tool(ctx, "compact")
+
+        configure_text_cache(replace(CONFIG, text_cache_path=None))
+        assert text_cache.get_text_cache() is None
+        assert "error" in await box_text_cache_tool(ctx)
+    finally:
+        configure_text_cache(replace(CONFIG, text_cache_path=None))
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import tool_cache
+from server_context import BoxContext
+from tool_cache import (
+    ToolCache,
+    cached_tool,
+    clear_tool_cache,
+    configure_tool_cache,
+    tool_cache_stats,
+)
+
+
+def make_ctx(cache_key="oauth:client", as_user=None):
+    client = MagicMock()
+    client.auth = SimpleNamespace(cache_key=cache_key)
+    client.network_session.additional_headers = {"As-User": as_user} if as_user else {}
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=BoxContext(client=client))
+    )
+
+
+@pytest.fixture(autouse=True)
+def enabled_cache():
+    configure_tool_cache(True, max_entries=2)
+    yield
+    configure_tool_cache(False)
+
+
+def counting_tool(ttl=60, result=None):
+    calls = []
+
+    @cached_tool(ttl=ttl)
+    async def tool(ctx, item_id: str, limit: int = 10) -> dict:
+        calls.append(item_id)
+        return result if result is not None else {"id": item_id, "limit": limit}
+
+    return tool, calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_calls_hit_the_cache():
+    tool, calls = counting_tool()
+    ctx = make_ctx()
+    first = await tool(ctx, "1")
+    second = await tool(ctx, item_id="1", limit=10)
+    assert first == second == {"id": "1", "limit": 10}
+    assert calls == ["1"]
+
+    stats = tool_cache_stats()["tool"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_not_shared_mutable_state():
+    tool, _ = counting_tool()
+    ctx = make_ctx()
+    (await tool(ctx, "1"))["id"] = "changed"
+    assert (await tool(ctx, "1"))["id"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_entries_are_keyed_by_identity_and_arguments():
+    tool, calls = counting_tool()
+    await tool(make_ctx("oauth:a"), "1")
+    await tool(make_ctx("oauth:b"), "1")
+    await tool(make_ctx("ccg:a", as_user="42"), "1")
+    await tool(make_ctx("ccg:a", as_user="43"), "1")
+    await tool(make_ctx("oauth:a"), "1", limit=5)
+    assert len(calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: now[0])
+    tool, calls = counting_tool(ttl=30)
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    now[0] += 29
+    await tool(ctx, "1")
+    now[0] += 2
+    await tool(ctx, "1")
+    assert calls == ["1", "1"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    tool, calls = counting_tool()
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    await tool(ctx, "2")
+    await tool(ctx, "1")
+    await tool(ctx, "3")  # evicts "2"
+    await tool(ctx, "1")
+    await tool(ctx, "2")
+    assert calls == ["1", "2", "3", "2"]
+    assert tool_cache_stats()["tool"]["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    tool, calls = counting_tool(result={"error": "not found"})
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    await tool(ctx, "1")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_calls_the_tool():
+    configure_tool_cache(False)
+    tool, calls = counting_tool()
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    await tool(ctx, "1")
+    assert len(calls) == 2
+    assert tool_cache_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_clear_tool_cache_drops_entries():
+    tool, calls = counting_tool()
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    clear_tool_cache()
+    await tool(ctx, "1")
+    assert len(calls) == 2
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        ToolCache("tool", ttl=1, maxsize=0)
@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from metrics import REGISTRY
+from server_context import BoxContext
+from tool_cache import cached_tool, configure_tool_cache
+from tool_coalescing import (
+    COALESCED_CALLS,
+    coalesced_tool,
+    configure_coalescing,
+    get_single_flight,
+)
+
+
+def make_ctx(cache_key="oauth:client", as_user=None):
+    client = MagicMock()
+    client.auth = SimpleNamespace(cache_key=cache_key)
+    client.network_session.additional_headers = {"As-User": as_user} if as_user else {}
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=BoxContext(client=client))
+    )
+
+
+@pytest.fixture(autouse=True)
+def enabled_coalescing():
+    REGISTRY.clear()
+    configure_coalescing(True)
+    yield
+    configure_coalescing(True)
+
+
+def slow_tool(result=None, error=None):
+    calls = []
+    release = asyncio.Event()
+
+    @coalesced_tool
+    async def read_file(ctx, file_id: str, limit: int = 10) -> dict:
+        calls.append(file_id)
+        await release.wait()
+        if error is not None:
+            raise error
+        return result if result is not None else {"id": file_id, "limit": limit}
+
+    return read_file, calls, release
+
+
+async def gather_released(release, *calls):
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    await asyncio.sleep(0)
+    release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_call():
+    tool, calls, release = slow_tool()
+    ctx = make_ctx()
+    results = await gather_released(
+        release, tool(ctx, "1"), tool(ctx, file_id="1", limit=10), tool(ctx, "1")
+    )
+
+    assert results == [{"id": "1", "limit": 10}] * 3
+    assert calls == ["1"]
+    assert COALESCED_CALLS.value(tool="read_file") == 2
+    assert get_single_flight("read_file").in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_arguments_or_identities_are_not_coalesced():
+    tool, calls, release = slow_tool()
+    await gather_released(
+        release,
+        tool(make_ctx(), "1"),
+        tool(make_ctx(), "2"),
+        tool(make_ctx(), "1", limit=5),
+        tool(make_ctx(as_user="42"), "1"),
+        tool(make_ctx(cache_key="ccg:other"), "1"),
+    )
+    assert sorted(calls) == ["1", "1", "1", "1", "2"]
+    assert COALESCED_CALLS.value(tool="read_file") == 0
+
+
+@pytest.mark.asyncio
+async def test_calls_after_completion_call_again():
+    tool, calls, release = slow_tool()
+    release.set()
+    ctx = make_ctx()
+    await tool(ctx, "1")
+    await tool(ctx, "1")
+    assert calls == ["1", "1"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_with_every_caller():
+    tool, calls, release = slow_tool(error=RuntimeError("boom"))
+    ctx = make_ctx()
+    results = await gather_released(release, tool(ctx, "1"), tool(ctx, "1"))
+    assert [str(result) for result in results] == ["boom", "boom"]
+    assert calls == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_callers_get_their_own_copy_of_the_result():
+    tool, _, release = slow_tool(result={"entries": [1]})
+    ctx = make_ctx()
+    first, second = await gather_released(release, tool(ctx, "1"), tool(ctx, "1"))
+    first["entries"].append(2)
+    assert second == {"entries": [1]}
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    tool, calls, release = slow_tool()
+    ctx = make_ctx()
+    first = asyncio.ensure_future(tool(ctx, "1"))
+    second = asyncio.ensure_future(tool(ctx, "1"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == {"id": "1", "limit": 10}
+    assert first.cancelled()
+    assert calls == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_coalescing_calls_every_time():
+    configure_coalescing(False)
+    tool, calls, release = slow_tool()
+    ctx = make_ctx()
+    await gather_released(release, tool(ctx, "1"), tool(ctx, "1"))
+    assert calls == ["1", "1"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cache_misses_are_coalesced():
+    configure_tool_cache(True)
+    calls = []
+
+    @coalesced_tool
+    @cached_tool(ttl=60)
+    async def who_am_i(ctx) -> dict:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": "me"}
+
+    try:
+        ctx = make_ctx()
+        await asyncio.gather(who_am_i(ctx), who_am_i(ctx))
+        await who_am_i(ctx)
+    finally:
+        configure_tool_cache(False)
+    assert calls == [1]
@@ -0,0 +1,173 @@
+import sys
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from tool_registry import (
+    LazyToolManager,
+    ToolGroup,
+    register_all_tools,
+    select_tool_groups,
+)
+
+TOOLS_MODULE = """
+calls = []
+
+
+async def lazy_echo(value: str) -> dict:
+    calls.append(value)
+    return {"value": value}
+
+
+async def lazy_ping() -> str:
+    return "pong"
+"""
+
+
+@pytest.fixture
+def tools_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_tools_module.py").write_text(TOOLS_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_tools_module"
+    sys.modules.pop("lazy_tools_module", None)
+
+
+@pytest.fixture
+def other_module(tmp_path, monkeypatch):
+    (tmp_path / "other_tools_module.py").write_text(
+        "async def other_tool() -> str:\n    return 'other'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "other_tools_module"
+    sys.modules.pop("other_tools_module", None)
+
+
+def test_tool_groups_are_not_imported_at_registration(tools_module):
+    mcp = FastMCP("test")
+    register_all_tools(mcp, [ToolGroup("lazy", tools_module, ("lazy_echo",))])
+    assert isinstance(mcp._tool_manager, LazyToolManager)
+    assert tools_module not in sys.modules
+
+
+@pytest.mark.asyncio
+async def test_calling_a_tool_loads_its_group_only(tools_module, other_module):
+    mcp = FastMCP("test")
+    register_all_tools(
+        mcp,
+        [
+            ToolGroup("lazy", tools_module, ("lazy_echo", "lazy_ping")),
+            ToolGroup("other", other_module, ("other_tool",)),
+        ],
+    )
+
+    await mcp.call_tool("lazy_echo", {"value": "a"})
+    assert sys.modules[tools_module].calls == ["a"]
+    assert other_module not in sys.modules
+    # Loaded tools are instrumented like eagerly registered ones
+    tool = mcp._tool_manager.get_tool("lazy_echo")
+    assert tool.fn.__box_mcp_instrumented__
+    assert tool.fn.__box_mcp_traced__
+
+
+@pytest.mark.asyncio
+async def test_listing_tools_loads_every_group(tools_module, other_module):
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    async def eager_tool() -> str:
+        return "eager"
+
+    register_all_tools(
+        mcp,
+        [
+            ToolGroup("lazy", tools_module, ("lazy_echo", "lazy_ping")),
+            ToolGroup("other", other_module, ("other_tool",)),
+        ],
+    )
+    tools = await mcp.list_tools()
+    assert [tool.name for tool in tools] == [
+        "eager_tool",
+        "lazy_echo",
+        "lazy_ping",
+        "other_tool",
+    ]
+    assert mcp._tool_manager.pending_groups() == []
+
+
+def test_unknown_tools_do_not_load_anything(tools_module):
+    mcp = FastMCP("test")
+    register_all_tools(mcp, [ToolGroup("lazy", tools_module, ("lazy_echo",))])
+    assert mcp._tool_manager.get_tool("missing") is None
+    assert tools_module not in sys.modules
+
+
+def test_group_registers_eagerly(tools_module):
+    mcp = FastMCP("test")
+    ToolGroup("lazy", tools_module, ("lazy_ping",)).register(mcp)
+    assert [tool.name for tool in mcp._tool_manager.list_tools()] == ["lazy_ping"]
+
+
+def test_server_registers_every_tool_lazily():
+    from server import register_tools
+
+    mcp = FastMCP("test")
+    register_tools(mcp)
+    manager = mcp._tool_manager
+    names = [tool for group in manager.pending_groups() for tool in group.tools]
+    assert "box_read_tool" in names
+    assert manager.get_tool("box_read_tool") is not None
+    assert len(manager.list_tools()) == len(names)
+
+
+GROUPS = [
+    ToolGroup("file_tools", "tools.box_tools_files", ("read", "upload")),
+    ToolGroup("search_tools", "tools.box_tools_search", ("search",)),
+    ToolGroup("user_tools", "tools.box_tools_users", ("users", "who")),
+]
+
+
+@pytest.mark.parametrize(
+    "tools, exclude, expected",
+    [
+        (
+            None,
+            (),
+            {
+                "file_tools": ("read", "upload"),
+                "search_tools": ("search",),
+                "user_tools": ("users", "who"),
+            },
+        ),
+        (
+            ["file_tools", "who"],
+            (),
+            {"file_tools": ("read", "upload"), "user_tools": ("who",)},
+        ),
+        (
+            None,
+            ["user_tools", "upload"],
+            {"file_tools": ("read",), "search_tools": ("search",)},
+        ),
+        (["file_tools"], ["file_tools"], {}),
+    ],
+)
+def test_select_tool_groups(tools, exclude, expected):
+    selected = select_tool_groups(GROUPS, tools, exclude)
+    assert {group.name: group.tools for group in selected} == expected
+
+
+def test_select_tool_groups_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Unknown tool or tool group: files"):
+        select_tool_groups(GROUPS, ["files"])
+    with pytest.raises(ValueError):
+        select_tool_groups(GROUPS, None, ["nope"])
+
+
+@pytest.mark.asyncio
+async def test_server_registers_the_selected_tools_only():
+    from server import register_tools
+
+    mcp = FastMCP("test")
+    register_tools(mcp, ["search_tools", "box_read_tool"], ["box_search_tool"])
+    names = {tool.name for tool in await mcp.list_tools()}
+    assert names == {"box_search_folder_by_name_tool", "box_read_tool"}
@@ -0,0 +1,241 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import tracing
+from box_executor import BoxExecutor
+from box_http import PooledBoxNetworkClient
+from tracing import (
+    SCOPE_SPAN_KEY,
+    RemoteParent,
+    SpanKind,
+    TracingMiddleware,
+    configure_tracing,
+    current_span,
+    parse_traceparent,
+    start_span,
+    trace_tool,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+@pytest.fixture
+def spans(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    configure_tracing(str(path))
+
+    def read():
+        lines = path.read_text().splitlines()
+        documents = [json.loads(line) for line in lines]
+        return [
+            span
+            for document in documents
+            for resource_spans in document["resourceSpans"]
+            for scope_spans in resource_spans["scopeSpans"]
+            for span in scope_spans["spans"]
+        ]
+
+    yield read
+    configure_tracing(None)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (TRACEPARENT, RemoteParent(TRACE_ID, PARENT_ID)),
+        (TRACEPARENT.upper(), RemoteParent(TRACE_ID, PARENT_ID)),
+        (None, None),
+        ("", None),
+        ("garbage", None),
+        (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+        (f"00-{TRACE_ID}-{'0' * 16}-01", None),
+    ],
+)
+def test_parse_traceparent(value, expected):
+    assert parse_traceparent(value) == expected
+
+
+def test_spans_are_not_created_when_disabled():
+    with start_span("work") as span:
+        assert span is None
+        assert current_span() is None
+
+
+def test_nested_spans_share_the_trace(spans):
+    with start_span("outer") as outer:
+        with start_span("inner", attributes={"count": 2}) as inner:
+            assert current_span() is inner
+        assert current_span() is outer
+    assert current_span() is None
+
+    inner_span, outer_span = spans()
+    assert inner_span["traceId"] == outer_span["traceId"] == outer.trace_id
+    assert inner_span["parentSpanId"] == outer_span["spanId"]
+    assert "parentSpanId" not in outer_span
+    assert inner_span["attributes"] == [{"key": "count", "value": {"intValue": "2"}}]
+    assert int(outer_span["endTimeUnixNano"]) >= int(outer_span["startTimeUnixNano"])
+
+
+def test_exceptions_mark_the_span_as_failed(spans):
+    with pytest.raises(KeyError):
+        with start_span("work"):
+            raise KeyError("file")
+
+    (span,) = spans()
+    assert span["status"] == {"code": 2, "message": "'file'"}
+    assert {"key": "exception.type", "value": {"stringValue": "KeyError"}} in span[
+        "attributes"
+    ]
+
+
+def make_app():
+    async def endpoint(request):
+        span = request.scope[SCOPE_SPAN_KEY]
+        return PlainTextResponse(span.trace_id)
+
+    app = Starlette(routes=[Route("/mcp", endpoint, methods=["POST"])])
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_middleware_continues_the_incoming_trace(spans):
+    with TestClient(make_app()) as client:
+        response = client.post("/mcp", headers={"traceparent": TRACEPARENT})
+
+    assert response.text == TRACE_ID
+    (span,) = spans()
+    assert span["name"] == "POST /mcp"
+    assert span["kind"] == SpanKind.SERVER
+    assert span["parentSpanId"] == PARENT_ID
+    assert {
+        "key": "http.response.status_code",
+        "value": {"intValue": "200"},
+    } in span["attributes"]
+
+
+def test_middleware_starts_a_trace_without_traceparent(spans):
+    with TestClient(make_app()) as client:
+        response = client.post("/mcp")
+
+    (span,) = spans()
+    assert span["traceId"] == response.text
+    assert "parentSpanId" not in span
+
+
+def make_ctx(scope=None, meta=None):
+    request = SimpleNamespace(scope=scope) if scope is not None else None
+    return SimpleNamespace(_request_context=SimpleNamespace(request=request, meta=meta))
+
+
+@pytest.mark.asyncio
+async def test_tool_span_is_a_child_of_the_request_span(spans):
+    async def tool(ctx, file_id: str) -> dict:
+        return {"id": file_id}
+
+    traced = trace_tool("tool", tool, "ctx")
+    with start_span("POST /mcp", SpanKind.SERVER) as request_span:
+        pass
+    # Tools run outside of the request's context, like the MCP session does
+    result = await traced(ctx=make_ctx({SCOPE_SPAN_KEY: request_span}), file_id="1")
+    assert result == {"id": "1"}
+
+    _, tool_span = spans()
+    assert tool_span["name"] == "tool tool"
+    assert tool_span["traceId"] == request_span.trace_id
+    assert tool_span["parentSpanId"] == request_span.span_id
+
+
+@pytest.mark.asyncio
+async def test_tool_span_uses_traceparent_from_request_meta(spans):
+    async def tool(ctx) -> dict:
+        return {"error": "not found"}
+
+    meta = SimpleNamespace(model_extra={"traceparent": TRACEPARENT})
+    await trace_tool("tool", tool, "ctx")(ctx=make_ctx(meta=meta))
+
+    (span,) = spans()
+    assert span["traceId"] == TRACE_ID
+    assert span["parentSpanId"] == PARENT_ID
+    assert span["status"] == {"code": 2, "message": "not found"}
+
+
+def test_trace_tool_wraps_once():
+    def tool() -> str:
+        return "ok"
+
+    traced = trace_tool("tool", tool)
+    assert trace_tool("tool", traced) is traced
+    assert traced() == "ok"
+
+
+@pytest.mark.asyncio
+async def test_box_calls_run_in_a_span_with_queue_time(spans):
+    executor = BoxExecutor(max_workers=1)
+
+    def get_file(file_id):
+        return current_span()
+
+    with start_span("tool"):
+        span = await executor.run(get_file, "1")
+    executor.shutdown()
+
+    assert (
+        span.name
+        == "box_call test_box_calls_run_in_a_span_with_queue_time.<locals>.get_file"
+    )
+    assert "box.executor.queue_seconds" in span.attributes
+    call_span, tool_span = spans()
+    assert call_span["parentSpanId"] == tool_span["spanId"]
+
+
+class EchoTraceparentHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = (self.headers.get("traceparent") or "").encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoTraceparentHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_box_requests_propagate_trace_context(spans, echo_server_url):
+    client = PooledBoxNetworkClient()
+    with start_span("tool") as tool_span:
+        response = client.requests_session.get(f"{echo_server_url}/2.0/files/123")
+    client.close()
+
+    http_span, _ = spans()
+    assert http_span["name"] == "GET /2.0/files/{id}"
+    assert http_span["kind"] == SpanKind.CLIENT
+    assert http_span["parentSpanId"] == tool_span.span_id
+    assert response.text == f"00-{tool_span.trace_id}-{http_span['spanId']}-01"
+
+
+def test_box_requests_are_not_traced_when_disabled(echo_server_url):
+    client = PooledBoxNetworkClient()
+    response = client.requests_session.get(f"{echo_server_url}/2.0/users/me")
+    client.close()
+    assert response.text == ""
+    assert tracing._exporter is None